@@ -89,6 +89,40 @@ DATABASES = {
 }
 
 
+# Cache
+# Uses Redis through django-redis when REDIS_URL is set, otherwise a per-process local memory cache.
+# Cache invalidation only reaches every worker through Redis: set REDIS_URL when running more than one process.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'ssmg-default',
+        }
+    }
+
+# Dashboard and analytics response cache (see authentication/cache.py)
+ANALYTICS_CACHE_ALIAS = 'default'
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get('ANALYTICS_CACHE_TIMEOUT', 300))
+ANALYTICS_CACHE_STALE_WHILE_REVALIDATE = os.environ.get('ANALYTICS_CACHE_STALE_WHILE_REVALIDATE', 'false').lower() == 'true'
+
+# Without a shared cache, seconds before each process re-reads the campaign catalog (see campaigns/catalog.py)
+CAMPAIGN_CATALOG_LOCAL_TIMEOUT = int(os.environ.get('CAMPAIGN_CATALOG_LOCAL_TIMEOUT', 60))
+
+# Threads used to compute analytics sections in parallel (1 computes them one after another)
+ANALYTICS_MAX_WORKERS = int(os.environ.get('ANALYTICS_MAX_WORKERS', 4))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -140,7 +174,7 @@ AUTH_USER_MODEL = 'authentication.CustomerUser'
 
 REST_FRAMEWORK = {
      'DEFAULT_AUTHENTICATION_CLASSES': (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "authentication.tokens.ClaimsJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
@@ -176,8 +210,12 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_EXP_CLAIM": "refresh_exp",
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=20),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
+    "TOKEN_REFRESH_SERIALIZER": "authentication.serializers.CustomTokenRefreshSerializer",
 }
 
+# How long a user's token_version is cached before it is read from the database again
+TOKEN_VERSION_CACHE_TIMEOUT = int(os.environ.get('TOKEN_VERSION_CACHE_TIMEOUT', 300))
+
 DEFAULT_PARSER_CLASSES = (
     "rest_framework.parsers.MultiPartParser",
     "rest_framework.parsers.FileUploadParser",
@@ -0,0 +1,1065 @@
+"""
+Comprehensive analytics shared by the user and service analytics endpoints.
+
+standard_analytics() aggregates every submission matching `scope`, a dict of
+submission filters such as {'submitted_by': user} or {'service': service}.
+Trends that only sum numeric fields, and all-time totals, are read from the
+monthly rollups; period totals and Max/Avg trends still aggregate the submissions.
+
+The response is built from independent sections (membership, soul winning, ...).
+evaluate_sections() runs them on a bounded thread pool, each thread with its own
+database connection, so a request takes about as long as its slowest section.
+stream_standard_analytics() sends each section to the client as soon as it is done.
+"""
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection
+from django.db.models import Sum, Avg, Max
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from campaigns.models import (
+    StateOfTheFlockSubmission, SoulWinningSubmission, ServantsArmedTrainedSubmission,
+    AntibrutishSubmission, HearingSeeingSubmission, BasontaProliferationSubmission,
+    IntimateCounselingSubmission, SheperdingControlSubmission, MultiplicationSubmission,
+    UnderstandingSubmission, SheepSeekingSubmission, TestimonySubmission,
+    TelepastoringSubmission, GatheringBusSubmission, SwollenSundaySubmission,
+)
+from campaigns.rollups import rollup_totals
+from campaigns.trends import monthly_trend, merge_trends, rollup_trend, rollup_cumulative_trend
+from campaigns.comparisons import parse_compare, comparison_windows, compare_totals, comparison_block
+from .forecasting import DEFAULT_HORIZON, forecast_scope
+
+
+def resolve_period(params):
+    """
+    Read the period, start_date and end_date query parameters from `params`
+    (request.query_params or a dict).
+    Returns (period, period_start, period_end); period_start is None for 'all'.
+    Raises ValueError for malformed dates.
+    """
+    period = params.get('period', 'month').lower()
+    start_date_str = params.get('start_date')
+    end_date_str = params.get('end_date')
+    
+    now = timezone.now()
+    
+    if start_date_str and end_date_str:
+        start_date = parse_date(start_date_str)
+        end_date = parse_date(end_date_str)
+        if not start_date or not end_date:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD.")
+        period_start = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
+        period_end = timezone.make_aware(datetime.combine(end_date, datetime.max.time()))
+    elif period == 'week':
+        period_start = now - timedelta(days=7)
+        period_end = now
+    elif period == 'month':
+        period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        period_end = now
+    elif period == 'quarter':
+        quarter = (now.month - 1) // 3
+        period_start = now.replace(month=quarter*3+1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        period_end = now
+    elif period == 'year':
+        period_start = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+        period_end = now
+    else:  # 'all'
+        period_start = None
+        period_end = now
+    
+    return period, period_start, period_end
+
+
+class AnalyticsContext:
+    """The scope and period shared by every section of one analytics request."""
+
+    def __init__(self, scope, period, period_start, period_end, compare=()):
+        self.scope = scope
+        self.period = period
+        self.period_start = period_start
+        self.period_end = period_end
+        self.compare = compare
+        self.windows = comparison_windows(period_start, period_end, include=compare)
+        # Results of finished sections, for sections that build on another one
+        self.results = {}
+
+    def totals(self, model, date_field, metrics):
+        """Aggregate `metrics` over every comparison window with one query"""
+        return compare_totals(model.objects.filter(**self.scope), date_field, metrics, self.windows)
+
+    def add_comparison(self, data, *totals):
+        if self.compare:
+            data["comparison"] = {}
+            for item in totals:
+                data["comparison"].update(comparison_block(item, self.compare))
+
+
+# Analytics sections by name, in the order they appear in the response
+SECTION_REGISTRY = {}
+
+
+class AnalyticsSection:
+    """
+    A named part of the analytics response.
+    `cost` (low, medium, high) and `queries` describe roughly what the section costs
+    to compute; `depends_on` names sections whose results it reads from ctx.results.
+    """
+
+    def __init__(self, name, func, cost, queries, depends_on):
+        self.name = name
+        self.func = func
+        self.cost = cost
+        self.queries = queries
+        self.depends_on = tuple(depends_on)
+        self.description = (func.__doc__ or '').strip()
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "description": self.description,
+            "cost": self.cost,
+            "queries": self.queries,
+            "depends_on": list(self.depends_on)
+        }
+
+
+def analytics_section(name, cost='low', queries=1, depends_on=()):
+    """Register the decorated function as the analytics section `name`."""
+    def register(func):
+        for dependency in depends_on:
+            if dependency not in SECTION_REGISTRY:
+                raise ValueError(f"Section '{name}' depends on unregistered section '{dependency}'")
+        SECTION_REGISTRY[name] = AnalyticsSection(name, func, cost, queries, depends_on)
+        return func
+    return register
+
+
+def resolve_sections(names=None):
+    """
+    The sections to evaluate for the requested `names` (all when empty), plus the
+    sections they depend on, in registry order. Raises ValueError for unknown names.
+    """
+    if not names:
+        return list(SECTION_REGISTRY.values())
+    
+    needed = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in SECTION_REGISTRY:
+            raise ValueError(name)
+        if name not in needed:
+            needed.add(name)
+            stack.extend(SECTION_REGISTRY[name].depends_on)
+    return [section for name, section in SECTION_REGISTRY.items() if name in needed]
+
+
+def parse_sections(value):
+    """Split the `sections` query parameter into section names."""
+    if not value:
+        return []
+    return [name.strip().lower() for name in value.split(',') if name.strip()]
+
+
+@analytics_section('membership', cost='medium', queries=5)
+def membership_section(ctx):
+    """Latest membership snapshot, growth against the previous snapshot and the membership trend."""
+    membership_data = {
+        "current": 0,
+        "previous": 0,
+        "growth": 0,
+        "growth_percentage": 0.0,
+        "stable": 0,
+        "unstable": 0,
+        "lost": 0,
+        "trend": []
+    }
+    
+    # Get latest membership data
+    latest_membership = StateOfTheFlockSubmission.objects.filter(
+        **ctx.scope
+    ).order_by('-submission_period', '-created_at').first()
+    
+    if latest_membership:
+        membership_data["current"] = latest_membership.total_membership or 0
+        membership_data["stable"] = latest_membership.stable or 0
+        membership_data["unstable"] = latest_membership.unstable or 0
+        membership_data["lost"] = latest_membership.lost or 0
+        
+        # Get previous period membership
+        # Try to find the most recent submission before the latest one
+        prev_membership = StateOfTheFlockSubmission.objects.filter(
+            **ctx.scope
+        ).exclude(submission_period__isnull=True).order_by('-submission_period', '-created_at')
+        
+        if prev_membership.count() > 1:
+            # Get the second most recent (previous) submission
+            prev_membership_obj = prev_membership[1]
+            membership_data["previous"] = prev_membership_obj.total_membership or 0
+            membership_data["growth"] = membership_data["current"] - membership_data["previous"]
+            if membership_data["previous"] > 0:
+                membership_data["growth_percentage"] = (membership_data["growth"] / membership_data["previous"]) * 100
+        elif ctx.period_start:
+            # Fallback to period-based comparison if we have a previous period
+            prev_membership_obj = StateOfTheFlockSubmission.objects.filter(
+                **ctx.scope,
+                submission_period__lt=ctx.period_start.date()
+            ).exclude(submission_period__isnull=True).order_by('-submission_period', '-created_at').first()
+            
+            if prev_membership_obj:
+                membership_data["previous"] = prev_membership_obj.total_membership or 0
+                membership_data["growth"] = membership_data["current"] - membership_data["previous"]
+                if membership_data["previous"] > 0:
+                    membership_data["growth_percentage"] = (membership_data["growth"] / membership_data["previous"]) * 100
+    
+    # Membership trend (last 12 months for better visualization)
+    # Membership is a snapshot, so months without a submission keep the previous month's figures
+    membership_data["trend"] = monthly_trend(
+        StateOfTheFlockSubmission.objects.filter(**ctx.scope),
+        'submission_period',
+        {
+            "total": Max('total_membership'),
+            "stable": Max('stable'),
+            "unstable": Max('unstable'),
+            "lost": Max('lost')
+        },
+        end=ctx.period_end,
+        carry_forward=("total", "stable", "unstable", "lost")
+    )
+    
+    # Members lost to date, including before the trend window
+    membership_data["cumulative_trend"] = rollup_cumulative_trend(
+        StateOfTheFlockSubmission,
+        ctx.scope,
+        {"lost": 'lost'},
+        end=ctx.period_end
+    )
+    
+    # Membership line chart data (for multi-series chart)
+    membership_data["chart_data"] = {
+        "labels": [item["label"] for item in membership_data["trend"]],
+        "datasets": [
+            {
+                "label": "Total Membership",
+                "data": [item["total"] for item in membership_data["trend"]],
+                "color": "#2196F3"
+            },
+            {
+                "label": "Stable Members",
+                "data": [item["stable"] for item in membership_data["trend"]],
+                "color": "#4CAF50"
+            },
+            {
+                "label": "Unstable Members",
+                "data": [item["unstable"] for item in membership_data["trend"]],
+                "color": "#FF9800"
+            }
+        ]
+    }
+    
+    return membership_data
+
+
+@analytics_section('soul_winning', cost='medium', queries=4)
+def soul_winning_section(ctx):
+    """Souls won, crusades and outreaches for the period with the monthly and cumulative trend."""
+    soul_totals = ctx.totals(SoulWinningSubmission, 'date', {
+        "souls_won": Sum('no_of_souls_won'),
+        "crusades": Sum('no_of_crusades'),
+        "outreaches": Sum('no_of_massive_organised_outreaches'),
+        "dance_outreach": Sum('no_of_dance_outreach'),
+        "missionaries_sent": Sum('no_of_missionaries_sent')
+    })
+    souls_this_period = soul_totals["current"]
+    
+    total_souls_all_time = rollup_totals(SoulWinningSubmission, **ctx.scope)['no_of_souls_won']
+    
+    soul_winning_data = {
+        "total_all_time": int(total_souls_all_time),
+        "this_period": int(souls_this_period['souls_won']),
+        "previous_period": int(soul_totals["previous"]["souls_won"]) if "previous" in soul_totals else 0,
+        "crusades": int(souls_this_period['crusades']),
+        "outreaches": int(souls_this_period['outreaches']),
+        "dance_outreach": int(souls_this_period['dance_outreach']),
+        "missionaries_sent": int(souls_this_period['missionaries_sent']),
+        "trend": []
+    }
+    ctx.add_comparison(soul_winning_data, soul_totals)
+    
+    # Soul winning trend (last 12 months)
+    soul_winning_data["trend"] = rollup_trend(
+        SoulWinningSubmission,
+        ctx.scope,
+        {
+            "souls_won": 'no_of_souls_won',
+            "crusades": 'no_of_crusades',
+            "outreaches": 'no_of_massive_organised_outreaches',
+            "dance_outreach": 'no_of_dance_outreach',
+            "missionaries_sent": 'no_of_missionaries_sent'
+        },
+        end=ctx.period_end
+    )
+    
+    # Soul winning cumulative trend (souls won to date, including before the trend window)
+    soul_winning_data["cumulative_trend"] = rollup_cumulative_trend(
+        SoulWinningSubmission,
+        ctx.scope,
+        {"cumulative": 'no_of_souls_won'},
+        end=ctx.period_end
+    )
+    
+    # Soul winning chart data for stacked bar chart
+    soul_winning_data["chart_data"] = {
+        "labels": [item["label"] for item in soul_winning_data["trend"]],
+        "datasets": [
+            {
+                "label": "Souls Won",
+                "data": [item["souls_won"] for item in soul_winning_data["trend"]],
+                "color": "#4CAF50"
+            },
+            {
+                "label": "Crusades",
+                "data": [item["crusades"] for item in soul_winning_data["trend"]],
+                "color": "#2196F3"
+            },
+            {
+                "label": "Outreaches",
+                "data": [item["outreaches"] for item in soul_winning_data["trend"]],
+                "color": "#FF9800"
+            }
+        ],
+        "cumulative": {
+            "labels": [item["label"] for item in soul_winning_data["cumulative_trend"]],
+            "data": [item["cumulative"] for item in soul_winning_data["cumulative_trend"]],
+            "color": "#9C27B0"
+        }
+    }
+    
+    return soul_winning_data
+
+
+@analytics_section('leadership', cost='low', queries=2)
+def leadership_section(ctx):
+    """Leader training metrics and the latest leadership hierarchy."""
+    leadership_totals = ctx.totals(ServantsArmedTrainedSubmission, 'date', {
+        "teaching_sessions": Sum('no_of_teachings_done_by_pastor'),
+        "avg_attendance": Avg('average_attendance_during_meetings_by_pastor'),
+        "makarios": Sum('no_of_leaders_who_have_makarios'),
+        "dakes_bible": Sum('no_of_leaders_who_own_dakes_bible'),
+        "thompson_chain": Sum('no_of_leaders_who_own_thompson_chain'),
+        "pose_certified": Sum('no_of_pose_certified_leaders'),
+        "iptp_training": Sum('no_of_leaders_in_iptp_training')
+    })
+    leadership_current = leadership_totals["current"]
+    leadership_data = {
+        "total_leaders": 0,
+        "trained_leaders": 0,
+        "teaching_sessions": int(leadership_current["teaching_sessions"]),
+        "avg_attendance": float(leadership_current["avg_attendance"]),
+        "hierarchy": {
+            "cos": 0,
+            "bos": 0,
+            "bls": 0,
+            "fls": 0,
+            "potential_leaders": 0
+        },
+        "training_metrics": {
+            "makarios": int(leadership_current["makarios"]),
+            "dakes_bible": int(leadership_current["dakes_bible"]),
+            "thompson_chain": int(leadership_current["thompson_chain"]),
+            "pose_certified": int(leadership_current["pose_certified"]),
+            "iptp_training": int(leadership_current["iptp_training"])
+        }
+    }
+    ctx.add_comparison(leadership_data, leadership_totals)
+    
+    # Get latest sheperding control data for hierarchy
+    latest_sheperding = SheperdingControlSubmission.objects.filter(
+        **ctx.scope
+    ).order_by('-submission_period', '-created_at').first()
+    
+    if latest_sheperding:
+        leadership_data["total_leaders"] = latest_sheperding.current_no_of_leaders or 0
+        leadership_data["hierarchy"]["cos"] = latest_sheperding.no_of_cos or 0
+        leadership_data["hierarchy"]["bos"] = latest_sheperding.no_of_bos or 0
+        leadership_data["hierarchy"]["bls"] = latest_sheperding.no_of_bls or 0
+        leadership_data["hierarchy"]["fls"] = latest_sheperding.no_of_fls or 0
+        leadership_data["hierarchy"]["potential_leaders"] = latest_sheperding.no_of_potential_leaders or 0
+    
+    return leadership_data
+
+
+@analytics_section('small_groups', cost='low', queries=2)
+def small_groups_section(ctx):
+    """Latest bacenta and basonta figures with the small group trend."""
+    latest_group = BasontaProliferationSubmission.objects.filter(
+        **ctx.scope
+    ).order_by('-submission_period', '-created_at').first()
+    
+    small_group_data = {
+        "bacentas": 0,
+        "basontas": 0,
+        "new_groups": 0,
+        "avg_attendance": 0,
+        "avg_saturday": 0,
+        "avg_sunday": 0,
+        "trend": [],
+        "chart_data": {}
+    }
+    
+    if latest_group:
+        small_group_data["bacentas"] = latest_group.current_number_of_bacentas or 0
+        small_group_data["basontas"] = latest_group.no_of_basontas or 0
+        small_group_data["new_groups"] = latest_group.no_of_new_bacentas or 0
+        small_group_data["avg_attendance"] = latest_group.average_no_of_people_at_bacenta_meeting or 0
+        small_group_data["avg_saturday"] = latest_group.avg_no_of_members_saturday_service or 0
+        small_group_data["avg_sunday"] = latest_group.avg_no_of_members_sunday_service or 0
+    
+    # Small group trend (last 12 months)
+    # Group counts are snapshots and carry over months without a submission
+    small_group_data["trend"] = monthly_trend(
+        BasontaProliferationSubmission.objects.filter(**ctx.scope),
+        'submission_period',
+        {
+            "bacentas": Max('current_number_of_bacentas'),
+            "basontas": Max('no_of_basontas'),
+            "new_groups": Sum('no_of_new_bacentas'),
+            "avg_attendance": Avg('average_no_of_people_at_bacenta_meeting'),
+            "avg_saturday": Avg('avg_no_of_members_saturday_service'),
+            "avg_sunday": Avg('avg_no_of_members_sunday_service')
+        },
+        end=ctx.period_end,
+        carry_forward=("bacentas", "basontas")
+    )
+    
+    # Small group chart data (dual line chart)
+    small_group_data["chart_data"] = {
+        "labels": [item["label"] for item in small_group_data["trend"]],
+        "datasets": [
+            {
+                "label": "Bacentas",
+                "data": [item["bacentas"] for item in small_group_data["trend"]],
+                "color": "#2196F3"
+            },
+            {
+                "label": "Basontas",
+                "data": [item["basontas"] for item in small_group_data["trend"]],
+                "color": "#4CAF50"
+            }
+        ]
+    }
+    
+    return small_group_data
+
+
+@analytics_section('attendance', cost='medium', queries=3, depends_on=('small_groups',))
+def attendance_section(ctx):
+    """Service attendance, swollen Sunday and the attendance trend."""
+    attendance_totals = ctx.totals(GatheringBusSubmission, 'date', {
+        "avg_service": Avg('avg_attendance_for_the_service'),
+        "avg_bused": Avg('avg_number_of_members_bused'),
+        "avg_walk_in": Avg('avg_number_of_members_who_walk_in'),
+        "first_timers": Sum('avg_number_of_first_timers')
+    })
+    attendance_current = attendance_totals["current"]
+    attendance_data = {
+        "avg_service": float(attendance_current["avg_service"]),
+        "avg_saturday": float(attendance_current["avg_bused"]),
+        "avg_sunday": 0,
+        "avg_bused": float(attendance_current["avg_bused"]),
+        "avg_walk_in": float(attendance_current["avg_walk_in"]),
+        "first_timers": int(attendance_current["first_timers"]),
+        "trend": [],
+        "chart_data": {}
+    }
+    ctx.add_comparison(attendance_data, attendance_totals)
+    
+    # Get Sunday service from small groups
+    small_group_data = ctx.results["small_groups"]
+    attendance_data["avg_sunday"] = small_group_data["avg_sunday"]
+    
+    # Swollen Sunday data
+    swollen_totals = ctx.totals(SwollenSundaySubmission, 'submission_period', {
+        "attendance": Sum('attendance_for_swollen_sunday'),
+        "converts": Sum('no_of_converts_for_swollen_sunday')
+    })
+    attendance_data["swollen_sunday"] = {
+        "attendance": int(swollen_totals["current"]["attendance"]),
+        "converts": int(swollen_totals["current"]["converts"])
+    }
+    ctx.add_comparison(attendance_data["swollen_sunday"], swollen_totals)
+    
+    # Attendance trend (last 12 months)
+    attendance_data["trend"] = monthly_trend(
+        GatheringBusSubmission.objects.filter(**ctx.scope),
+        'date',
+        {
+            "avg_service": Avg('avg_attendance_for_the_service'),
+            "avg_bused": Avg('avg_number_of_members_bused'),
+            "avg_walk_in": Avg('avg_number_of_members_who_walk_in'),
+            "first_timers": Sum('avg_number_of_first_timers')
+        },
+        end=ctx.period_end
+    )
+    
+    # Attendance chart data (multi-series line chart)
+    attendance_data["chart_data"] = {
+        "labels": [item["label"] for item in attendance_data["trend"]],
+        "datasets": [
+            {
+                "label": "Service Attendance",
+                "data": [item["avg_service"] for item in attendance_data["trend"]],
+                "color": "#2196F3"
+            },
+            {
+                "label": "Bused Members",
+                "data": [item["avg_bused"] for item in attendance_data["trend"]],
+                "color": "#4CAF50"
+            },
+            {
+                "label": "Walk-in Members",
+                "data": [item["avg_walk_in"] for item in attendance_data["trend"]],
+                "color": "#FF9800"
+            },
+            {
+                "label": "First Timers",
+                "data": [item["first_timers"] for item in attendance_data["trend"]],
+                "color": "#9C27B0"
+            }
+        ]
+    }
+    
+    # Add Sunday service attendance from small groups trend
+    if small_group_data["trend"]:
+        sunday_attendance = [item["avg_sunday"] for item in small_group_data["trend"]]
+        if any(sunday_attendance):
+            attendance_data["chart_data"]["datasets"].append({
+                "label": "Sunday Service",
+                "data": sunday_attendance[:len(attendance_data["chart_data"]["labels"])],
+                "color": "#F44336"
+            })
+    
+    return attendance_data
+
+
+@analytics_section('engagement', cost='high', queries=5)
+def engagement_section(ctx):
+    """Media subscriptions, testimonies and lay school figures."""
+    engagement_totals = ctx.totals(HearingSeeingSubmission, 'date', {
+        "youtube_subscribers": Sum('no_of_people_subscribed_bishop_dag_youtube'),
+        "podcast_subscribers": Sum('no_of_people_subscribed_es_joys_podcast'),
+        "messages_listened": Sum('no_of_messages_listened_to')
+    })
+    testimony_totals = ctx.totals(TestimonySubmission, 'date', {
+        "testimonies_shared": Sum('number_of_testimonies_shared')
+    })
+    understanding_totals = ctx.totals(UnderstandingSubmission, 'date', {
+        "lay_school_attendance": Avg('average_attendance_at_lay_school_meeting'),
+        "lay_school_teachers": Sum('no_of_lay_school_teachers')
+    })
+    
+    engagement_data = {
+        "youtube_subscribers": int(engagement_totals["current"]["youtube_subscribers"]),
+        "podcast_subscribers": int(engagement_totals["current"]["podcast_subscribers"]),
+        "messages_listened": int(engagement_totals["current"]["messages_listened"]),
+        "testimonies_shared": int(testimony_totals["current"]["testimonies_shared"]),
+        "lay_school_attendance": float(understanding_totals["current"]["lay_school_attendance"]),
+        "lay_school_teachers": int(understanding_totals["current"]["lay_school_teachers"]),
+        "trend": [],
+        "chart_data": {}
+    }
+    ctx.add_comparison(engagement_data, engagement_totals, testimony_totals, understanding_totals)
+    
+    # Engagement trend (last 12 months)
+    engagement_data["trend"] = merge_trends(
+        rollup_trend(
+            HearingSeeingSubmission,
+            ctx.scope,
+            {
+                "youtube_subscribers": 'no_of_people_subscribed_bishop_dag_youtube',
+                "podcast_subscribers": 'no_of_people_subscribed_es_joys_podcast',
+                "messages_listened": 'no_of_messages_listened_to'
+            },
+            end=ctx.period_end
+        ),
+        rollup_trend(
+            TestimonySubmission,
+            ctx.scope,
+            {"testimonies_shared": 'number_of_testimonies_shared'},
+            end=ctx.period_end
+        )
+    )
+    
+    # Engagement chart data
+    engagement_data["chart_data"] = {
+        "labels": [item["label"] for item in engagement_data["trend"]],
+        "datasets": [
+            {
+                "label": "YouTube Subscribers",
+                "data": [item["youtube_subscribers"] for item in engagement_data["trend"]],
+                "color": "#FF0000"
+            },
+            {
+                "label": "Podcast Subscribers",
+                "data": [item["podcast_subscribers"] for item in engagement_data["trend"]],
+                "color": "#9C27B0"
+            },
+            {
+                "label": "Testimonies Shared",
+                "data": [item["testimonies_shared"] for item in engagement_data["trend"]],
+                "color": "#FF9800"
+            }
+        ]
+    }
+    
+    return engagement_data
+
+
+@analytics_section('member_care', cost='high', queries=5)
+def member_care_section(ctx):
+    """Counseling and telepastoring figures."""
+    counseling_totals = ctx.totals(IntimateCounselingSubmission, 'submission_period', {
+        "members_counseled": Sum('total_number_of_members_counseled'),
+        "in_person": Sum('no_of_members_counseled_in_person'),
+        "via_calls": Sum('no_of_members_counseled_via_calls')
+    })
+    telepastoring_totals = ctx.totals(TelepastoringSubmission, 'date', {
+        "calls_made": Sum('total_no_of_calls_made'),
+        "telepastors": Sum('no_of_telepastors')
+    })
+    
+    latest_counseling = IntimateCounselingSubmission.objects.filter(
+        **ctx.scope
+    ).order_by('-submission_period', '-created_at').first()
+    
+    member_care_data = {
+        "members_counseled": int(counseling_totals["current"]["members_counseled"]),
+        "counseling_coverage": 0.0,
+        "calls_made": int(telepastoring_totals["current"]["calls_made"]),
+        "telepastors": int(telepastoring_totals["current"]["telepastors"]),
+        "in_person": int(counseling_totals["current"]["in_person"]),
+        "via_calls": int(counseling_totals["current"]["via_calls"]),
+        "trend": [],
+        "chart_data": {}
+    }
+    ctx.add_comparison(member_care_data, counseling_totals, telepastoring_totals)
+    
+    if latest_counseling and latest_counseling.total_number_of_members:
+        total_members = latest_counseling.total_number_of_members
+        if total_members > 0:
+            member_care_data["counseling_coverage"] = (member_care_data["members_counseled"] / total_members) * 100
+    
+    # Member care trend (last 12 months)
+    member_care_data["trend"] = merge_trends(
+        rollup_trend(
+            IntimateCounselingSubmission,
+            ctx.scope,
+            {
+                "members_counseled": 'total_number_of_members_counseled',
+                "in_person": 'no_of_members_counseled_in_person',
+                "via_calls": 'no_of_members_counseled_via_calls'
+            },
+            end=ctx.period_end
+        ),
+        rollup_trend(
+            TelepastoringSubmission,
+            ctx.scope,
+            {"calls_made": 'total_no_of_calls_made'},
+            end=ctx.period_end
+        )
+    )
+    
+    # Member care chart data (stacked bar chart for counseling)
+    member_care_data["chart_data"] = {
+        "labels": [item["label"] for item in member_care_data["trend"]],
+        "datasets": [
+            {
+                "label": "Members Counseled",
+                "data": [item["members_counseled"] for item in member_care_data["trend"]],
+                "color": "#2196F3"
+            },
+            {
+                "label": "In Person",
+                "data": [item["in_person"] for item in member_care_data["trend"]],
+                "color": "#4CAF50"
+            },
+            {
+                "label": "Via Calls",
+                "data": [item["via_calls"] for item in member_care_data["trend"]],
+                "color": "#FF9800"
+            },
+            {
+                "label": "Telepastoring Calls",
+                "data": [item["calls_made"] for item in member_care_data["trend"]],
+                "color": "#9C27B0"
+            }
+        ]
+    }
+    
+    return member_care_data
+
+
+@analytics_section('prayer', cost='low', queries=2)
+def prayer_section(ctx):
+    """Hours prayed and participants."""
+    prayer_totals = ctx.totals(AntibrutishSubmission, 'date', {
+        "hours_prayed": Sum('hours_prayed'),
+        "participants": Sum('number_of_people_who_prayed')
+    })
+    prayer_data = {
+        "hours_prayed": float(prayer_totals["current"]["hours_prayed"]),
+        "participants": int(prayer_totals["current"]["participants"]),
+        "trend": [],
+        "chart_data": {}
+    }
+    ctx.add_comparison(prayer_data, prayer_totals)
+    
+    # Prayer trend (last 12 months)
+    prayer_data["trend"] = rollup_trend(
+        AntibrutishSubmission,
+        ctx.scope,
+        {
+            "hours_prayed": 'hours_prayed',
+            "participants": 'number_of_people_who_prayed'
+        },
+        end=ctx.period_end
+    )
+    
+    # Prayer chart data (dual axis chart)
+    prayer_data["chart_data"] = {
+        "labels": [item["label"] for item in prayer_data["trend"]],
+        "datasets": [
+            {
+                "label": "Hours Prayed",
+                "data": [item["hours_prayed"] for item in prayer_data["trend"]],
+                "color": "#2196F3",
+                "yAxisID": "y"
+            },
+            {
+                "label": "Participants",
+                "data": [item["participants"] for item in prayer_data["trend"]],
+                "color": "#4CAF50",
+                "yAxisID": "y1"
+            }
+        ]
+    }
+    
+    return prayer_data
+
+
+@analytics_section('outreach', cost='medium', queries=4)
+def outreach_section(ctx):
+    """Multiplication outreaches and sheep seeking visits."""
+    multiplication_totals = ctx.totals(MultiplicationSubmission, 'date', {
+        "total_outreaches": Sum('no_of_outreaches'),
+        "members_from_outreaches": Sum('no_of_members_who_came_from_outreaches_to_church'),
+        "total_invites": Sum('no_of_invites_done')
+    })
+    sheep_seeking_totals = ctx.totals(SheepSeekingSubmission, 'date', {
+        "people_visited": Sum('no_of_people_visited'),
+        "first_time_retained": Sum('no_of_first_time_retained'),
+        "converts_retained": Sum('no_of_converts_retained')
+    })
+    
+    outreach_data = {
+        "total_outreaches": int(multiplication_totals["current"]["total_outreaches"]),
+        "members_from_outreaches": int(multiplication_totals["current"]["members_from_outreaches"]),
+        "total_invites": int(multiplication_totals["current"]["total_invites"]),
+        "people_visited": int(sheep_seeking_totals["current"]["people_visited"]),
+        "first_time_retained": int(sheep_seeking_totals["current"]["first_time_retained"]),
+        "converts_retained": int(sheep_seeking_totals["current"]["converts_retained"]),
+        "trend": [],
+        "chart_data": {}
+    }
+    ctx.add_comparison(outreach_data, multiplication_totals, sheep_seeking_totals)
+    
+    # Outreach trend (last 12 months)
+    outreach_data["trend"] = merge_trends(
+        rollup_trend(
+            MultiplicationSubmission,
+            ctx.scope,
+            {
+                "outreaches": 'no_of_outreaches',
+                "members_from_outreaches": 'no_of_members_who_came_from_outreaches_to_church',
+                "invites": 'no_of_invites_done'
+            },
+            end=ctx.period_end
+        ),
+        rollup_trend(
+            SheepSeekingSubmission,
+            ctx.scope,
+            {
+                "people_visited": 'no_of_people_visited',
+                "first_time_retained": 'no_of_first_time_retained',
+                "converts_retained": 'no_of_converts_retained'
+            },
+            end=ctx.period_end
+        )
+    )
+    
+    # Outreach chart data (funnel-style stacked chart)
+    outreach_data["chart_data"] = {
+        "labels": [item["label"] for item in outreach_data["trend"]],
+        "datasets": [
+            {
+                "label": "Outreaches",
+                "data": [item["outreaches"] for item in outreach_data["trend"]],
+                "color": "#2196F3"
+            },
+            {
+                "label": "People Visited",
+                "data": [item["people_visited"] for item in outreach_data["trend"]],
+                "color": "#4CAF50"
+            },
+            {
+                "label": "Members from Outreaches",
+                "data": [item["members_from_outreaches"] for item in outreach_data["trend"]],
+                "color": "#FF9800"
+            },
+            {
+                "label": "First Time Retained",
+                "data": [item["first_time_retained"] for item in outreach_data["trend"]],
+                "color": "#9C27B0"
+            },
+            {
+                "label": "Converts Retained",
+                "data": [item["converts_retained"] for item in outreach_data["trend"]],
+                "color": "#F44336"
+            }
+        ]
+    }
+    
+    return outreach_data
+
+
+@analytics_section('forecast', cost='medium', queries=3)
+def forecast_section(ctx):
+    """Membership, attendance and souls won projected over the next months, with moving averages and growth rates."""
+    forecast_data = forecast_scope(ctx.scope, end=ctx.period_end)
+    forecast_data["horizon"] = DEFAULT_HORIZON
+    return forecast_data
+
+
+def max_workers():
+    return getattr(settings, 'ANALYTICS_MAX_WORKERS', 4)
+
+
+def worker_count(sections):
+    """Threads evaluate_sections() will use for `sections`."""
+    if connection.in_atomic_block:
+        return 1
+    return max(min(max_workers(), len(sections)), 1)
+
+
+def _timed(section, ctx):
+    started = time.perf_counter()
+    result = section(ctx)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def _run_in_thread(section, ctx):
+    try:
+        return _timed(section, ctx)
+    finally:
+        # Worker threads open their own connection; don't leave it behind
+        connection.close()
+
+
+def evaluate_sections(ctx, sections):
+    """
+    Run `sections` and yield (name, result, duration_ms) as each one finishes.
+    
+    Sections run on a thread pool of ANALYTICS_MAX_WORKERS threads, starting as soon
+    as the sections they depend on are done. They run one after another on the
+    calling thread when ANALYTICS_MAX_WORKERS is 1, or inside a transaction whose
+    uncommitted rows other connections could not see.
+    """
+    workers = worker_count(sections)
+    
+    if workers == 1:
+        for section in sections:
+            result, duration = _timed(section.func, ctx)
+            ctx.results[section.name] = result
+            yield section.name, result, duration
+        return
+    
+    pending = list(sections)
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analytics') as pool:
+        while pending or running:
+            for section in list(pending):
+                if all(dependency in ctx.results for dependency in section.depends_on):
+                    pending.remove(section)
+                    running[pool.submit(_run_in_thread, section.func, ctx)] = section.name
+            
+            if not running:
+                raise ValueError(f"Unresolvable section dependencies: {[section.name for section in pending]}")
+            
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result, duration = future.result()
+                ctx.results[name] = result
+                yield name, result, duration
+
+
+class InvalidAnalyticsRequest(ValueError):
+    """Raised for query parameters the analytics endpoints cannot use."""
+
+
+def prepare_analytics(params, scope):
+    """
+    Validate the analytics query parameters `params`.
+    Returns (ctx, sections, requested) or raises InvalidAnalyticsRequest.
+    """
+    # Determine date range
+    try:
+        period, period_start, period_end = resolve_period(params)
+    except ValueError:
+        raise InvalidAnalyticsRequest("Invalid date format. Use YYYY-MM-DD.")
+    
+    # Comparison windows: current and previous period, plus any requested with ?compare=
+    try:
+        compare = parse_compare(params.get('compare'))
+    except ValueError as exc:
+        raise InvalidAnalyticsRequest(f"Invalid compare option '{exc}'. Use previous, yoy, all_time or true.")
+    
+    # Only the requested sections (and what they depend on) are computed
+    requested = parse_sections(params.get('sections'))
+    try:
+        sections = resolve_sections(requested)
+    except ValueError as exc:
+        raise InvalidAnalyticsRequest(f"Unknown section '{exc}'. Use one of: {', '.join(SECTION_REGISTRY)}.")
+    
+    ctx = AnalyticsContext(scope, period, period_start, period_end, compare)
+    return ctx, sections, requested
+
+
+def _period_data(ctx):
+    return {
+        "type": ctx.period,
+        "start": ctx.period_start.isoformat() if ctx.period_start else None,
+        "end": ctx.period_end.isoformat() if ctx.period_end else None
+    }
+
+
+def _meta_data(sections, started, timings):
+    return {
+        "workers": worker_count(sections),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        "section_timings_ms": timings
+    }
+
+
+def standard_analytics(params, scope):
+    """
+    Membership, soul winning, leadership, small group, attendance, engagement,
+    member care, prayer and outreach analytics for the submissions matching `scope`,
+    for the query parameters `params`.
+    """
+    try:
+        ctx, sections, requested = prepare_analytics(params, scope)
+    except InvalidAnalyticsRequest as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    started = time.perf_counter()
+    timings = {}
+    for name, result, duration in evaluate_sections(ctx, sections):
+        timings[name] = round(duration, 2)
+    
+    # ===== BUILD RESPONSE =====
+    analytics_data = {
+        "period": _period_data(ctx)
+    }
+    for section in sections:
+        if not requested or section.name in requested:
+            analytics_data[section.name] = ctx.results[section.name]
+    
+    analytics_data["meta"] = _meta_data(sections, started, timings)
+    
+    return Response(analytics_data, status=status.HTTP_200_OK)
+
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream',
+}
+
+
+def requested_stream_format(request):
+    """
+    The stream format asked for with ?stream=, or else negotiated from the Accept
+    header (or ?format=) by NDJSONRenderer or EventStreamRenderer; None for one JSON document.
+    """
+    accepted = getattr(request, 'accepted_renderer', None)
+    negotiated = accepted.format if accepted is not None and accepted.format in STREAM_FORMATS else None
+    return request.query_params.get('stream') or negotiated
+
+
+def _encode_event(stream_format, event, payload):
+    if stream_format == 'sse':
+        return f"event: {event}\ndata: {json.dumps(payload, cls=JSONEncoder)}\n\n".encode()
+    return f"{json.dumps({'event': event, **payload}, cls=JSONEncoder)}\n".encode()
+
+
+def _stream_events(ctx, sections, requested, stream_format):
+    started = time.perf_counter()
+    timings = {}
+    
+    yield _encode_event(stream_format, 'period', {"period": _period_data(ctx)})
+    for name, result, duration in evaluate_sections(ctx, sections):
+        timings[name] = round(duration, 2)
+        if not requested or name in requested:
+            yield _encode_event(stream_format, 'section', {
+                "section": name,
+                "data": result,
+                "duration_ms": timings[name]
+            })
+    yield _encode_event(stream_format, 'done', {"meta": _meta_data(sections, started, timings)})
+
+
+async def _async_stream_events(events):
+    # Under ASGI a synchronous iterator would be buffered until it is exhausted, so
+    # step it from the sync thread (where the database connection lives) one event at a time
+    step = sync_to_async(next, thread_sensitive=True)
+    finished = object()
+    while True:
+        event = await step(events, finished)
+        if event is finished:
+            break
+        yield event
+
+
+def stream_standard_analytics(request, scope, stream_format):
+    """
+    Stream the analytics of `scope` section by section as they finish.
+    
+    `stream_format` is 'ndjson' (one JSON object per line) or 'sse' (server-sent
+    events). Events, in order: period, one section event per section, done (with
+    the timings in "meta").
+    """
+    try:
+        ctx, sections, requested = prepare_analytics(request.query_params, scope)
+    except InvalidAnalyticsRequest as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    events = _stream_events(ctx, sections, requested, stream_format)
+    if isinstance(request._request, ASGIRequest):
+        events = _async_stream_events(events)
+    
+    response = StreamingHttpResponse(events, content_type=STREAM_FORMATS[stream_format])
+    response["Cache-Control"] = "no-cache"
+    # Stop reverse proxies (nginx) from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,179 @@
+"""
+Response cache for the dashboard and analytics endpoints.
+
+Cached responses are keyed by (endpoint, user, role) and the period, start_date,
+end_date, compare and sections parameters, and stamped with the generations of everything
+they were computed from: the user, the user's service and, for campaign managers,
+every assigned campaign (other users' dashboards list campaigns through a single
+generation for all of them).
+Saving or deleting a submission bumps the generations it belongs to, so only the
+responses that could include it are recomputed. Saving or deleting a user, a
+service or a campaign bumps its own generation, since dashboards show profile
+fields, service names and campaign names and icons.
+
+With ANALYTICS_CACHE_STALE_WHILE_REVALIDATE enabled an invalidated response is
+served once more while a background thread recomputes it. The thread is given the
+cached query parameters and the user id, never the request, which is finished with
+by the time the thread runs.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import close_old_connections, connection, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+
+CACHE_PREFIX = 'analytics'
+CACHE_PARAMS = ('period', 'start_date', 'end_date', 'compare', 'sections')
+
+
+def get_cache():
+    return caches[getattr(settings, 'ANALYTICS_CACHE_ALIAS', 'default')]
+
+
+def cache_timeout():
+    return getattr(settings, 'ANALYTICS_CACHE_TIMEOUT', 300)
+
+
+def stale_while_revalidate():
+    return getattr(settings, 'ANALYTICS_CACHE_STALE_WHILE_REVALIDATE', False)
+
+
+def user_generation_key(user_id):
+    return f"{CACHE_PREFIX}:gen:user:{user_id}"
+
+
+def service_generation_key(service_id):
+    return f"{CACHE_PREFIX}:gen:service:{service_id}"
+
+
+def campaign_generation_key(content_type_id, campaign_id):
+    return f"{CACHE_PREFIX}:gen:campaign:{content_type_id}:{campaign_id}"
+
+
+def campaigns_generation_key():
+    return f"{CACHE_PREFIX}:gen:campaigns"
+
+
+def _bump(keys):
+    cache = get_cache()
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Unknown generations start from the clock so an evicted key never
+            # comes back with a value an older response was stamped with
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_generations(keys):
+    """Invalidate every cached response stamped with one of `keys` once the current transaction commits."""
+    keys = [key for key in keys if key]
+    if keys:
+        transaction.on_commit(lambda: _bump(keys))
+
+
+def get_generations(keys):
+    """Current value of each generation key, initialising missing ones."""
+    cache = get_cache()
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)
+        generations.update(cache.get_many(missing))
+    return [generations.get(key) for key in keys]
+
+
+def generation_keys_for(user):
+    """The generations a user's dashboard and analytics depend on."""
+    keys = [user_generation_key(user.id)]
+    if user.service_id:
+        keys.append(service_generation_key(user.service_id))
+
+    if user.is_campaign_manager:
+        keys.extend(
+            campaign_generation_key(ct_id, campaign_id)
+            for ct_id, campaign_id in sorted(user.get_assignment_pairs())
+        )
+    else:
+        keys.append(campaigns_generation_key())
+
+    return keys
+
+
+def request_params(request):
+    """The query parameters a cached response depends on, as a plain dict."""
+    return {name: request.query_params[name] for name in CACHE_PARAMS if name in request.query_params}
+
+
+def response_cache_key(endpoint, params, user):
+    values = '|'.join(params.get(name, '') for name in CACHE_PARAMS)
+    digest = hashlib.md5(values.lower().encode()).hexdigest()
+    return f"{CACHE_PREFIX}:{endpoint}:{user.id}:{user.role}:{digest}"
+
+
+def _version(keys):
+    values = get_generations(keys)
+    return hashlib.md5('|'.join(f"{key}={value}" for key, value in zip(keys, values)).encode()).hexdigest()
+
+
+def _store(cache_key, version, data):
+    get_cache().set(cache_key, {"version": version, "data": data}, cache_timeout())
+
+
+def _revalidate(cache_key, lock_key, version, compute, params, user_id):
+    try:
+        close_old_connections()
+        user = get_user_model()._default_manager.filter(pk=user_id).first()
+        if user is None:
+            return
+        response = compute(params, user)
+        if response.status_code == status.HTTP_200_OK:
+            _store(cache_key, version, response.data)
+    finally:
+        get_cache().delete(lock_key)
+        connection.close()
+
+
+def cached_response(endpoint, request, user, compute, generation_keys=None):
+    """
+    Return the cached response of `compute(params, user)` for this user and request,
+    recomputing it when one of its generations has moved on. `params` holds the
+    request's CACHE_PARAMS; compute() must not use the request itself.
+    `generation_keys` defaults to generation_keys_for(user).
+    Responses carry an X-Cache header of HIT, STALE or MISS.
+    """
+    cache = get_cache()
+    params = request_params(request)
+    cache_key = response_cache_key(endpoint, params, user)
+    version = _version(generation_keys if generation_keys is not None else generation_keys_for(user))
+
+    entry = cache.get(cache_key)
+    if entry is not None and entry["version"] == version:
+        response = Response(entry["data"], status=status.HTTP_200_OK)
+        response["X-Cache"] = "HIT"
+        return response
+
+    if entry is not None and stale_while_revalidate():
+        lock_key = f"{cache_key}:revalidating"
+        if cache.add(lock_key, 1, timeout=cache_timeout()):
+            threading.Thread(
+                target=_revalidate,
+                args=(cache_key, lock_key, version, compute, params, user.id),
+                daemon=True,
+            ).start()
+        response = Response(entry["data"], status=status.HTTP_200_OK)
+        response["X-Cache"] = "STALE"
+        return response
+
+    response = compute(params, user)
+    if response.status_code == status.HTTP_200_OK:
+        _store(cache_key, version, response.data)
+    response["X-Cache"] = "MISS"
+    return response
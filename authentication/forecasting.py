@@ -0,0 +1,264 @@
+"""
+Forecasts and growth rates for membership, attendance and souls won.
+
+Each metric is loaded as a (groups x months) matrix with one grouped query per
+metric, a group being a whole scope (one user's analytics) or a service (the
+admin batch endpoint). Moving averages, compound monthly growth rates and a
+least squares trend line are then computed for every row at once with NumPy.
+
+Only completed months are fitted: a month still in progress would read as a drop
+in souls won and attendance and pull the trend line down.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.db import models
+from django.db.models import Avg, Max, Sum
+from django.db.models.functions import TruncMonth
+
+from campaigns.models import (
+    StateOfTheFlockSubmission,
+    GatheringBusSubmission,
+    SoulWinningSubmission,
+)
+from campaigns.registry import get_campaign_type
+from campaigns.rollups import next_month
+from campaigns.trends import local_date, trend_months
+
+
+FORECAST_METRICS = {
+    'membership': {
+        'label': 'Total Membership',
+        'model': StateOfTheFlockSubmission,
+        'aggregate': Max('total_membership'),
+        # Snapshots: a month without a submission keeps the previous month's value
+        'carry_forward': True,
+    },
+    'attendance': {
+        'label': 'Average Attendance',
+        'model': GatheringBusSubmission,
+        'aggregate': Avg('avg_attendance_for_the_service'),
+        'carry_forward': True,
+    },
+    'souls_won': {
+        'label': 'Souls Won',
+        'model': SoulWinningSubmission,
+        'aggregate': Sum('no_of_souls_won'),
+        'carry_forward': False,
+    },
+}
+
+HISTORY_MONTHS = 12
+DEFAULT_HORIZON = 6
+MAX_HORIZON = 12
+MOVING_AVERAGE_WINDOW = 3
+
+
+def _month_index(month):
+    return month.year * 12 + month.month - 1
+
+
+def history_months(end=None):
+    """
+    The HISTORY_MONTHS completed months up to `end` (default today), oldest first.
+    The month of `end` is included only when `end` is its last day.
+    """
+    end = local_date(end)
+    if next_month(end) - timedelta(days=1) > end:
+        end = end.replace(day=1) - timedelta(days=1)
+    return trend_months(HISTORY_MONTHS, end)
+
+
+def _future_months(last, horizon):
+    months = []
+    for _ in range(horizon):
+        last = next_month(last)
+        months.append(last)
+    return months
+
+
+def _load_matrix(metric, queryset, group_field, months):
+    """
+    Monthly values of `metric` as a (groups, months) float array with NaN for
+    months without submissions, and the group keys in row order.
+    """
+    spec = FORECAST_METRICS[metric]
+    date_field = get_campaign_type(spec['model']).date_field
+    group_values = [group_field] if group_field else []
+
+    rows = list(
+        queryset
+        .filter(**{f"{date_field}__gte": months[0], f"{date_field}__lt": next_month(months[-1])})
+        .annotate(forecast_month=TruncMonth(date_field, output_field=models.DateField()))
+        .values(*group_values, 'forecast_month')
+        .annotate(value=spec['aggregate'])
+        .order_by()
+    )
+
+    if group_field:
+        groups, rows_index = np.unique(
+            np.array([row[group_field] for row in rows], dtype=np.int64), return_inverse=True
+        )
+    else:
+        groups, rows_index = np.array([None]), np.zeros(len(rows), dtype=np.int64)
+
+    matrix = np.full((len(groups), len(months)), np.nan)
+    if rows:
+        columns = np.array([_month_index(row['forecast_month']) for row in rows]) - _month_index(months[0])
+        values = np.array([row['value'] if row['value'] is not None else np.nan for row in rows], dtype=float)
+        matrix[rows_index, columns] = values
+
+    if spec['carry_forward']:
+        matrix = _forward_fill(matrix)
+    else:
+        matrix = np.nan_to_num(matrix, nan=0.0)
+    return matrix, groups.tolist()
+
+
+def _forward_fill(matrix):
+    """Replace each NaN with the last value before it in the same row (leading NaNs stay)."""
+    valid = ~np.isnan(matrix)
+    positions = np.where(valid, np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(positions, axis=1, out=positions)
+    filled = matrix[np.arange(matrix.shape[0])[:, None], positions]
+    seen = np.maximum.accumulate(valid, axis=1)
+    return np.where(seen, filled, np.nan)
+
+
+def moving_average(matrix, window=MOVING_AVERAGE_WINDOW):
+    """Trailing mean over the last `window` months of each row, ignoring missing months."""
+    valid = ~np.isnan(matrix)
+    values = np.where(valid, matrix, 0.0)
+    padding = np.zeros((matrix.shape[0], 1))
+    sums = np.cumsum(np.hstack([padding, values]), axis=1)
+    counts = np.cumsum(np.hstack([padding, valid.astype(float)]), axis=1)
+    start = np.maximum(np.arange(1, matrix.shape[1] + 1) - window, 0)
+    end = np.arange(1, matrix.shape[1] + 1)
+    window_sums = sums[:, end] - sums[:, start]
+    window_counts = counts[:, end] - counts[:, start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+
+def compound_growth_rate(matrix):
+    """
+    Compound monthly growth rate of each row between its first and last positive
+    values, as a fraction. NaN where a row has fewer than two positive months.
+    """
+    positive = np.nan_to_num(matrix, nan=0.0) > 0
+    columns = matrix.shape[1]
+    first = np.argmax(positive, axis=1)
+    last = columns - 1 - np.argmax(positive[:, ::-1], axis=1)
+    rows = np.arange(matrix.shape[0])
+    periods = last - first
+    usable = positive.any(axis=1) & (periods > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratio = matrix[rows, last] / matrix[rows, first]
+        rate = np.power(ratio, 1.0 / np.where(periods > 0, periods, 1)) - 1
+    return np.where(usable, rate, np.nan)
+
+
+def linear_forecast(matrix, horizon):
+    """
+    Fit a least squares line to the known months of every row at once and project
+    it `horizon` months ahead. Returns (forecast, slope); negative projections are
+    clipped to 0 and rows with fewer than two known months project their last value.
+    """
+    valid = ~np.isnan(matrix)
+    x = np.arange(matrix.shape[1], dtype=float)
+    y = np.where(valid, matrix, 0.0)
+
+    n = valid.sum(axis=1)
+    sum_x = (valid * x).sum(axis=1)
+    sum_y = y.sum(axis=1)
+    sum_xy = (y * x).sum(axis=1)
+    sum_xx = (valid * x * x).sum(axis=1)
+
+    denominator = n * sum_xx - sum_x ** 2
+    fitted = denominator > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = np.where(fitted, (n * sum_xy - sum_x * sum_y) / denominator, 0.0)
+        intercept = np.where(n > 0, (sum_y - slope * sum_x) / n, 0.0)
+
+    future_x = matrix.shape[1] - 1 + np.arange(1, horizon + 1, dtype=float)
+    forecast = intercept[:, None] + slope[:, None] * future_x[None, :]
+
+    # One known month: repeat it
+    last_known = _forward_fill(matrix)[:, -1]
+    forecast = np.where(fitted[:, None], forecast, np.nan_to_num(last_known, nan=0.0)[:, None])
+    return np.clip(forecast, 0, None), slope
+
+
+def _round(value, digits=2):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+
+def _series(months, future, values, averages, forecast, slope, growth):
+    return {
+        "history": [
+            {
+                "period": month.strftime("%Y-%m"),
+                "label": month.strftime("%b %Y"),
+                "value": _round(value),
+                "moving_average": _round(average),
+            }
+            for month, value, average in zip(months, values, averages)
+        ],
+        "forecast": [
+            {
+                "period": month.strftime("%Y-%m"),
+                "label": month.strftime("%b %Y"),
+                "value": _round(value),
+            }
+            for month, value in zip(future, forecast)
+        ],
+        "monthly_growth_rate": _round(growth * 100) if not np.isnan(growth) else None,
+        "trend_per_month": _round(slope),
+    }
+
+
+def forecast_metric(metric, queryset, group_field=None, horizon=DEFAULT_HORIZON, end=None):
+    """
+    History, moving average, compound monthly growth rate and forecast of `metric`
+    for every group of `queryset` (or the whole queryset when `group_field` is None).
+    Returns {group key: series}.
+    """
+    months = history_months(end)
+    future = _future_months(months[-1], horizon)
+
+    matrix, groups = _load_matrix(metric, queryset, group_field, months)
+    averages = moving_average(matrix)
+    growth = compound_growth_rate(matrix)
+    forecast, slope = linear_forecast(matrix, horizon)
+
+    return {
+        group: _series(months, future, matrix[row], averages[row], forecast[row], slope[row], growth[row])
+        for row, group in enumerate(groups)
+    }
+
+
+def forecast_scope(scope, horizon=DEFAULT_HORIZON, end=None):
+    """Forecasts of every metric for the submissions matching `scope`."""
+    return {
+        metric: {
+            "label": spec['label'],
+            **forecast_metric(metric, spec['model'].objects.filter(**scope), horizon=horizon, end=end)[None]
+        }
+        for metric, spec in FORECAST_METRICS.items()
+    }
+
+
+def forecast_services(metrics, horizon=DEFAULT_HORIZON, end=None):
+    """
+    Forecasts of `metrics` for every service with submissions, one query per metric.
+    Returns {service_id: {metric: series}}.
+    """
+    results = {}
+    for metric in metrics:
+        model = FORECAST_METRICS[metric]['model']
+        per_service = forecast_metric(
+            metric, model.objects.filter(service__isnull=False), 'service_id', horizon=horizon, end=end
+        )
+        for service_id, series in per_service.items():
+            results.setdefault(service_id, {})[metric] = series
+    return results
@@ -0,0 +1,175 @@
+"""
+Cross-service leaderboards.
+
+Every service with submissions in the period is ranked on one metric with a single
+grouped query: conditional aggregates give the current and previous period per
+service, and RANK / PERCENT_RANK window functions rank them in the database.
+Databases without window function support (old SQLite builds) rank the grouped
+rows with NumPy instead.
+"""
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Avg, F, FloatField, Max, Q, Sum, Value, Window
+from django.db.models.functions import Coalesce, PercentRank, Rank
+
+from campaigns.comparisons import _within
+from campaigns.registry import get_campaign_type
+from campaigns.rollups import month_start
+from campaigns.models import (
+    SoulWinningSubmission,
+    StateOfTheFlockSubmission,
+    AntibrutishSubmission,
+    GatheringBusSubmission,
+)
+
+
+LEADERBOARD_METRICS = {
+    'souls_won': {
+        'label': 'Souls Won',
+        'model': SoulWinningSubmission,
+        'aggregate': Sum('no_of_souls_won'),
+    },
+    'membership_growth': {
+        'label': 'Membership Growth',
+        'model': StateOfTheFlockSubmission,
+        'aggregate': Max('total_membership'),
+        # Growth is the change in the membership snapshot from one period to the next
+        'growth': True,
+    },
+    'prayer_hours': {
+        'label': 'Prayer Hours',
+        'model': AntibrutishSubmission,
+        'aggregate': Sum('hours_prayed'),
+    },
+    'attendance': {
+        'label': 'Average Attendance',
+        'model': GatheringBusSubmission,
+        'aggregate': Avg('avg_attendance_for_the_service'),
+    },
+}
+
+
+def _shift_back_months(window):
+    """
+    The window covering the same number of whole months immediately before `window`.
+    Snapshot metrics are dated by submission_period (the first of the month), so their
+    windows are aligned to calendar months.
+    """
+    start, end = month_start(window[0]), window[1]
+    months = (end.year - start.year) * 12 + end.month - start.month + 1
+    previous_end = start - timedelta(days=1)
+    previous_start = month_start(previous_end)
+    for _ in range(months - 1):
+        previous_start = month_start(previous_start - timedelta(days=1))
+    return previous_start, previous_end
+
+
+def _windowed(aggregate, date_field, window, default=0):
+    condition = Q(**{f"{date_field}__gte": window[0], f"{date_field}__lte": window[1]})
+    expression = _within(aggregate, condition)
+    if default is None:
+        return expression
+    return Coalesce(expression, Value(default), output_field=FloatField())
+
+
+def _grouped_queryset(metric, current, previous):
+    spec = LEADERBOARD_METRICS[metric]
+    model, aggregate = spec['model'], spec['aggregate']
+    date_field = get_campaign_type(model).date_field
+
+    if spec.get('growth'):
+        current = (month_start(current[0]), current[1])
+        previous = _shift_back_months(current)
+        windows = [current, previous, _shift_back_months(previous)]
+    else:
+        windows = [current, previous]
+
+    qs = (
+        model.objects
+        .filter(
+            service__isnull=False,
+            **{f"{date_field}__gte": windows[-1][0], f"{date_field}__lte": current[1]}
+        )
+        .values('service_id', 'service__name')
+    )
+
+    if spec.get('growth'):
+        # Without a snapshot in both periods there is no growth to report
+        qs = qs.annotate(
+            current=_windowed(aggregate, date_field, windows[0], default=None),
+            previous=_windowed(aggregate, date_field, windows[1], default=None),
+            before_previous=_windowed(aggregate, date_field, windows[2], default=None),
+        ).annotate(
+            value=F('current') - F('previous'),
+            previous_value=F('previous') - F('before_previous'),
+        )
+    else:
+        qs = qs.annotate(
+            value=_windowed(aggregate, date_field, current),
+            previous_value=_windowed(aggregate, date_field, previous),
+        )
+
+    return qs.annotate(delta=F('value') - F('previous_value')).order_by()
+
+
+def _to_float(value):
+    return float(value) if value is not None else None
+
+
+def _leaderboard_row(row):
+    return {
+        "rank": row["rank"],
+        "percentile": round(float(row["percentile"]) * 100, 2),
+        "service_id": row["service_id"],
+        "service_name": row["service__name"],
+        "value": _to_float(row["value"]),
+        "previous_value": _to_float(row["previous_value"]),
+        "delta": _to_float(row["delta"]),
+    }
+
+
+def _rank_in_database(qs, limit):
+    rows = (
+        qs
+        .annotate(
+            rank=Window(Rank(), order_by=F('value').desc(nulls_last=True)),
+            percentile=Window(PercentRank(), order_by=F('value').asc(nulls_first=True)),
+        )
+        .order_by('rank', 'service__name')[:limit]
+    )
+    return [_leaderboard_row(row) for row in rows]
+
+
+def _rank_with_numpy(qs, limit):
+    import numpy as np
+
+    rows = list(qs)
+    if not rows:
+        return []
+
+    # Services without a value rank last, as with NULLS LAST in SQL
+    values = np.array([_to_float(row["value"]) if row["value"] is not None else -np.inf for row in rows])
+    descending = np.sort(-values)
+    ascending = np.sort(values)
+    ranks = np.searchsorted(descending, -values, side='left') + 1
+    ascending_ranks = np.searchsorted(ascending, values, side='left')
+    percentiles = ascending_ranks / (len(rows) - 1) if len(rows) > 1 else np.zeros(len(rows))
+
+    for row, rank, percentile in zip(rows, ranks, percentiles):
+        row["rank"] = int(rank)
+        row["percentile"] = float(percentile)
+
+    rows.sort(key=lambda row: (row["rank"], row["service__name"] or ""))
+    return [_leaderboard_row(row) for row in rows[:limit]]
+
+
+def service_leaderboard(metric, current, previous, limit=10):
+    """
+    Rank services on `metric` for the `current` (start, end) date window and
+    compare each with the `previous` window. Returns the top `limit` rows.
+    """
+    qs = _grouped_queryset(metric, current, previous)
+    if connection.features.supports_over_clause:
+        return _rank_in_database(qs, limit)
+    return _rank_with_numpy(qs, limit)
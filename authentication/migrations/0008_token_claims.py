@@ -0,0 +1,29 @@
+# Generated by Django 4.2.20 on 2026-10-17 18:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_alter_service_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaimsUser',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('authentication.customeruser',),
+        ),
+        migrations.AddField(
+            model_name='customeruser',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -82,6 +82,8 @@ class CustomerUser(AbstractUser):
     last_login=models.DateTimeField(auto_now=True,null=True,blank=True)
     created_at=models.DateTimeField(auto_now_add=True,null=True,blank=True)
     updated_at=models.DateTimeField(auto_now=True,null=True,blank=True)
+    # Bumped whenever a claim carried in this user's access tokens changes (see authentication/tokens.py)
+    token_version=models.PositiveIntegerField(default=0)
 
     objects=UserManager()
 
@@ -101,10 +103,36 @@ class CustomerUser(AbstractUser):
         """Get all campaigns assigned to this campaign manager"""
         if self.is_campaign_manager:
             if hasattr(self, 'campaign_assignments'):
-                return [assignment.campaign for assignment in self.campaign_assignments.all()]
+                return [assignment.campaign for assignment in self.campaign_assignments.with_campaigns()]
         return []
 
+    def get_assignment_pairs(self):
+        """(content type id, campaign id) of every campaign assigned to this campaign manager"""
+        if not self.is_campaign_manager:
+            return set()
+        return set(self.campaign_assignments.values_list('content_type_id', 'object_id'))
+
     def __str__(self):
         return self.full_name
 
 
+class ClaimsUser(CustomerUser):
+    """
+    A user built from the claims of an access token by ClaimsJWTAuthentication.
+
+    Only the fields the token carries are loaded. The rest of the row is read, in
+    one query, the first time any of it is used.
+    """
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None):
+        if fields is not None:
+            # Load every deferred field instead of one query per field
+            fields = set(fields) | self.get_deferred_fields()
+        super().refresh_from_db(using=using, fields=fields)
+
+    def get_assignment_pairs(self):
+        return set(self.token_assignments)
+
+
@@ -0,0 +1,39 @@
+from rest_framework.renderers import JSONRenderer
+
+
+def _event_name(renderer_context):
+    response = (renderer_context or {}).get('response')
+    return 'error' if response is not None and response.status_code >= 400 else 'result'
+
+
+class NDJSONRenderer(JSONRenderer):
+    """
+    Lets clients ask for newline-delimited JSON streams (?stream=ndjson).
+    Non-streamed responses, such as validation errors, are rendered as one line
+    with an "event" of "error" (or "result"), like the events of a stream.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            data = {'event': _event_name(renderer_context), **data}
+        return super().render(data, 'application/json', renderer_context) + b'\n'
+
+
+class EventStreamRenderer(JSONRenderer):
+    """
+    Lets clients ask for server-sent events (?stream=sse).
+    Non-streamed responses, such as validation errors, are rendered as a single
+    "error" (or "result") event.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        payload = super().render(data, 'application/json', renderer_context)
+        return b'event: ' + _event_name(renderer_context).encode() + b'\ndata: ' + payload + b'\n\n'
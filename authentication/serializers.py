@@ -1,16 +1,25 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from .models import Service, CustomerUser
+from .cache import bump_generations, user_generation_key
+from .tokens import apply_claims, bump_token_version
 from campaigns.models import CampaignManagerAssignment
-from django.contrib.contenttypes.models import ContentType
+from campaigns.catalog import confirm_campaign_names, resolve_campaign_names
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Custom JWT serializer that includes user information in the token response.
     Adds user details like role, service, and profile information.
+    The tokens carry the claims ClaimsJWTAuthentication builds the request user from.
     """
     
+    @classmethod
+    def get_token(cls, user):
+        return apply_claims(super().get_token(user), user)
+    
     def validate(self, attrs):
         data = super().validate(attrs)
         
@@ -50,6 +59,24 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Issues the new access token with the user's current claims, so refreshing picks
+    up role, service and campaign assignment changes made since login.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user = CustomerUser.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.payload.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+
+        return {"access": str(apply_claims(refresh.access_token, user))}
+
+
 class ServiceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Service
@@ -194,6 +221,70 @@ class CampaignAssignmentSerializer(serializers.Serializer):
     campaign_name = serializers.CharField(help_text="Campaign name (from any campaign type)")
 
 
+def resolve_campaign_assignments(value):
+    """
+    Parse campaign assignments (a list, or its JSON from multipart/form-data) and
+    resolve every campaign name at once against the campaign catalog, then confirm
+    the campaigns in the database. Returns the assignments with the 'content_type'
+    and 'object_id' each name refers to.
+    """
+    import json
+    
+    # If it's a string (from multipart/form-data), parse it
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            raise serializers.ValidationError("campaign_assignments must be valid JSON.")
+    
+    if not value or not isinstance(value, list):
+        raise serializers.ValidationError("At least one campaign assignment is required.")
+    
+    for assignment in value:
+        if not isinstance(assignment, dict):
+            raise serializers.ValidationError("Each assignment must be an object with campaign_name.")
+        if not assignment.get('campaign_name'):
+            raise serializers.ValidationError("campaign_name is required for each assignment.")
+    
+    names = [str(assignment['campaign_name']) for assignment in value]
+    resolved = resolve_campaign_names(names)
+    
+    for campaign_name in names:
+        if campaign_name not in resolved:
+            raise serializers.ValidationError(
+                f"Campaign with name '{campaign_name}' does not exist in any campaign type."
+            )
+        if len(resolved[campaign_name]) > 1:
+            raise serializers.ValidationError(
+                f"More than one campaign is named '{campaign_name}'. Rename one of them before assigning it."
+            )
+    
+    resolved = {campaign_name: matches[0] for campaign_name, matches in resolved.items()}
+    confirmed = confirm_campaign_names(resolved)
+    
+    assignments = []
+    for campaign_name in names:
+        if campaign_name not in confirmed:
+            raise serializers.ValidationError(
+                f"Campaign with name '{campaign_name}' does not exist in any campaign type."
+            )
+        content_type, object_id = resolved[campaign_name]
+        assignments.append({'campaign_name': campaign_name, 'content_type': content_type, 'object_id': object_id})
+    return assignments
+
+
+def sync_campaign_assignments(user, assignments):
+    """Make the resolved `assignments` the user's exact set of campaign assignments."""
+    created, deleted = CampaignManagerAssignment.objects.sync_for_user(
+        user, [(assignment['content_type'], assignment['object_id']) for assignment in assignments]
+    )
+    if not created and not deleted:
+        return
+    # The sync sends no per-row signals: invalidate the user's responses and access tokens once
+    bump_generations([user_generation_key(user.id)])
+    bump_token_version(user.id)
+
+
 class CampaignManagerCreateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating a campaign manager with campaign assignments.
@@ -226,69 +317,12 @@ class CampaignManagerCreateSerializer(serializers.ModelSerializer):
     
     def validate_campaign_assignments(self, value):
         """Parse and validate campaign assignments - handles both JSON string and list"""
-        import json
-        
-        # If it's a string (from multipart/form-data), parse it
-        if isinstance(value, str):
-            try:
-                value = json.loads(value)
-            except json.JSONDecodeError:
-                raise serializers.ValidationError("campaign_assignments must be valid JSON.")
-        
-        # Now validate as before
-        if not value or not isinstance(value, list):
-            raise serializers.ValidationError("At least one campaign assignment is required.")
-        
-        # Import all campaign models (including EquipmentCampaign)
-        from campaigns.models import (
-            StateOfTheFlockCampaign, SoulWinningCampaign, ServantsArmedTrainedCampaign,
-            AntibrutishCampaign, HearingSeeingCampaign, HonourYourProphetCampaign,
-            BasontaProliferationCampaign, IntimateCounselingCampaign, TechnologyCampaign,
-            SheperdingControlCampaign, MultiplicationCampaign, UnderstandingCampaign,
-            SheepSeekingCampaign, TestimonyCampaign, TelepastoringCampaign,
-            GatheringBusCampaign, OrganisedCreativeArtsCampaign, TangerineCampaign,
-            SwollenSundayCampaign, SundayManagementCampaign, EquipmentCampaign
-        )
-        
-        # All campaign models to check
-        campaign_models = [
-            StateOfTheFlockCampaign, SoulWinningCampaign, ServantsArmedTrainedCampaign,
-            AntibrutishCampaign, HearingSeeingCampaign, HonourYourProphetCampaign,
-            BasontaProliferationCampaign, IntimateCounselingCampaign, TechnologyCampaign,
-            SheperdingControlCampaign, MultiplicationCampaign, UnderstandingCampaign,
-            SheepSeekingCampaign, TestimonyCampaign, TelepastoringCampaign,
-            GatheringBusCampaign, OrganisedCreativeArtsCampaign, TangerineCampaign,
-            SwollenSundayCampaign, SundayManagementCampaign, EquipmentCampaign,
-        ]
-        
-        # Validate each campaign name
-        for assignment in value:
-            if not isinstance(assignment, dict):
-                raise serializers.ValidationError("Each assignment must be an object with campaign_name.")
-            
-            campaign_name = assignment.get('campaign_name')
-            
-            if not campaign_name:
-                raise serializers.ValidationError("campaign_name is required for each assignment.")
-            
-            # Search for campaign by name in all campaign models
-            campaign_found = False
-            for campaign_model in campaign_models:
-                if campaign_model.objects.filter(name__iexact=campaign_name).exists():
-                    campaign_found = True
-                    break
-            
-            if not campaign_found:
-                raise serializers.ValidationError(
-                    f"Campaign with name '{campaign_name}' does not exist in any campaign type."
-                )
-        
-        return value
+        return resolve_campaign_assignments(value)
 
 
     def get_assigned_campaigns(self, obj):
         """Return list of assigned campaigns"""
-        assignments = CampaignManagerAssignment.objects.filter(user=obj).select_related('content_type')
+        assignments = CampaignManagerAssignment.objects.filter(user=obj).with_campaigns()
         return [
             {
                 'id': assignment.id,
@@ -319,44 +353,8 @@ class CampaignManagerCreateSerializer(serializers.ModelSerializer):
             profile_picture=profile_picture
         )
         
-        # Import all campaign models (including EquipmentCampaign)
-        from campaigns.models import (
-            StateOfTheFlockCampaign, SoulWinningCampaign, ServantsArmedTrainedCampaign,
-            AntibrutishCampaign, HearingSeeingCampaign, HonourYourProphetCampaign,
-            BasontaProliferationCampaign, IntimateCounselingCampaign, TechnologyCampaign,
-            SheperdingControlCampaign, MultiplicationCampaign, UnderstandingCampaign,
-            SheepSeekingCampaign, TestimonyCampaign, TelepastoringCampaign,
-            GatheringBusCampaign, OrganisedCreativeArtsCampaign, TangerineCampaign,
-            SwollenSundayCampaign, SundayManagementCampaign, EquipmentCampaign
-        )
-        
-        # All campaign models to search
-        campaign_models = [
-            StateOfTheFlockCampaign, SoulWinningCampaign, ServantsArmedTrainedCampaign,
-            AntibrutishCampaign, HearingSeeingCampaign, HonourYourProphetCampaign,
-            BasontaProliferationCampaign, IntimateCounselingCampaign, TechnologyCampaign,
-            SheperdingControlCampaign, MultiplicationCampaign, UnderstandingCampaign,
-            SheepSeekingCampaign, TestimonyCampaign, TelepastoringCampaign,
-            GatheringBusCampaign, OrganisedCreativeArtsCampaign, TangerineCampaign,
-            SwollenSundayCampaign, SundayManagementCampaign, EquipmentCampaign,
-        ]
-        
-        # Create campaign assignments - automatically detect campaign type from name
-        for assignment_data in campaign_assignments:
-            campaign_name = assignment_data['campaign_name']
-            
-            # Find which campaign model this name belongs to
-            for campaign_model in campaign_models:
-                campaign = campaign_model.objects.filter(name__iexact=campaign_name).first()
-                if campaign:
-                    content_type = ContentType.objects.get_for_model(campaign_model)
-                    
-                    CampaignManagerAssignment.objects.create(
-                        user=user,
-                        content_type=content_type,
-                        object_id=campaign.id
-                    )
-                    break  # Found the campaign, move to next assignment
+        # Create campaign assignments - the campaigns were resolved from their names during validation
+        sync_campaign_assignments(user, campaign_assignments)
         
         return user
 
@@ -395,68 +393,11 @@ class CampaignManagerUpdateSerializer(serializers.ModelSerializer):
     
     def validate_campaign_assignments(self, value):
         """Parse and validate campaign assignments - handles both JSON string and list"""
-        import json
-        
-        # If it's a string (from multipart/form-data), parse it
-        if isinstance(value, str):
-            try:
-                value = json.loads(value)
-            except json.JSONDecodeError:
-                raise serializers.ValidationError("campaign_assignments must be valid JSON.")
-        
-        # Now validate as before
-        if not value or not isinstance(value, list):
-            raise serializers.ValidationError("At least one campaign assignment is required.")
-        
-        # Import all campaign models
-        from campaigns.models import (
-            StateOfTheFlockCampaign, SoulWinningCampaign, ServantsArmedTrainedCampaign,
-            AntibrutishCampaign, HearingSeeingCampaign, HonourYourProphetCampaign,
-            BasontaProliferationCampaign, IntimateCounselingCampaign, TechnologyCampaign,
-            SheperdingControlCampaign, MultiplicationCampaign, UnderstandingCampaign,
-            SheepSeekingCampaign, TestimonyCampaign, TelepastoringCampaign,
-            GatheringBusCampaign, OrganisedCreativeArtsCampaign, TangerineCampaign,
-            SwollenSundayCampaign, SundayManagementCampaign, EquipmentCampaign
-        )
-        
-        # All campaign models to check
-        campaign_models = [
-            StateOfTheFlockCampaign, SoulWinningCampaign, ServantsArmedTrainedCampaign,
-            AntibrutishCampaign, HearingSeeingCampaign, HonourYourProphetCampaign,
-            BasontaProliferationCampaign, IntimateCounselingCampaign, TechnologyCampaign,
-            SheperdingControlCampaign, MultiplicationCampaign, UnderstandingCampaign,
-            SheepSeekingCampaign, TestimonyCampaign, TelepastoringCampaign,
-            GatheringBusCampaign, OrganisedCreativeArtsCampaign, TangerineCampaign,
-            SwollenSundayCampaign, SundayManagementCampaign, EquipmentCampaign,
-        ]
-        
-        # Validate each campaign name
-        for assignment in value:
-            if not isinstance(assignment, dict):
-                raise serializers.ValidationError("Each assignment must be an object with campaign_name.")
-            
-            campaign_name = assignment.get('campaign_name')
-            
-            if not campaign_name:
-                raise serializers.ValidationError("campaign_name is required for each assignment.")
-            
-            # Search for campaign by name in all campaign models
-            campaign_found = False
-            for campaign_model in campaign_models:
-                if campaign_model.objects.filter(name__iexact=campaign_name).exists():
-                    campaign_found = True
-                    break
-            
-            if not campaign_found:
-                raise serializers.ValidationError(
-                    f"Campaign with name '{campaign_name}' does not exist in any campaign type."
-                )
-        
-        return value
+        return resolve_campaign_assignments(value)
 
     def get_assigned_campaigns(self, obj):
         """Return list of assigned campaigns"""
-        assignments = CampaignManagerAssignment.objects.filter(user=obj).select_related('content_type')
+        assignments = CampaignManagerAssignment.objects.filter(user=obj).with_campaigns()
         return [
             {
                 'id': assignment.id,
@@ -484,47 +425,7 @@ class CampaignManagerUpdateSerializer(serializers.ModelSerializer):
         
         # Update campaign assignments if provided
         if campaign_assignments is not None:
-            # Import all campaign models
-            from campaigns.models import (
-                StateOfTheFlockCampaign, SoulWinningCampaign, ServantsArmedTrainedCampaign,
-                AntibrutishCampaign, HearingSeeingCampaign, HonourYourProphetCampaign,
-                BasontaProliferationCampaign, IntimateCounselingCampaign, TechnologyCampaign,
-                SheperdingControlCampaign, MultiplicationCampaign, UnderstandingCampaign,
-                SheepSeekingCampaign, TestimonyCampaign, TelepastoringCampaign,
-                GatheringBusCampaign, OrganisedCreativeArtsCampaign, TangerineCampaign,
-                SwollenSundayCampaign, SundayManagementCampaign, EquipmentCampaign
-            )
-            
-            campaign_models = [
-                StateOfTheFlockCampaign, SoulWinningCampaign, ServantsArmedTrainedCampaign,
-                AntibrutishCampaign, HearingSeeingCampaign, HonourYourProphetCampaign,
-                BasontaProliferationCampaign, IntimateCounselingCampaign, TechnologyCampaign,
-                SheperdingControlCampaign, MultiplicationCampaign, UnderstandingCampaign,
-                SheepSeekingCampaign, TestimonyCampaign, TelepastoringCampaign,
-                GatheringBusCampaign, OrganisedCreativeArtsCampaign, TangerineCampaign,
-                SwollenSundayCampaign, SundayManagementCampaign, EquipmentCampaign,
-            ]
-            
-            # Delete existing assignments
-            CampaignManagerAssignment.objects.filter(user=instance).delete()
-            
-            # Create new assignments
-            for assignment in campaign_assignments:
-                campaign_name = assignment.get('campaign_name')
-                
-                # Find the campaign by name across all models
-                for campaign_model in campaign_models:
-                    try:
-                        campaign = campaign_model.objects.get(name__iexact=campaign_name)
-                        content_type = ContentType.objects.get_for_model(campaign_model)
-                        
-                        CampaignManagerAssignment.objects.create(
-                            user=instance,
-                            content_type=content_type,
-                            object_id=campaign.id
-                        )
-                        break  # Found and assigned, move to next
-                    except campaign_model.DoesNotExist:
-                        continue
+            # Replace the assignments, keeping the ones that are unchanged
+            sync_campaign_assignments(instance, campaign_assignments)
         
         return instance
@@ -0,0 +1,134 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from campaigns.catalog import is_campaign_model
+from campaigns.models import CampaignManagerAssignment, syncing_assignments
+from campaigns.rollups import is_submission_model
+
+from .cache import (
+    bump_generations,
+    user_generation_key,
+    service_generation_key,
+    campaign_generation_key,
+    campaigns_generation_key,
+)
+from .models import ClaimsUser, CustomerUser, Service
+from .tokens import bump_token_version, forget_token_version
+
+
+# User fields access tokens depend on: role and service are claims, and tokens are only issued to active users
+TOKEN_CLAIM_FIELDS = ('role', 'service_id', 'is_active')
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_analytics_for_submission(sender, instance, raw=False, **kwargs):
+    """Expire the cached dashboard and analytics of the submitter, service and campaign of a submission."""
+    if raw or not is_submission_model(sender):
+        return
+
+    campaign_ct_id = ContentType.objects.get_for_model(sender._meta.get_field('campaign').related_model).id
+    buckets = [(instance.campaign_id, instance.service_id, instance.submitted_by_id)]
+
+    # An edit that moves a submission also changes what its old campaign, service and submitter report
+    previous = getattr(instance, '_previous_rollup_bucket', None)
+    if previous:
+        buckets.append(previous[:3])
+
+    keys = []
+    for campaign_id, service_id, submitted_by_id in buckets:
+        keys.append(user_generation_key(submitted_by_id))
+        keys.append(service_generation_key(service_id) if service_id else None)
+        keys.append(campaign_generation_key(campaign_ct_id, campaign_id))
+    bump_generations(list(dict.fromkeys(keys)))
+
+
+@receiver(post_save, sender=CustomerUser)
+@receiver(post_save, sender=ClaimsUser)
+@receiver(post_delete, sender=CustomerUser)
+@receiver(post_delete, sender=ClaimsUser)
+def invalidate_analytics_for_user(sender, instance, raw=False, update_fields=None, **kwargs):
+    """A user's cached dashboard shows their profile; logging in only touches last_login."""
+    if raw or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    bump_generations([user_generation_key(instance.pk)])
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def invalidate_analytics_for_service(sender, instance, raw=False, **kwargs):
+    """Dashboards and leaderboards cached for a service show its name."""
+    if raw:
+        return
+    bump_generations([service_generation_key(instance.pk)])
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_analytics_for_campaign(sender, instance, raw=False, **kwargs):
+    """Cached dashboards show campaign names and icons."""
+    if raw or not is_campaign_model(sender):
+        return
+    bump_generations([
+        campaign_generation_key(ContentType.objects.get_for_model(sender).id, instance.pk),
+        campaigns_generation_key(),
+    ])
+
+
+@receiver(post_save, sender=CampaignManagerAssignment)
+@receiver(post_delete, sender=CampaignManagerAssignment)
+def invalidate_analytics_for_assignment(sender, instance, raw=False, **kwargs):
+    """
+    A campaign manager's cached responses and access tokens depend on which campaigns
+    they are assigned. Syncs invalidate once for all their rows (see sync_campaign_assignments).
+    """
+    if raw or syncing_assignments.get():
+        return
+    bump_generations([user_generation_key(instance.user_id)])
+    bump_token_version(instance.user_id)
+
+
+@receiver(pre_save, sender=CustomerUser)
+@receiver(pre_save, sender=ClaimsUser)
+def remember_token_claim_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Before an existing user is updated, note whether a field their access tokens depend on
+    changes, and keep a stale instance from saving token_version back to an older value.
+    """
+    if raw or instance.pk is None or instance._state.adding:
+        return
+
+    deferred = instance.get_deferred_fields()
+    fields = [
+        field for field in TOKEN_CLAIM_FIELDS + ('token_version',)
+        if field not in deferred
+        and (update_fields is None or field in update_fields or field.removesuffix('_id') in update_fields)
+    ]
+    if not fields:
+        return
+
+    previous = sender.objects.filter(pk=instance.pk).values(*fields).first()
+    if not previous:
+        return
+    if 'token_version' in previous:
+        instance.token_version = max(instance.token_version, previous.pop('token_version'))
+    instance._token_claims_changed = any(previous[field] != getattr(instance, field) for field in previous)
+
+
+@receiver(post_save, sender=CustomerUser)
+@receiver(post_save, sender=ClaimsUser)
+def expire_tokens_on_claim_change(sender, instance, raw=False, **kwargs):
+    """Reject access tokens issued with the user's old role or service, or before they were deactivated."""
+    if raw or not getattr(instance, '_token_claims_changed', False):
+        return
+    instance._token_claims_changed = False
+    bump_token_version(instance.pk)
+    instance.token_version += 1
+
+
+@receiver(post_delete, sender=CustomerUser)
+@receiver(post_delete, sender=ClaimsUser)
+def expire_tokens_on_delete(sender, instance, **kwargs):
+    """Without a user row there is no token_version, so a deleted user's tokens fail once the cached one is gone."""
+    forget_token_version(instance.pk)
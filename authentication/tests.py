@@ -1,3 +1,698 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from datetime import date, timedelta
+from io import StringIO
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from campaigns.models import (
+    CampaignManagerAssignment,
+    SoulWinningCampaign, SoulWinningSubmission,
+    StateOfTheFlockCampaign, StateOfTheFlockSubmission,
+    AntibrutishCampaign, AntibrutishSubmission,
+    TestimonyCampaign, TestimonySubmission,
+    EquipmentCampaign, EquipmentSubmission,
+)
+from campaigns.rollups import get_submission_models
+from .analytics import SECTION_REGISTRY, AnalyticsSection, evaluate_sections, resolve_sections, stream_standard_analytics
+from .cache import get_generations, user_generation_key
+from .forecasting import _forward_fill, compound_growth_rate, forecast_metric, linear_forecast
+from .leaderboard import service_leaderboard
+from .models import CustomerUser, Service
+from .serializers import sync_campaign_assignments
+
+
+class StandardDashboardQueryCountTests(TestCase):
+    """The standard dashboard takes the same number of queries however much history a user has."""
+
+    # User counters, campaign counters, latest submissions (UNION ALL) and the user's service with its counters
+    DASHBOARD_QUERIES = 4
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.service = Service.objects.create(name='Main Service')
+        self.user = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password', service=self.service)
+        self.client = APIClient()
+
+    def submit(self, submission_model, campaign, count=1, **fields):
+        for _ in range(count):
+            submission_model.objects.create(
+                campaign=campaign, service=self.service, submitted_by=self.user, date=date.today(), **fields
+            )
+
+    def reset(self):
+        # A fresh user instance and an empty cache, so every dashboard query is counted
+        self.client.force_authenticate(CustomerUser.objects.get(pk=self.user.pk))
+        for cache in caches.all():
+            cache.clear()
+        ContentType.objects.get_for_models(*get_submission_models())
+
+    def test_empty_dashboard(self):
+        self.reset()
+        # No campaign counters to read and no submissions to fetch
+        with self.assertNumQueries(self.DASHBOARD_QUERIES - 2):
+            response = self.client.get('/auth/users/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['statistics'], {'active_campaigns': 0, 'submissions_this_month': 0})
+        self.assertEqual(response.data['service']['total_submissions'], 0)
+        self.assertEqual(response.data['recent_submissions'], [])
+
+    def test_query_count_does_not_grow_with_history(self):
+        soul_winning = SoulWinningCampaign.objects.create(name='Soul Winning')
+        self.submit(SoulWinningSubmission, soul_winning, no_of_souls_won=3)
+
+        self.reset()
+        with self.assertNumQueries(self.DASHBOARD_QUERIES):
+            response = self.client.get('/auth/users/dashboard/')
+        self.assertEqual(response.data['statistics'], {'active_campaigns': 1, 'submissions_this_month': 1})
+
+        self.submit(SoulWinningSubmission, SoulWinningCampaign.objects.create(name='Soul Winning 2'), count=10)
+        self.submit(AntibrutishSubmission, AntibrutishCampaign.objects.create(name='Antibrutish'), count=5, hours_prayed=2)
+        self.submit(TestimonySubmission, TestimonyCampaign.objects.create(name='Testimony'), count=5)
+        self.submit(EquipmentSubmission, EquipmentCampaign.objects.create(name='Equipment'), count=5)
+        # Counted for the service, not for the user
+        SoulWinningSubmission.objects.create(
+            campaign=soul_winning, service=self.service, date=date.today(),
+            submitted_by=CustomerUser.objects.create_user('helper', 'helper@example.com', 'password', service=self.service),
+        )
+
+        self.reset()
+        with self.assertNumQueries(self.DASHBOARD_QUERIES):
+            response = self.client.get('/auth/users/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['statistics'], {'active_campaigns': 5, 'submissions_this_month': 26})
+        self.assertEqual(response.data['service']['submissions_this_month'], 27)
+        self.assertEqual(response.data['service']['total_submissions'], 27)
+        self.assertEqual(len(response.data['recent_submissions']), 5)
+        self.assertEqual(len(response.data['active_campaigns']), 5)
+
+        counts = {item['name']: item['submission_count'] for item in response.data['active_campaigns']}
+        self.assertEqual(counts['Soul Winning'], 1)
+        self.assertEqual(counts['Soul Winning 2'], 10)
+
+        previews = {item['campaign_name']: item['preview_data'] for item in response.data['recent_submissions']}
+        self.assertEqual(previews['Antibrutish']['hours_prayed'], '2.00')
+
+    def test_counters_follow_deletes_and_match_reconcile(self):
+        soul_winning = SoulWinningCampaign.objects.create(name='Soul Winning')
+        self.submit(SoulWinningSubmission, soul_winning, count=2, no_of_souls_won=1)
+        testimony = TestimonyCampaign.objects.create(name='Testimony')
+        self.submit(TestimonySubmission, testimony)
+        TestimonySubmission.objects.get().delete()
+        SoulWinningSubmission.objects.order_by('-created_at').first().delete()
+
+        def dashboard():
+            self.reset()
+            return self.client.get('/auth/users/dashboard/').data
+
+        counted = dashboard()
+        self.assertEqual(counted['statistics'], {'active_campaigns': 1, 'submissions_this_month': 1})
+        self.assertEqual([item['submission_count'] for item in counted['active_campaigns']], [1])
+        self.assertEqual(counted['service']['total_submissions'], 1)
+
+        call_command('reconcile_submission_counters', stdout=StringIO())
+        self.assertEqual(dashboard(), counted)
+
+
+class TokenClaimsTests(TestCase):
+    """Access tokens carry the claims the request user is built from, and expire when they change."""
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.soul_winning = SoulWinningCampaign.objects.create(name='Soul Winning')
+        self.testimony = TestimonyCampaign.objects.create(name='Testimony')
+        self.manager = CustomerUser.objects.create_user(
+            'manager', 'manager@example.com', 'password', role=CustomerUser.Role.CAMPAIGN_MANAGER
+        )
+        self.assign(self.soul_winning)
+        self.client = APIClient()
+
+    def assign(self, *campaigns):
+        with self.captureOnCommitCallbacks(execute=True):
+            sync_campaign_assignments(self.manager, [
+                {'content_type': ContentType.objects.get_for_model(campaign), 'object_id': campaign.id}
+                for campaign in campaigns
+            ])
+
+    def login(self):
+        response = self.client.post('/auth/login/', {'username': 'manager', 'password': 'password'})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def campaigns(self, access):
+        return self.client.get('/campaigns/all/', HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_claims_describe_the_user(self):
+        token = AccessToken(self.login()['access'])
+        soul_winning_type = ContentType.objects.get_for_model(SoulWinningCampaign)
+        self.assertEqual(token['role'], CustomerUser.Role.CAMPAIGN_MANAGER)
+        self.assertIsNone(token['service_id'])
+        self.assertEqual(token['assignments'], f'{soul_winning_type.id}:{self.soul_winning.id}')
+
+    def test_requests_are_authenticated_without_queries(self):
+        access = self.login()['access']
+        self.campaigns(access)  # caches the token version
+
+        # The page count and the page itself: no user row or assignments are read
+        with self.assertNumQueries(2):
+            response = self.campaigns(access)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([campaign['name'] for campaign in response.data['results']], ['Soul Winning'])
+
+    def test_assignment_changes_expire_tokens_until_refreshed(self):
+        tokens = self.login()
+        self.assertEqual(self.campaigns(tokens['access']).status_code, 200)
+
+        self.assign(self.soul_winning, self.testimony)
+        self.assertEqual(self.campaigns(tokens['access']).status_code, 401)
+
+        response = self.client.post('/auth/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, 200)
+        response = self.campaigns(response.data['access'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(campaign['name'] for campaign in response.data['results']), ['Soul Winning', 'Testimony']
+        )
+
+    def test_role_changes_expire_tokens(self):
+        access = self.login()['access']
+        self.assertEqual(self.campaigns(access).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.manager.role = CustomerUser.Role.Pastor
+            self.manager.save()
+        self.assertEqual(self.campaigns(access).status_code, 401)
+
+    def test_syncs_invalidate_once_however_many_assignments_change(self):
+        campaigns = [SoulWinningCampaign.objects.create(name=f'Soul Winning {index}') for index in range(10)]
+
+        def sync_queries(*assigned):
+            with CaptureQueriesContext(connection) as queries:
+                self.assign(*assigned)
+            return len(queries)
+
+        version = CustomerUser.objects.get(pk=self.manager.pk).token_version
+        one_each = sync_queries(self.testimony)
+        many_created = sync_queries(*campaigns)
+        many_deleted = sync_queries(self.soul_winning)
+        self.assertEqual(one_each, many_created)
+        self.assertEqual(one_each, many_deleted)
+        self.assertEqual(CustomerUser.objects.get(pk=self.manager.pk).token_version, version + 3)
+
+        # Nothing changed: nothing to invalidate
+        sync_queries(self.soul_winning)
+        self.assertEqual(CustomerUser.objects.get(pk=self.manager.pk).token_version, version + 3)
+
+    def test_deleted_users_tokens_are_rejected(self):
+        pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password')
+        response = self.client.post('/auth/login/', {'username': 'pastor', 'password': 'password'})
+        access = response.data['access']
+        self.assertEqual(self.campaigns(access).status_code, 200)  # caches the token version
+
+        with self.captureOnCommitCallbacks(execute=True):
+            pastor.delete()
+        self.assertEqual(self.campaigns(access).status_code, 401)
+
+
+class AssignmentSyncTests(TestCase):
+    """Syncing a campaign manager's assignments changes only the difference, and only then invalidates."""
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.manager = CustomerUser.objects.create_user(
+            'manager', 'manager@example.com', 'password', role=CustomerUser.Role.CAMPAIGN_MANAGER
+        )
+        self.campaigns = [SoulWinningCampaign.objects.create(name=f'Soul Winning {index}') for index in range(3)]
+        self.content_type = ContentType.objects.get_for_model(SoulWinningCampaign)
+
+    def rows(self):
+        return {
+            row.object_id: (row.pk, row.created_at)
+            for row in CampaignManagerAssignment.objects.filter(user=self.manager)
+        }
+
+    def sync(self, *campaigns):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            sync_campaign_assignments(self.manager, [
+                {'content_type': self.content_type, 'object_id': campaign.id} for campaign in campaigns
+            ])
+        return callbacks
+
+    def test_only_the_difference_is_written(self):
+        first, second, third = self.campaigns
+        self.sync(first, second)
+        before = self.rows()
+
+        # Content types may be given by id, and campaign ids as strings
+        created, deleted = CampaignManagerAssignment.objects.sync_for_user(
+            self.manager, [(self.content_type.id, str(second.id)), (self.content_type, third.id)]
+        )
+        self.assertEqual((created, deleted), (1, 1))
+        after = self.rows()
+        self.assertEqual(set(after), {second.id, third.id})
+        self.assertEqual(after[second.id], before[second.id])
+
+    def test_syncs_without_changes_invalidate_nothing(self):
+        self.sync(*self.campaigns)
+        key = user_generation_key(self.manager.id)
+        generation = get_generations([key])
+        version = CustomerUser.objects.get(pk=self.manager.pk).token_version
+
+        callbacks = self.sync(*reversed(self.campaigns))
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_generations([key]), generation)
+        self.assertEqual(CustomerUser.objects.get(pk=self.manager.pk).token_version, version)
+
+        self.sync(*self.campaigns[:2])
+        self.assertNotEqual(get_generations([key]), generation)
+        self.assertEqual(CustomerUser.objects.get(pk=self.manager.pk).token_version, version + 1)
+
+
+@override_settings(ANALYTICS_MAX_WORKERS=1)
+class AnalyticsCacheTests(TestCase):
+    """Cached analytics are recomputed when, and only when, a submission they cover changes."""
+
+    URL = '/auth/users/analytics/?sections=soul_winning'
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.campaign = SoulWinningCampaign.objects.create(name='Soul Winning')
+        self.service = Service.objects.create(name='Main Service')
+        self.other_service = Service.objects.create(name='Other Service')
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password', service=self.service)
+        self.other_pastor = CustomerUser.objects.create_user(
+            'other', 'other@example.com', 'password', service=self.other_service
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.pastor)
+
+    def submit(self, user, souls):
+        with self.captureOnCommitCallbacks(execute=True):
+            SoulWinningSubmission.objects.create(
+                campaign=self.campaign, service=user.service, submitted_by=user,
+                date=date.today(), no_of_souls_won=souls,
+            )
+
+    def get(self):
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_a_submission_invalidates_its_submitters_analytics(self):
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+        self.assertEqual(self.get()['X-Cache'], 'HIT')
+
+        self.submit(self.pastor, 3)
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['soul_winning']['this_period'], 3)
+        self.assertEqual(self.get()['X-Cache'], 'HIT')
+
+    def test_unrelated_submissions_keep_the_cache(self):
+        self.get()
+        self.submit(self.other_pastor, 5)
+        self.assertEqual(self.get()['X-Cache'], 'HIT')
+
+    def test_profile_service_and_campaign_changes_invalidate_the_cache(self):
+        changes = [
+            lambda: CustomerUser.objects.get(pk=self.pastor.pk).save(),
+            lambda: Service.objects.get(pk=self.service.pk).save(),
+            lambda: SoulWinningCampaign.objects.get(pk=self.campaign.pk).save(),
+        ]
+        for change in changes:
+            self.get()
+            self.assertEqual(self.get()['X-Cache'], 'HIT')
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            self.assertEqual(self.get()['X-Cache'], 'MISS')
+
+        # Logging in and other services' changes keep it
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pastor.save(update_fields=['last_login'])
+            self.other_service.save()
+        self.assertEqual(self.get()['X-Cache'], 'HIT')
+
+    @override_settings(ANALYTICS_CACHE_STALE_WHILE_REVALIDATE=True)
+    def test_stale_responses_are_revalidated_without_the_request(self):
+        self.get()
+        self.submit(self.pastor, 3)
+
+        with mock.patch('authentication.cache.threading.Thread') as thread:
+            response = self.get()
+        self.assertEqual(response['X-Cache'], 'STALE')
+        self.assertEqual(response.data['soul_winning']['this_period'], 0)
+
+        # The thread gets the query parameters and user id, and runs after the request is done
+        target, args = thread.call_args.kwargs['target'], thread.call_args.kwargs['args']
+        self.assertEqual(args[-2:], ({'sections': 'soul_winning'}, self.pastor.id))
+        with mock.patch('authentication.cache.close_old_connections'), mock.patch('authentication.cache.connection'):
+            target(*args)
+
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['soul_winning']['this_period'], 3)
+
+
+class ServiceLeaderboardTests(TestCase):
+    """Services are ranked the same in the database and, without window functions, with NumPy."""
+
+    CURRENT = (date(2025, 3, 1), date(2025, 3, 31))
+    PREVIOUS = (date(2025, 1, 29), date(2025, 2, 28))
+
+    def setUp(self):
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password')
+        self.soul_winning = SoulWinningCampaign.objects.create(name='Soul Winning')
+        self.flock = StateOfTheFlockCampaign.objects.create(name='State of the Flock')
+        self.services = {name: Service.objects.create(name=name) for name in 'ABCDEFG'}
+
+    def souls(self, name, day, souls):
+        SoulWinningSubmission.objects.create(
+            campaign=self.soul_winning, service=self.services[name], submitted_by=self.pastor,
+            date=day, no_of_souls_won=souls,
+        )
+
+    def membership(self, name, month, total):
+        StateOfTheFlockSubmission.objects.create(
+            campaign=self.flock, service=self.services[name], submitted_by=self.pastor,
+            submission_period=month, total_membership=total,
+        )
+
+    def both_paths(self, metric):
+        with mock.patch.object(connection.features, 'supports_over_clause', True):
+            in_database = service_leaderboard(metric, self.CURRENT, self.PREVIOUS)
+        with mock.patch.object(connection.features, 'supports_over_clause', False):
+            with mock.patch('authentication.leaderboard._rank_in_database') as rank_in_database:
+                with_numpy = service_leaderboard(metric, self.CURRENT, self.PREVIOUS)
+        rank_in_database.assert_not_called()
+        self.assertEqual(in_database, with_numpy)
+        return in_database
+
+    def summary(self, rows):
+        return [(row['service_name'], row['rank'], row['percentile'], row['value'], row['delta']) for row in rows]
+
+    def test_tied_totals(self):
+        self.souls('A', date(2025, 3, 2), 6)
+        self.souls('A', date(2025, 3, 20), 4)
+        self.souls('B', date(2025, 3, 9), 10)
+        self.souls('B', date(2025, 2, 9), 12)
+        self.souls('C', date(2025, 3, 15), 5)
+        # Only submitted in the previous period
+        self.souls('D', date(2025, 2, 1), 3)
+
+        self.assertEqual(self.summary(self.both_paths('souls_won')), [
+            ('A', 1, 66.67, 10.0, 10.0),
+            ('B', 1, 66.67, 10.0, -2.0),
+            ('C', 3, 33.33, 5.0, 5.0),
+            ('D', 4, 0.0, 0.0, -3.0),
+        ])
+
+    def test_tied_growth_and_services_without_growth(self):
+        for month, total in [(date(2025, 1, 1), 100), (date(2025, 2, 1), 110), (date(2025, 3, 1), 130)]:
+            self.membership('E', month, total)
+        self.membership('F', date(2025, 2, 1), 50)
+        self.membership('F', date(2025, 3, 1), 70)
+        # No snapshot in the previous period: no growth, ranked last
+        self.membership('G', date(2025, 3, 1), 40)
+
+        self.assertEqual(self.summary(self.both_paths('membership_growth')), [
+            ('E', 1, 50.0, 20.0, 10.0),
+            ('F', 1, 50.0, 20.0, None),
+            ('G', 3, 0.0, None, None),
+        ])
+
+
+class ForecastTests(TestCase):
+    """Growth rates and forecasts are fitted on completed months, and only admins can read them."""
+
+    URL = '/auth/services/forecast/'
+
+    def test_linear_forecast_projects_the_least_squares_line(self):
+        matrix = np.array([
+            [1, 2, 3, np.nan],
+            [6, 4, 2, np.nan],
+            [np.nan, 5, np.nan, np.nan],
+            [np.nan, np.nan, np.nan, np.nan],
+        ])
+        forecast, slope = linear_forecast(matrix, 2)
+
+        np.testing.assert_allclose(slope, [1, -2, 0, 0])
+        # Falling lines stop at 0; a single known month is repeated
+        np.testing.assert_allclose(forecast, [[5, 6], [0, 0], [5, 5], [0, 0]])
+
+    def test_compound_growth_rate_between_the_first_and_last_positive_months(self):
+        matrix = np.array([
+            [0, 100, np.nan, 121],
+            [np.nan, 5, 0, np.nan],
+            [np.nan, np.nan, np.nan, np.nan],
+        ])
+        growth = compound_growth_rate(matrix)
+
+        self.assertAlmostEqual(growth[0], 0.1)
+        self.assertTrue(np.isnan(growth[1:]).all())
+
+    def test_forward_fill_keeps_leading_gaps(self):
+        np.testing.assert_array_equal(
+            _forward_fill(np.array([[np.nan, 1, np.nan, np.nan, 3, np.nan], [2, np.nan, 4, np.nan, np.nan, np.nan]])),
+            [[np.nan, 1, 1, 1, 3, 3], [2, 2, 4, 4, 4, 4]],
+        )
+
+    def test_the_month_in_progress_is_not_fitted(self):
+        campaign = SoulWinningCampaign.objects.create(name='Soul Winning')
+        pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password')
+        for month, souls in enumerate([10, 20, 30, 40, 50, 1], start=1):
+            SoulWinningSubmission.objects.create(
+                campaign=campaign, submitted_by=pastor, date=date(2025, month, 10), no_of_souls_won=souls,
+            )
+        queryset = SoulWinningSubmission.objects.all()
+
+        series = forecast_metric('souls_won', queryset, end=date(2025, 6, 15))[None]
+        self.assertEqual(len(series['history']), 12)
+        self.assertEqual(series['history'][-1], {
+            "period": "2025-05", "label": "May 2025", "value": 50.0, "moving_average": 40.0,
+        })
+        self.assertEqual(series['forecast'][0]['period'], "2025-06")
+        self.assertGreater(series['trend_per_month'], 0)
+
+        # Once the month is over it is history
+        series = forecast_metric('souls_won', queryset, end=date(2025, 6, 30))[None]
+        self.assertEqual(series['history'][-1]['period'], "2025-06")
+        self.assertEqual(series['history'][-1]['value'], 1.0)
+
+    def test_only_admins_can_view_service_forecasts(self):
+        client = APIClient()
+        client.force_authenticate(CustomerUser.objects.create_user(
+            'pastor', 'pastor@example.com', 'password', role=CustomerUser.Role.Pastor
+        ))
+        self.assertEqual(client.get(self.URL).status_code, 403)
+
+    def test_horizon_is_checked_and_clamped(self):
+        admin = CustomerUser.objects.create_user('admin', 'admin@example.com', 'password', role=CustomerUser.Role.ADMIN)
+        client = APIClient()
+        client.force_authenticate(admin)
+        SoulWinningSubmission.objects.create(
+            campaign=SoulWinningCampaign.objects.create(name='Soul Winning'),
+            service=Service.objects.create(name='Main Service'), submitted_by=admin,
+            date=date.today().replace(day=1) - timedelta(days=1), no_of_souls_won=4,
+        )
+
+        self.assertEqual(client.get(self.URL, {'horizon': 'soon'}).status_code, 400)
+        self.assertEqual(client.get(self.URL, {'metrics': 'tithes'}).status_code, 400)
+        for requested, horizon in [('50', 12), ('0', 1), ('3', 3)]:
+            response = client.get(self.URL, {'horizon': requested, 'metrics': 'souls_won'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['horizon'], horizon)
+            self.assertEqual(len(response.data['results'][0]['souls_won']['forecast']), horizon)
+
+
+class EvaluateSectionsTests(TestCase):
+    """Sections run on worker threads after the sections they depend on, except inside a transaction."""
+
+    def sections(self, names, run):
+        """The registered sections `names` need, running `run(name, ctx)` instead of their queries."""
+        return [
+            AnalyticsSection(section.name, lambda ctx, name=section.name: run(name, ctx), section.cost,
+                             section.queries, section.depends_on)
+            for section in resolve_sections(names)
+        ]
+
+    def evaluate(self, sections):
+        return [name for name, result, duration in evaluate_sections(SimpleNamespace(results={}), sections)]
+
+    @override_settings(ANALYTICS_MAX_WORKERS=4)
+    def test_sections_run_on_the_calling_thread_inside_a_transaction(self):
+        threads = {}
+
+        def run(name, ctx):
+            threads[name] = threading.current_thread()
+
+        # Test cases run inside a transaction other connections cannot see into
+        order = self.evaluate(self.sections(['attendance', 'membership'], run))
+        self.assertEqual(order, ['membership', 'small_groups', 'attendance'])
+        self.assertEqual(set(threads.values()), {threading.current_thread()})
+
+    @override_settings(ANALYTICS_MAX_WORKERS=4)
+    def test_dependencies_finish_before_their_dependents_start(self):
+        seen = {}
+
+        def run(name, ctx):
+            if name == 'small_groups':
+                # Slow enough that attendance would finish first if it did not wait
+                time.sleep(0.05)
+            seen[name] = (threading.current_thread(), dict(ctx.results))
+            return name
+
+        with mock.patch('authentication.analytics.connection') as connection:
+            connection.in_atomic_block = False
+            order = self.evaluate(self.sections(['attendance'], run))
+
+        self.assertEqual(order, ['small_groups', 'attendance'])
+        self.assertEqual(seen['attendance'][1], {'small_groups': 'small_groups'})
+        self.assertNotEqual(seen['attendance'][0], threading.current_thread())
+
+    @override_settings(ANALYTICS_MAX_WORKERS=4)
+    def test_worker_threads_close_their_connections(self):
+        def run(name, ctx):
+            if name == 'membership':
+                raise RuntimeError(name)
+
+        with mock.patch('authentication.analytics.connection') as connection:
+            connection.in_atomic_block = False
+            self.evaluate(self.sections(['soul_winning', 'attendance'], run))
+            self.assertEqual(connection.close.call_count, 3)
+
+            # Also when a section fails
+            connection.close.reset_mock()
+            with self.assertRaisesMessage(RuntimeError, 'membership'):
+                self.evaluate(self.sections(['membership', 'soul_winning'], run))
+            self.assertEqual(connection.close.call_count, 2)
+
+
+class AnalyticsStreamTests(TestCase):
+    """Analytics stream section by section as NDJSON or server-sent events, under WSGI and ASGI."""
+
+    URL = '/auth/users/analytics/'
+
+    def setUp(self):
+        self.service = Service.objects.create(name='Main Service')
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password', service=self.service)
+        SoulWinningSubmission.objects.create(
+            campaign=SoulWinningCampaign.objects.create(name='Soul Winning'), service=self.service,
+            submitted_by=self.pastor, date=date.today(), no_of_souls_won=3,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.pastor)
+
+    def ndjson(self, content):
+        return [json.loads(line) for line in content.decode().splitlines()]
+
+    def sse(self, content):
+        events = []
+        for block in content.decode().split('\n\n')[:-1]:
+            event, data = block.split('\n')
+            events.append((event.removeprefix('event: '), json.loads(data.removeprefix('data: '))))
+        return events
+
+    def test_ndjson_stream(self):
+        response = self.client.get(self.URL, {'stream': 'ndjson', 'sections': 'soul_winning'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        events = self.ndjson(b''.join(response.streaming_content))
+
+        self.assertEqual([event['event'] for event in events], ['period', 'section', 'done'])
+        self.assertEqual(events[1]['section'], 'soul_winning')
+        self.assertEqual(events[1]['data']['this_period'], 3)
+        self.assertEqual(list(events[2]['meta']['section_timings_ms']), ['soul_winning'])
+
+    def test_sse_stream_negotiated_from_the_accept_header(self):
+        response = self.client.get(self.URL, {'sections': 'soul_winning'}, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = self.sse(b''.join(response.streaming_content))
+
+        self.assertEqual([event for event, data in events], ['period', 'section', 'done'])
+        self.assertEqual(events[1][1]['data']['this_period'], 3)
+
+    def test_errors_are_rendered_in_the_stream_format(self):
+        # Without an Accept header for the stream format they are plain JSON
+        response = self.client.get(self.URL, {'stream': 'ndjson', 'sections': 'tithes'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        response = self.client.get(self.URL, {'stream': 'ndjson', 'sections': 'tithes'}, HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        [event] = self.ndjson(response.content)
+        self.assertEqual(event['event'], 'error')
+        self.assertIn('tithes', event['error'])
+
+        response = self.client.get(self.URL, {'sections': 'tithes'}, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, 400)
+        [(event, data)] = self.sse(response.content)
+        self.assertEqual(event, 'error')
+        self.assertIn('tithes', data['error'])
+
+    def test_asgi_requests_stream_asynchronously(self):
+        request = Request(AsyncRequestFactory().get(self.URL, {'sections': 'soul_winning'}))
+        response = stream_standard_analytics(request, {'submitted_by': self.pastor}, 'ndjson')
+        self.assertTrue(response.is_async)
+
+        async def read():
+            return [chunk async for chunk in response.streaming_content]
+
+        events = self.ndjson(b''.join(async_to_sync(read)()))
+        self.assertEqual([event['event'] for event in events], ['period', 'section', 'done'])
+        self.assertEqual(events[1]['data']['this_period'], 3)
+
+
+class AnalyticsSectionsTests(TestCase):
+    """?sections= limits the analytics to known sections, which /auth/users/analytics/sections/ lists."""
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.service = Service.objects.create(name='Main Service')
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password', service=self.service)
+        self.client = APIClient()
+        self.client.force_authenticate(self.pastor)
+
+    def test_unknown_sections_are_rejected(self):
+        for url in ['/auth/users/analytics/', f'/auth/services/{self.service.id}/analytics/']:
+            with self.subTest(url=url):
+                response = self.client.get(url, {'sections': 'soul_winning,tithes'})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("Unknown section 'tithes'", response.data['error'])
+
+    def test_only_requested_sections_are_returned(self):
+        response = self.client.get('/auth/users/analytics/', {'sections': 'Attendance'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attendance', response.data)
+        self.assertNotIn('membership', response.data)
+        # Computed for attendance, but not asked for
+        self.assertNotIn('small_groups', response.data)
+        self.assertEqual(set(response.data['meta']['section_timings_ms']), {'small_groups', 'attendance'})
+
+    def test_sections_listing(self):
+        response = self.client.get('/auth/users/analytics/sections/')
+        self.assertEqual(response.status_code, 200)
+        sections = {section['name']: section for section in response.data['sections']}
+
+        self.assertEqual(list(sections), list(SECTION_REGISTRY))
+        self.assertEqual(sections['attendance']['depends_on'], ['small_groups'])
+        for section in sections.values():
+            self.assertIn(section['cost'], ('low', 'medium', 'high'))
+            self.assertTrue(section['description'])
@@ -0,0 +1,137 @@
+"""
+JWT claims and the stateless request user built from them.
+
+Access tokens carry the user's role, service and, for campaign managers, the
+(content type, campaign id) pairs they are assigned, stamped with the user's
+token_version. ClaimsJWTAuthentication builds the request user from those claims,
+so authenticating a request reads one cached version number instead of the user
+row; the rest of the row is read only when a view uses a field the token does
+not carry.
+
+Changing a user's role, service, active flag or campaign assignments bumps
+token_version (see authentication/signals.py), which rejects every access token
+issued before the change. The refresh endpoint re-reads the user and issues an
+access token with the current claims.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import ClaimsUser, CustomerUser
+
+
+ROLE_CLAIM = 'role'
+SERVICE_CLAIM = 'service_id'
+ASSIGNMENTS_CLAIM = 'assignments'
+VERSION_CLAIM = 'token_version'
+
+
+def token_version_timeout():
+    return getattr(settings, 'TOKEN_VERSION_CACHE_TIMEOUT', 300)
+
+
+def encode_assignments(pairs):
+    """(content type id, campaign id) pairs as a compact claim: {(37, 1), (37, 4), (40, 2)} -> '37:1,4;40:2'"""
+    by_type = {}
+    for content_type_id, object_id in sorted(pairs):
+        by_type.setdefault(content_type_id, []).append(str(object_id))
+    return ';'.join(f"{content_type_id}:{','.join(ids)}" for content_type_id, ids in by_type.items())
+
+
+def decode_assignments(value):
+    pairs = set()
+    for group in filter(None, (value or '').split(';')):
+        content_type_id, ids = group.split(':')
+        pairs.update((int(content_type_id), int(object_id)) for object_id in ids.split(','))
+    return pairs
+
+
+def token_claims(user):
+    claims = {
+        ROLE_CLAIM: user.role,
+        SERVICE_CLAIM: user.service_id,
+        VERSION_CLAIM: user.token_version,
+    }
+    if user.is_campaign_manager:
+        claims[ASSIGNMENTS_CLAIM] = encode_assignments(user.get_assignment_pairs())
+    return claims
+
+
+def apply_claims(token, user):
+    """Stamp `token` with the current claims of `user`."""
+    for claim, value in token_claims(user).items():
+        token[claim] = value
+    return token
+
+
+def token_version_key(user_id):
+    return f"auth:token_version:{user_id}"
+
+
+def current_token_version(user_id):
+    """The user's token_version, or None if there is no such user."""
+    key = token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = CustomerUser.objects.filter(pk=user_id).values_list('token_version', flat=True).first()
+        if version is not None:
+            cache.set(key, version, token_version_timeout())
+    return version
+
+
+def forget_token_version(user_id):
+    """Drop the user's cached token_version once the transaction commits."""
+    transaction.on_commit(lambda: cache.delete(token_version_key(user_id)))
+
+
+def bump_token_version(user_id):
+    """Reject the user's current access tokens once the transaction commits."""
+    CustomerUser.objects.filter(pk=user_id).update(token_version=F('token_version') + 1)
+    forget_token_version(user_id)
+
+
+def claims_user(validated_token):
+    """A ClaimsUser with only the claimed fields loaded; every other field is deferred."""
+    claimed = {
+        # simplejwt stores the user id as a string
+        'id': ClaimsUser._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM]),
+        'role': validated_token[ROLE_CLAIM],
+        'service_id': validated_token[SERVICE_CLAIM],
+        'token_version': validated_token[VERSION_CLAIM],
+    }
+    # from_db() expects the values in field order
+    field_names = [field.attname for field in ClaimsUser._meta.concrete_fields if field.attname in claimed]
+    user = ClaimsUser.from_db(
+        router.db_for_read(ClaimsUser), field_names, [claimed[name] for name in field_names]
+    )
+    user.token_assignments = decode_assignments(validated_token.get(ASSIGNMENTS_CLAIM))
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds the request user from the token's claims.
+    Tokens issued before the claims were added fall back to loading the user.
+    """
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        version = current_token_version(user_id)
+        if version is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if version != validated_token[VERSION_CLAIM]:
+            raise AuthenticationFailed(
+                _("Token is out of date, refresh it or log in again."), code="token_outdated"
+            )
+        return claims_user(validated_token)
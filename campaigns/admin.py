@@ -1,28 +1,30 @@
 from django.contrib import admin
 from .models import (
-    StateOfTheFlockCampaign, StateOfTheFlockSubmission,
-    SoulWinningCampaign, SoulWinningSubmission, SoulWinningSubmissionFile,
-    ServantsArmedTrainedCampaign, ServantsArmedTrainedSubmission, ServantsArmedTrainedSubmissionFile,
-    AntibrutishCampaign, AntibrutishSubmission, AntibrutishSubmissionFile,
-    HearingSeeingCampaign, HearingSeeingSubmission,
-    HonourYourProphetCampaign, HonourYourProphetSubmission, HonourYourProphetSubmissionFile,
-    BasontaProliferationCampaign, BasontaProliferationSubmission, BasontaProliferationSubmissionFile,
-    IntimateCounselingCampaign, IntimateCounselingSubmission,
-    TechnologyCampaign, TechnologySubmission, TechnologySubmissionFile,
-    SheperdingControlCampaign, SheperdingControlSubmission,
-    MultiplicationCampaign, MultiplicationSubmission, MultiplicationSubmissionFile,
-    UnderstandingCampaign, UnderstandingSubmission, UnderstandingSubmissionFile,
-    SheepSeekingCampaign, SheepSeekingSubmission, SheepSeekingSubmissionFile,
-    TestimonyCampaign, TestimonySubmission,
-    TelepastoringCampaign, TelepastoringSubmission, TelepastoringSubmissionFile,
-    GatheringBusCampaign, GatheringBusSubmission, GatheringBusSubmissionFile,
-    OrganisedCreativeArtsCampaign, OrganisedCreativeArtsSubmission,
-    TangerineCampaign, TangerineSubmission,
-    SwollenSundayCampaign, SwollenSundaySubmission, SwollenSundaySubmissionFile,
-    SundayManagementCampaign, SundayManagementSubmission, SundayManagementSubmissionFile,
-    EquipmentCampaign, EquipmentSubmission, EquipmentSubmissionFile,
-    CampaignManagerAssignment,
+    StateOfTheFlockSubmission,
+    SoulWinningSubmission, SoulWinningSubmissionFile,
+    ServantsArmedTrainedSubmission, ServantsArmedTrainedSubmissionFile,
+    AntibrutishSubmission, AntibrutishSubmissionFile,
+    HearingSeeingSubmission,
+    HonourYourProphetSubmission, HonourYourProphetSubmissionFile,
+    BasontaProliferationSubmission, BasontaProliferationSubmissionFile,
+    IntimateCounselingSubmission,
+    TechnologySubmission, TechnologySubmissionFile,
+    SheperdingControlSubmission,
+    MultiplicationSubmission, MultiplicationSubmissionFile,
+    UnderstandingSubmission, UnderstandingSubmissionFile,
+    SheepSeekingSubmission, SheepSeekingSubmissionFile,
+    TestimonySubmission,
+    TelepastoringSubmission, TelepastoringSubmissionFile,
+    GatheringBusSubmission, GatheringBusSubmissionFile,
+    OrganisedCreativeArtsSubmission,
+    TangerineSubmission,
+    SwollenSundaySubmission, SwollenSundaySubmissionFile,
+    SundayManagementSubmission, SundayManagementSubmissionFile,
+    EquipmentSubmission, EquipmentSubmissionFile,
+    CampaignManagerAssignment, SubmissionMonthlyRollup, SubmissionActivity,
+    UserSubmissionCounter, ServiceSubmissionCounter, CampaignSubmissionCounter,
 )
+from .registry import campaign_types
 
 
 class SoulWinningSubmissionFileInline(admin.TabularInline):
@@ -201,27 +203,8 @@ class EquipmentSubmissionAdmin(admin.ModelAdmin):
 
 
 # Campaign models
-admin.site.register(StateOfTheFlockCampaign)
-admin.site.register(SoulWinningCampaign)
-admin.site.register(ServantsArmedTrainedCampaign)
-admin.site.register(AntibrutishCampaign)
-admin.site.register(HearingSeeingCampaign)
-admin.site.register(HonourYourProphetCampaign)
-admin.site.register(BasontaProliferationCampaign)
-admin.site.register(IntimateCounselingCampaign)
-admin.site.register(TechnologyCampaign)
-admin.site.register(SheperdingControlCampaign)
-admin.site.register(MultiplicationCampaign)
-admin.site.register(UnderstandingCampaign)
-admin.site.register(SheepSeekingCampaign)
-admin.site.register(TestimonyCampaign)
-admin.site.register(TelepastoringCampaign)
-admin.site.register(GatheringBusCampaign)
-admin.site.register(OrganisedCreativeArtsCampaign)
-admin.site.register(TangerineCampaign)
-admin.site.register(SwollenSundayCampaign)
-admin.site.register(SundayManagementCampaign)
-admin.site.register(EquipmentCampaign)
+for campaign_type in campaign_types():
+    admin.site.register(campaign_type.campaign_model)
 
 
 @admin.register(CampaignManagerAssignment)
@@ -230,6 +213,7 @@ class CampaignManagerAssignmentAdmin(admin.ModelAdmin):
     list_filter = ['created_at', 'content_type']
     search_fields = ['user__username', 'user__email', 'user__first_name', 'user__last_name']
     readonly_fields = ['created_at', 'updated_at']
+    list_select_related = ['user']
     
     fieldsets = (
         ('Assignment', {
@@ -240,6 +224,9 @@ class CampaignManagerAssignmentAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_campaigns()
+    
     def get_campaign_name(self, obj):
         """Display the campaign name"""
         return str(obj.campaign) if obj.campaign else 'N/A'
@@ -256,3 +243,41 @@ class CampaignManagerAssignmentAdmin(admin.ModelAdmin):
         if 'user' in form.base_fields:
             form.base_fields['user'].queryset = form.base_fields['user'].queryset.filter(role='CAMPAIGN_MANAGER')
         return form
+
+
+@admin.register(SubmissionMonthlyRollup)
+class SubmissionMonthlyRollupAdmin(admin.ModelAdmin):
+    list_display = ['submission_type', 'campaign_id', 'service', 'submitted_by', 'month', 'submission_count']
+    list_filter = ['submission_type', 'month']
+    readonly_fields = ['submission_type', 'campaign_id', 'service', 'submitted_by', 'month', 'submission_count', 'totals', 'updated_at']
+
+
+@admin.register(SubmissionActivity)
+class SubmissionActivityAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'action', 'campaign_type', 'campaign_name', 'service', 'submitted_by']
+    list_filter = ['action', 'campaign_type']
+    readonly_fields = [
+        'action', 'submission_type', 'submission_id', 'campaign_type', 'campaign_id', 'campaign_name',
+        'service', 'submitted_by', 'submission_period', 'date', 'preview', 'created_at'
+    ]
+
+
+@admin.register(UserSubmissionCounter)
+class UserSubmissionCounterAdmin(admin.ModelAdmin):
+    list_display = ['user', 'period', 'submission_count', 'active_campaigns', 'last_submission_at']
+    list_filter = ['period']
+    readonly_fields = ['user', 'period', 'submission_count', 'active_campaigns', 'last_submission_at']
+
+
+@admin.register(ServiceSubmissionCounter)
+class ServiceSubmissionCounterAdmin(admin.ModelAdmin):
+    list_display = ['service', 'period', 'submission_count', 'last_submission_at']
+    list_filter = ['period']
+    readonly_fields = ['service', 'period', 'submission_count', 'last_submission_at']
+
+
+@admin.register(CampaignSubmissionCounter)
+class CampaignSubmissionCounterAdmin(admin.ModelAdmin):
+    list_display = ['submission_type', 'campaign_id', 'submitted_by', 'period', 'submission_count', 'last_submission_at']
+    list_filter = ['submission_type', 'period']
+    readonly_fields = ['submission_type', 'campaign_id', 'submitted_by', 'period', 'submission_count', 'last_submission_at']
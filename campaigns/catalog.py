@@ -0,0 +1,201 @@
+"""
+The campaign catalog: every campaign of every type, newest first.
+
+Campaigns change a few times a month but campaign names are resolved against the
+catalog whenever campaign managers are created or updated, so it is kept in memory
+in each process and in the shared cache, stamped with a version. (/campaigns/all/
+pages through the campaign tables in SQL instead, see AllCampaignsListView.) Saving or deleting any campaign bumps the version (see
+campaigns/signals.py); readers compare versions with one cache read and rebuild
+the catalog, in one UNION ALL query, only when it has changed. The campaigns a
+name resolves to are confirmed against the campaign tables, again in one query,
+before they are saved (see confirm_campaign_names()).
+
+The version only reaches other processes through a shared cache (Redis, with
+REDIS_URL set). With a per-process cache such as the default LocMemCache another
+worker never sees a bump, so each process also rebuilds its copy once it is
+CAMPAIGN_CATALOG_LOCAL_TIMEOUT seconds old. Deployments with more than one worker
+process should set REDIS_URL.
+"""
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .models import BaseCampaign
+from .registry import campaign_types, get_campaign_type, get_campaign_type_for_content_type
+from .unions import rows
+
+
+CATALOG_KEY = 'campaigns:catalog'
+CATALOG_VERSION_KEY = 'campaigns:catalog:version'
+
+CATALOG_FIELDS = ['id', 'name', 'description', 'icon', 'campaign_id', 'status', 'created_at', 'updated_at']
+
+# This process's copy of the catalog: {'version', 'entries', 'by_name', 'expires'} (time.monotonic())
+_local = {'version': None, 'entries': [], 'by_name': {}, 'expires': 0}
+_lock = threading.Lock()
+
+
+def is_campaign_model(model):
+    return isinstance(model, type) and issubclass(model, BaseCampaign) and not model._meta.abstract
+
+
+def cache_is_shared():
+    """Whether other processes see the version in the cache; not so for in-process caches."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def local_timeout():
+    return getattr(settings, 'CAMPAIGN_CATALOG_LOCAL_TIMEOUT', 60)
+
+
+def _bump():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Start from the clock so an evicted version never repeats an older one
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def bump_catalog_version():
+    """Invalidate every copy of the catalog once the current transaction commits."""
+    transaction.on_commit(_bump)
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def build_catalog():
+    """
+    Read every campaign table in one query. Entries have the CATALOG_FIELDS of a
+    campaign plus 'model' (the campaign model's label) and 'campaign_type'.
+    """
+    types = campaign_types()
+    combined = rows([(t.index, t.campaign_model.objects.all()) for t in types], CATALOG_FIELDS)
+    if combined is None:
+        return []
+
+    entries = []
+    for row in combined.order_by('-created_at', 'union_key', '-id'):
+        campaign_type = types[row.pop('union_key')]
+        row['model'] = campaign_type.campaign_model._meta.label
+        row['campaign_type'] = campaign_type.name
+        entries.append(row)
+    return entries
+
+
+def normalize_name(name):
+    """Campaign names are matched case-insensitively and ignoring surrounding spaces."""
+    return name.strip().lower()
+
+
+def _install(version, entries, shared):
+    by_name = {}
+    for entry in entries:
+        if entry['name']:
+            by_name.setdefault(normalize_name(entry['name']), []).append(entry)
+    expires = float('inf') if shared else time.monotonic() + local_timeout()
+    _local.update(version=version, entries=entries, by_name=by_name, expires=expires)
+
+
+def _is_current(version):
+    return _local['version'] == version and time.monotonic() < _local['expires']
+
+
+def _current():
+    version = catalog_version()
+    if _is_current(version):
+        return _local
+
+    with _lock:
+        if _is_current(version):
+            return _local
+
+        shared = cache_is_shared()
+        cached = cache.get(CATALOG_KEY) if shared else None
+        if cached is not None and cached['version'] == version:
+            _install(version, cached['entries'], shared)
+        else:
+            entries = build_catalog()
+            if shared:
+                cache.set(CATALOG_KEY, {'version': version, 'entries': entries}, timeout=None)
+            _install(version, entries, shared)
+    return _local
+
+
+def get_catalog():
+    """Every campaign as a catalog entry, newest first. Entries must not be modified."""
+    return _current()['entries']
+
+
+def find_campaign(name):
+    """
+    The catalog entry of the campaign called `name` (case-insensitive), or None when
+    no campaign, or more than one, has that name.
+    """
+    if not name:
+        return None
+    matches = _current()['by_name'].get(normalize_name(name), [])
+    return matches[0] if len(matches) == 1 else None
+
+
+def resolve_campaign_names(names):
+    """
+    Map campaign names to every (content type, campaign id) they match; more than one
+    when campaigns share a name. Every name is resolved against one copy of the
+    catalog, so N names cost at most the one query that rebuilds it. Names that match
+    no campaign are left out.
+    """
+    by_name = _current()['by_name']
+    resolved = {}
+    for name in names:
+        matches = by_name.get(normalize_name(name), []) if name else []
+        if matches:
+            resolved[name] = [
+                (get_campaign_type(catalog_model(entry)).campaign_content_type, entry['id'])
+                for entry in matches
+            ]
+    return resolved
+
+
+def confirm_campaign_names(resolved):
+    """
+    The names in `resolved` ({name: (content type, campaign id)}) whose campaign
+    still exists under that name. Another process may have renamed or deleted it
+    since this process's catalog was built, so the campaign tables are read, in one
+    UNION ALL query, before the ids are saved.
+    """
+    ids = {}
+    for content_type, object_id in resolved.values():
+        ids.setdefault(content_type.id, set()).add(object_id)
+    parts = []
+    for content_type_id, object_ids in ids.items():
+        campaign_type = get_campaign_type_for_content_type(content_type_id)
+        parts.append((campaign_type.index, campaign_type.campaign_model.objects.filter(id__in=object_ids)))
+
+    combined = rows(parts, ['id', 'name'])
+    if combined is None:
+        return set()
+    types = campaign_types()
+    current = {
+        (types[row['union_key']].campaign_content_type.id, row['id']): normalize_name(row['name'] or '')
+        for row in combined
+    }
+    return {
+        name for name, (content_type, object_id) in resolved.items()
+        if current.get((content_type.id, object_id)) == normalize_name(name)
+    }
+
+
+def catalog_model(entry):
+    return apps.get_model(entry['model'])
@@ -0,0 +1,144 @@
+"""
+Period comparisons for the analytics endpoints.
+
+compare_totals() evaluates the same aggregates over several date windows (the
+current period, the previous period, the same period last year and all time) in a
+single query per model by attaching a FILTER clause to each aggregate. Unless a
+window is unbounded, the query only reads the rows inside one of the windows.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Q
+
+
+COMPARISON_WINDOWS = ('previous', 'year_over_year', 'all_time')
+
+COMPARE_ALIASES = {
+    'previous': 'previous',
+    'prev': 'previous',
+    'yoy': 'year_over_year',
+    'year_over_year': 'year_over_year',
+    'all_time': 'all_time',
+    'all': 'all_time',
+}
+
+
+def parse_compare(value):
+    """
+    Parse the `compare` query parameter into a tuple of window names.
+    Accepts a comma separated list of previous, yoy and all_time, or true for all of them.
+    Raises ValueError for unknown names.
+    """
+    if not value:
+        return ()
+    if value.lower() in ('true', '1', 'yes'):
+        return COMPARISON_WINDOWS
+
+    windows = []
+    for name in value.lower().split(','):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in COMPARE_ALIASES:
+            raise ValueError(name)
+        if COMPARE_ALIASES[name] not in windows:
+            windows.append(COMPARE_ALIASES[name])
+    return tuple(windows)
+
+
+def _one_year_earlier(value):
+    try:
+        return value.replace(year=value.year - 1)
+    except ValueError:
+        # 29 February
+        return value.replace(year=value.year - 1, day=28)
+
+
+def comparison_windows(period_start, period_end, include=()):
+    """
+    Build the date windows to aggregate over as {name: (start, end) or None}.
+    None means unbounded. 'current' is always present; 'previous' is present
+    whenever the period has a start, the others only when listed in `include`.
+    """
+    windows = {}
+    if period_start is None:
+        windows['current'] = None
+    else:
+        start, end = period_start.date(), period_end.date()
+        windows['current'] = (start, end)
+        windows['previous'] = (start - (end - start) - timedelta(days=1), start - timedelta(days=1))
+        if 'year_over_year' in include:
+            windows['year_over_year'] = (_one_year_earlier(start), _one_year_earlier(end))
+
+    if 'all_time' in include:
+        windows['all_time'] = None
+    return windows
+
+
+def _clean(value):
+    if value is None:
+        return 0
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _within(aggregate, condition):
+    """A copy of `aggregate` that only counts rows matching `condition` as well as its own filter."""
+    if condition is None:
+        return aggregate
+    aggregate = aggregate.copy()
+    aggregate.filter = condition if aggregate.filter is None else Q(aggregate.filter, condition)
+    return aggregate
+
+
+def compare_totals(queryset, date_field, metrics, windows):
+    """
+    Aggregate `metrics` ({key: Sum('field'), ...}) over each window in one query.
+    Returns {window: {key: value}} with missing values reported as 0.
+    """
+    aggregates = {}
+    rows = Q()
+    for window, bounds in windows.items():
+        condition = None
+        if bounds is not None:
+            condition = Q(**{f"{date_field}__gte": bounds[0], f"{date_field}__lte": bounds[1]})
+        rows = None if condition is None or rows is None else rows | condition
+        for key, aggregate in metrics.items():
+            aggregates[f"{window}__{key}"] = _within(aggregate, condition)
+
+    if rows:
+        queryset = queryset.filter(rows)
+    row = queryset.aggregate(**aggregates)
+    return {
+        window: {key: _clean(row[f"{window}__{key}"]) for key in metrics}
+        for window in windows
+    }
+
+
+def _change(current, other):
+    change = current - other
+    return change, (change / other) * 100 if other else 0.0
+
+
+def comparison_block(totals, compare):
+    """
+    Describe every metric of `totals` against the windows named in `compare`, e.g.
+    {"souls_won": {"current": 12, "previous": 8, "previous_change": 4,
+    "previous_change_percentage": 50.0, "all_time": 120}}.
+    Windows that do not apply to the period (such as previous for period=all) are None.
+    """
+    block = {}
+    for key, current in totals['current'].items():
+        item = {"current": current}
+        for window in compare:
+            if window not in totals:
+                item[window] = None
+                continue
+            other = totals[window][key]
+            item[window] = other
+            if window != 'all_time':
+                item[f"{window}_change"], item[f"{window}_change_percentage"] = _change(current, other)
+        block[key] = item
+    return block
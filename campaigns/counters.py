@@ -0,0 +1,211 @@
+"""
+Submission counters for the dashboards.
+
+Submissions are counted per user, per service and per (user, campaign), both for
+the month they were created in and in total. Counters are adjusted with F()
+increments in the transaction that creates or deletes a submission, so a
+dashboard reads a count with a primary key lookup instead of a COUNT(*) over
+every submission table.
+
+`last_submission_at` only moves back on deletes for campaign counters (the ones
+shown on dashboards); reconcile_counters() recomputes every counter from scratch.
+"""
+from datetime import datetime
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Max, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, TruncMonth
+from django.utils import timezone
+
+from .models import CampaignSubmissionCounter, ServiceSubmissionCounter, UserSubmissionCounter
+from .rollups import get_submission_models, next_month
+
+
+ALL_TIME = 'all'
+
+
+def counter_period(value):
+    """The period key ('YYYY-MM') of the month `value` falls in."""
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.strftime('%Y-%m')
+
+
+def _get(values, name):
+    return values.get(name) if isinstance(values, dict) else getattr(values, name, None)
+
+
+def counter_keys(model, values):
+    """
+    The counters a submission is counted in, as (counter model, lookup) pairs.
+    `values` may be a submission or a dict with campaign_id, service_id,
+    submitted_by_id and created_at.
+    """
+    created_at = _get(values, 'created_at')
+    if created_at is None:
+        return []
+    user_id, service_id = _get(values, 'submitted_by_id'), _get(values, 'service_id')
+
+    submission_type = ContentType.objects.get_for_model(model)
+
+    keys = []
+    for period in (counter_period(created_at), ALL_TIME):
+        keys.append((UserSubmissionCounter, {'user_id': user_id, 'period': period}))
+        if service_id:
+            keys.append((ServiceSubmissionCounter, {'service_id': service_id, 'period': period}))
+        keys.append((CampaignSubmissionCounter, {
+            'submission_type': submission_type,
+            'campaign_id': _get(values, 'campaign_id'),
+            'submitted_by_id': user_id,
+            'period': period,
+        }))
+    return keys
+
+
+def _increment(counter_model, lookup, submitted_at):
+    """
+    Add one submission to a counter, creating it if needed.
+    Returns True when the counter went from zero to one.
+    """
+    submitted_at_value = Value(submitted_at, output_field=models.DateTimeField())
+    counted = counter_model.objects.filter(**lookup, submission_count__gt=0).update(
+        submission_count=F('submission_count') + 1,
+        last_submission_at=Greatest(Coalesce('last_submission_at', submitted_at_value), submitted_at_value),
+    )
+    if counted:
+        return False
+
+    # The counter is missing or at zero
+    if counter_model.objects.filter(**lookup).update(submission_count=1, last_submission_at=submitted_at):
+        return True
+    try:
+        with transaction.atomic():
+            counter_model.objects.create(**lookup, submission_count=1, last_submission_at=submitted_at)
+        return True
+    except IntegrityError:
+        # Created concurrently: count on top of it
+        _increment(counter_model, lookup, submitted_at)
+        return False
+
+
+def _decrement(counter_model, lookup):
+    """
+    Remove one submission from a counter.
+    Returns True when the counter went from one to zero.
+    """
+    if counter_model.objects.filter(**lookup, submission_count=1).update(submission_count=0):
+        return True
+    counter_model.objects.filter(**lookup, submission_count__gt=1).update(
+        submission_count=F('submission_count') - 1
+    )
+    return False
+
+
+def _set_active_campaigns(user_id, delta):
+    active = UserSubmissionCounter.objects.filter(user_id=user_id, period=ALL_TIME)
+    if delta < 0:
+        active = active.filter(active_campaigns__gt=0)
+    active.update(active_campaigns=F('active_campaigns') + delta)
+
+
+def _refresh_last_submission(model, lookup, removed_at):
+    """Move a campaign counter's last_submission_at back after its latest submission was deleted."""
+    remaining = model.objects.filter(campaign_id=lookup['campaign_id'], submitted_by_id=lookup['submitted_by_id'])
+    if lookup['period'] != ALL_TIME:
+        month = datetime.strptime(lookup['period'], '%Y-%m').date()
+        remaining = remaining.filter(
+            created_at__gte=timezone.make_aware(datetime.combine(month, datetime.min.time())),
+            created_at__lt=timezone.make_aware(datetime.combine(next_month(month), datetime.min.time())),
+        )
+    CampaignSubmissionCounter.objects.filter(**lookup, last_submission_at=removed_at).update(
+        last_submission_at=Subquery(remaining.order_by('-created_at').values('created_at')[:1])
+    )
+
+
+def count_submission(model, values):
+    """Add a submission to its counters."""
+    for counter_model, lookup in counter_keys(model, values):
+        activated = _increment(counter_model, lookup, _get(values, 'created_at'))
+        if activated and counter_model is CampaignSubmissionCounter and lookup['period'] == ALL_TIME:
+            # The user counter is incremented first, so its 'all' row exists
+            _set_active_campaigns(lookup['submitted_by_id'], 1)
+
+
+def uncount_submission(model, values):
+    """Remove a submission from its counters."""
+    for counter_model, lookup in counter_keys(model, values):
+        deactivated = _decrement(counter_model, lookup)
+        if counter_model is CampaignSubmissionCounter:
+            _refresh_last_submission(model, lookup, _get(values, 'created_at'))
+            if deactivated and lookup['period'] == ALL_TIME:
+                _set_active_campaigns(lookup['submitted_by_id'], -1)
+
+
+def reconcile_counters():
+    """
+    Drop and recompute every counter with one GROUP BY query per submission model.
+    Returns the number of counter rows written.
+    """
+    users, services, campaigns = {}, {}, {}
+
+    def add(counters, key, count, last):
+        current = counters.get(key)
+        if current is None:
+            counters[key] = [count, last]
+        else:
+            current[0] += count
+            current[1] = max(current[1], last)
+
+    for model in get_submission_models():
+        submission_type_id = ContentType.objects.get_for_model(model).id
+        rows = (
+            model.objects
+            .exclude(created_at__isnull=True)
+            .annotate(counter_month=TruncMonth('created_at'))
+            .values('campaign_id', 'service_id', 'submitted_by_id', 'counter_month')
+            .annotate(submission_count=Count('pk'), last_submission_at=Max('created_at'))
+            .order_by()
+        )
+        for row in rows:
+            count, last = row['submission_count'], row['last_submission_at']
+            for period in (counter_period(row['counter_month']), ALL_TIME):
+                add(users, (row['submitted_by_id'], period), count, last)
+                if row['service_id']:
+                    add(services, (row['service_id'], period), count, last)
+                add(campaigns, (submission_type_id, row['campaign_id'], row['submitted_by_id'], period), count, last)
+
+    active_campaigns = {}
+    for (submission_type_id, campaign_id, user_id, period) in campaigns:
+        if period == ALL_TIME:
+            active_campaigns[user_id] = active_campaigns.get(user_id, 0) + 1
+
+    user_counters = [
+        UserSubmissionCounter(
+            user_id=user_id, period=period, submission_count=count, last_submission_at=last,
+            active_campaigns=active_campaigns.get(user_id, 0) if period == ALL_TIME else 0
+        )
+        for (user_id, period), (count, last) in users.items()
+    ]
+    service_counters = [
+        ServiceSubmissionCounter(service_id=service_id, period=period, submission_count=count, last_submission_at=last)
+        for (service_id, period), (count, last) in services.items()
+    ]
+    campaign_counters = [
+        CampaignSubmissionCounter(
+            submission_type_id=submission_type_id, campaign_id=campaign_id, submitted_by_id=user_id,
+            period=period, submission_count=count, last_submission_at=last
+        )
+        for (submission_type_id, campaign_id, user_id, period), (count, last) in campaigns.items()
+    ]
+
+    with transaction.atomic():
+        for counter_model, counters in (
+            (UserSubmissionCounter, user_counters),
+            (ServiceSubmissionCounter, service_counters),
+            (CampaignSubmissionCounter, campaign_counters),
+        ):
+            counter_model.objects.all().delete()
+            counter_model.objects.bulk_create(counters, batch_size=500)
+
+    return len(user_counters) + len(service_counters) + len(campaign_counters)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from campaigns.activity import backfill_activity
+from campaigns.rollups import get_submission_models
+
+
+class Command(BaseCommand):
+    help = "Record creation events in the activity feed for submissions made before it existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help="Only backfill the given submission model (e.g. SoulWinningSubmission). Can be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        submission_models = get_submission_models()
+
+        if options['models']:
+            by_name = {model.__name__.lower(): model for model in submission_models}
+            try:
+                submission_models = [by_name[name.lower()] for name in options['models']]
+            except KeyError as exc:
+                raise CommandError(f"Unknown submission model: {exc.args[0]}")
+
+        written = backfill_activity(submission_models)
+        self.stdout.write(self.style.SUCCESS(
+            f"Recorded {written} activity events for {len(submission_models)} submission types."
+        ))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from campaigns.rollups import get_submission_models, rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly submission rollups from the submission tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            action='append',
+            dest='models',
+            help="Only rebuild the given submission model (e.g. SoulWinningSubmission). Can be repeated.",
+        )
+
+    def handle(self, *args, **options):
+        submission_models = get_submission_models()
+
+        if options['models']:
+            by_name = {model.__name__.lower(): model for model in submission_models}
+            try:
+                submission_models = [by_name[name.lower()] for name in options['models']]
+            except KeyError as exc:
+                raise CommandError(f"Unknown submission model: {exc.args[0]}")
+
+        written = rebuild_rollups(submission_models)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} rollup rows for {len(submission_models)} submission types."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from campaigns.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the user, service and campaign submission counters from the submission tables."
+
+    def handle(self, *args, **options):
+        written = reconcile_counters()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {written} submission counters."))
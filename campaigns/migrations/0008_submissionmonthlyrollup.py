@@ -0,0 +1,37 @@
+# Generated by Django 4.2.20 on 2026-10-17 18:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('authentication', '0007_alter_service_location'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('campaigns', '0007_equipmentcampaign_equipmentsubmission_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('campaign_id', models.PositiveIntegerField()),
+                ('month', models.DateField(help_text='The first day of the month this bucket covers.')),
+                ('submission_count', models.PositiveIntegerField(default=0)),
+                ('totals', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='authentication.service')),
+                ('submission_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('submitted_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'submission_monthly_rollups',
+                'indexes': [models.Index(fields=['submitted_by', 'month'], name='rollup_user_month_idx'), models.Index(fields=['service', 'month'], name='rollup_service_month_idx')],
+                'unique_together': {('submission_type', 'campaign_id', 'service', 'submitted_by', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 4.2.20 on 2026-10-17 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0008_submissionmonthlyrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='antibrutishsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_ant_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='basontaproliferationsubmission',
+            index=models.Index(fields=['service', 'submission_period'], name='submission_bsp_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_equip_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatheringbussubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_gbc_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hearingseeingsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_hs_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='honouryourprophetsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_hyp_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intimatecounselingsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_inc_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='multiplicationsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_mult_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organisedcreativeartssubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_oca_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servantsarmedtrainedsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_sat_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sheepseekingsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_shs_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sheperdingcontrolsubmission',
+            index=models.Index(fields=['service', 'submission_period'], name='submission_shc_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='soulwinningsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_swc_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stateoftheflocksubmission',
+            index=models.Index(fields=['service', 'submission_period'], name='submission_sof_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sundaymanagementsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_sm_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='swollensundaysubmission',
+            index=models.Index(fields=['service', 'submission_period'], name='submission_ss_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tangerinesubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_tan_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technologysubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_tech_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telepastoringsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_tel_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonysubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_tes_svc_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='understandingsubmission',
+            index=models.Index(fields=['service', 'date'], name='submission_uc_svc_date_idx'),
+        ),
+    ]
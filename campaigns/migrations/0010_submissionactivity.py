@@ -0,0 +1,44 @@
+# Generated by Django 4.2.20 on 2026-10-17 18:27
+
+from django.conf import settings
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('authentication', '0007_alter_service_location'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('campaigns', '0009_submission_service_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('CREATED', 'Created'), ('UPDATED', 'Updated'), ('DELETED', 'Deleted')], max_length=10)),
+                ('submission_id', models.PositiveBigIntegerField()),
+                ('campaign_type', models.CharField(max_length=100)),
+                ('campaign_id', models.PositiveIntegerField()),
+                ('campaign_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('submission_period', models.DateField(blank=True, null=True)),
+                ('date', models.DateField(blank=True, null=True)),
+                ('preview', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='authentication.service')),
+                ('submission_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('submitted_by', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Submission activity',
+                'db_table': 'submission_activity',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['submitted_by', 'created_at'], name='activity_user_created_idx'), models.Index(fields=['service', 'created_at'], name='activity_service_created_idx'), models.Index(fields=['submission_type', 'submission_id'], name='activity_submission_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.20 on 2026-10-17 18:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_alter_service_location'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('campaigns', '0010_submissionactivity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSubmissionCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(help_text="The month counted (YYYY-MM), or 'all' for all time.", max_length=7)),
+                ('submission_count', models.PositiveIntegerField(default=0)),
+                ('last_submission_at', models.DateTimeField(blank=True, null=True)),
+                ('active_campaigns', models.PositiveIntegerField(default=0, help_text="Campaigns the user has submissions for (kept on the 'all' row).")),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'submission_counters_user',
+                'unique_together': {('user', 'period')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ServiceSubmissionCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(help_text="The month counted (YYYY-MM), or 'all' for all time.", max_length=7)),
+                ('submission_count', models.PositiveIntegerField(default=0)),
+                ('last_submission_at', models.DateTimeField(blank=True, null=True)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='authentication.service')),
+            ],
+            options={
+                'db_table': 'submission_counters_service',
+                'unique_together': {('service', 'period')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CampaignSubmissionCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(help_text="The month counted (YYYY-MM), or 'all' for all time.", max_length=7)),
+                ('submission_count', models.PositiveIntegerField(default=0)),
+                ('last_submission_at', models.DateTimeField(blank=True, null=True)),
+                ('campaign_id', models.PositiveIntegerField()),
+                ('submission_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+                ('submitted_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'submission_counters_campaign',
+                'indexes': [models.Index(fields=['submitted_by', 'period', 'last_submission_at'], name='counter_user_last_idx')],
+                'unique_together': {('submission_type', 'campaign_id', 'submitted_by', 'period')},
+            },
+        ),
+    ]
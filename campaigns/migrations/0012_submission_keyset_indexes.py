@@ -0,0 +1,97 @@
+# Generated by Django 4.2.20 on 2026-10-17 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0011_submission_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='antibrutishsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_ant_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='basontaproliferationsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_bsp_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_equip_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gatheringbussubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_gbc_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hearingseeingsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_hs_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='honouryourprophetsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_hyp_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='intimatecounselingsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_inc_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='multiplicationsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_mult_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='organisedcreativeartssubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_oca_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servantsarmedtrainedsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_sat_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sheepseekingsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_shs_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sheperdingcontrolsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_shc_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='soulwinningsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_swc_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stateoftheflocksubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_sof_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sundaymanagementsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_sm_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='swollensundaysubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_ss_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tangerinesubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_tan_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technologysubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_tech_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='telepastoringsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_tel_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonysubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_tes_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='understandingsubmission',
+            index=models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_uc_keyset_idx'),
+        ),
+    ]
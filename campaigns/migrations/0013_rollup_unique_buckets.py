@@ -0,0 +1,42 @@
+# Generated by Django 4.2.20 on 2026-10-17 18:56
+
+from django.db import migrations, models
+
+
+def merge_duplicate_buckets(apps, schema_editor):
+    """Fold rollup rows that were set to no service when their service was deleted into one row per bucket."""
+    SubmissionMonthlyRollup = apps.get_model('campaigns', 'SubmissionMonthlyRollup')
+    buckets = {}
+    for rollup in SubmissionMonthlyRollup.objects.filter(service__isnull=True).order_by('pk'):
+        key = (rollup.submission_type_id, rollup.campaign_id, rollup.submitted_by_id, rollup.month)
+        kept = buckets.setdefault(key, rollup)
+        if kept is rollup:
+            continue
+        kept.submission_count += rollup.submission_count
+        for name, value in rollup.totals.items():
+            kept.totals[name] = kept.totals.get(name, 0) + value
+        kept.save(update_fields=['submission_count', 'totals'])
+        rollup.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0012_submission_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_buckets, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='submissionmonthlyrollup',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='submissionmonthlyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('service__isnull', False)), fields=('submission_type', 'campaign_id', 'service', 'submitted_by', 'month'), name='rollup_unique_bucket'),
+        ),
+        migrations.AddConstraint(
+            model_name='submissionmonthlyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('service__isnull', True)), fields=('submission_type', 'campaign_id', 'submitted_by', 'month'), name='rollup_unique_bucket_without_service'),
+        ),
+    ]
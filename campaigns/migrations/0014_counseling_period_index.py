@@ -0,0 +1,72 @@
+# Generated by Django 4.2.20 on 2026-10-17 19:15
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
+
+
+def rebuild_counseling_rollups(apps, schema_editor):
+    """Counseling submissions were rolled up by `date`; bucket them by `submission_period` like the analytics do."""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    SubmissionMonthlyRollup = apps.get_model('campaigns', 'SubmissionMonthlyRollup')
+    IntimateCounselingSubmission = apps.get_model('campaigns', 'IntimateCounselingSubmission')
+
+    submission_type = ContentType.objects.filter(
+        app_label='campaigns', model='intimatecounselingsubmission'
+    ).first()
+    if submission_type is None:
+        return
+
+    fields = [
+        field.name for field in IntimateCounselingSubmission._meta.concrete_fields
+        if isinstance(field, (models.IntegerField, models.DecimalField, models.FloatField))
+        and not field.is_relation
+        and not field.primary_key
+    ]
+    month = TruncMonth(
+        Coalesce('submission_period', TruncDate('created_at'), output_field=models.DateField()),
+        output_field=models.DateField(),
+    )
+    rows = (
+        IntimateCounselingSubmission.objects
+        .annotate(rollup_month=month)
+        .exclude(rollup_month__isnull=True)
+        .values('campaign_id', 'service_id', 'submitted_by_id', 'rollup_month')
+        .annotate(submission_count=Count('pk'), **{f"sum__{name}": Sum(name) for name in fields})
+        .order_by()
+    )
+    rollups = [
+        SubmissionMonthlyRollup(
+            submission_type=submission_type,
+            campaign_id=row['campaign_id'],
+            service_id=row['service_id'],
+            submitted_by_id=row['submitted_by_id'],
+            month=row['rollup_month'],
+            submission_count=row['submission_count'],
+            totals={name: int(row[f"sum__{name}"] or 0) for name in fields},
+        )
+        for row in rows
+    ]
+
+    SubmissionMonthlyRollup.objects.filter(submission_type=submission_type).delete()
+    SubmissionMonthlyRollup.objects.bulk_create(rollups, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0013_rollup_unique_buckets'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='intimatecounselingsubmission',
+            name='submission_inc_svc_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='intimatecounselingsubmission',
+            index=models.Index(fields=['service', 'submission_period'], name='submission_inc_svc_date_idx'),
+        ),
+        migrations.RunPython(rebuild_counseling_rollups, migrations.RunPython.noop),
+    ]
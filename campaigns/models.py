@@ -1,5 +1,8 @@
-from django.db import models
+from contextvars import ContextVar
+
+from django.db import models, transaction
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -43,6 +46,15 @@ class BaseSubmission(models.Model):
         abstract = True
         ordering = ['-submission_period', '-created_at']
 
+    def save(self, *args, **kwargs):
+        # Rollups and the activity feed are written by post_save handlers, in the same transaction
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            return super().delete(*args, **kwargs)
+
     def __str__(self):
         if self.submission_period:
             return f"{self.submitted_by.username} ({self.submission_period.strftime('%B %Y')})"
@@ -76,6 +88,10 @@ class StateOfTheFlockSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_sof'
+        indexes = [
+            models.Index(fields=['service', 'submission_period'], name='submission_sof_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_sof_keyset_idx'),
+        ]
 
 
 def _recalculate_service_total_membership(service: Service):
@@ -141,6 +157,10 @@ class SoulWinningSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_swc'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_swc_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_swc_keyset_idx'),
+        ]
        
 
 class SoulWinningSubmissionFile(SubmissionFile):
@@ -164,6 +184,10 @@ class ServantsArmedTrainedSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_sat'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_sat_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_sat_keyset_idx'),
+        ]
       
 
 class ServantsArmedTrainedSubmissionFile(SubmissionFile):
@@ -183,6 +207,10 @@ class AntibrutishSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_ant'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_ant_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_ant_keyset_idx'),
+        ]
 
 class AntibrutishSubmissionFile(SubmissionFile):
     submission = models.ForeignKey(AntibrutishSubmission, on_delete=models.CASCADE, related_name='pictures')
@@ -203,6 +231,10 @@ class HearingSeeingSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_hs'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_hs_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_hs_keyset_idx'),
+        ]
 
 # Campaign 6: Honour Your Prophet Campaign
 class HonourYourProphetCampaign(BaseCampaign):
@@ -217,6 +249,10 @@ class HonourYourProphetSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_hyp'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_hyp_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_hyp_keyset_idx'),
+        ]
 
 class HonourYourProphetSubmissionFile(SubmissionFile):
     submission = models.ForeignKey(HonourYourProphetSubmission, on_delete=models.CASCADE, related_name='pictures')
@@ -242,6 +278,10 @@ class BasontaProliferationSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_bsp'
+        indexes = [
+            models.Index(fields=['service', 'submission_period'], name='submission_bsp_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_bsp_keyset_idx'),
+        ]
 
 class BasontaProliferationSubmissionFile(SubmissionFile):
     submission = models.ForeignKey(BasontaProliferationSubmission, on_delete=models.CASCADE, related_name='pictures')
@@ -261,6 +301,10 @@ class IntimateCounselingSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_inc'
+        indexes = [
+            models.Index(fields=['service', 'submission_period'], name='submission_inc_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_inc_keyset_idx'),
+        ]
 
 # Campaign 9: Technology Campaign
 class TechnologyCampaign(BaseCampaign):
@@ -274,6 +318,10 @@ class TechnologySubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_tech'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_tech_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_tech_keyset_idx'),
+        ]
 
 class TechnologySubmissionFile(SubmissionFile):
     submission = models.ForeignKey(TechnologySubmission, on_delete=models.CASCADE, related_name='pictures')
@@ -296,6 +344,10 @@ class SheperdingControlSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_shc'
+        indexes = [
+            models.Index(fields=['service', 'submission_period'], name='submission_shc_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_shc_keyset_idx'),
+        ]
 
 
 # Campaign 11: Multiplication Campaign
@@ -314,6 +366,10 @@ class MultiplicationSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_mult'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_mult_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_mult_keyset_idx'),
+        ]
 
 class MultiplicationSubmissionFile(SubmissionFile):
     submission = models.ForeignKey(MultiplicationSubmission, on_delete=models.CASCADE, related_name='pictures')
@@ -332,6 +388,10 @@ class UnderstandingSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_uc'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_uc_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_uc_keyset_idx'),
+        ]
 
 
 class UnderstandingSubmissionFile(SubmissionFile):
@@ -354,6 +414,10 @@ class SheepSeekingSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_shs'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_shs_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_shs_keyset_idx'),
+        ]
 
 class SheepSeekingSubmissionFile(SubmissionFile):
     submission = models.ForeignKey(SheepSeekingSubmission, on_delete=models.CASCADE, related_name='pictures')
@@ -371,6 +435,10 @@ class TestimonySubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_tes'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_tes_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_tes_keyset_idx'),
+        ]
 
 # Campaign 15: Telepastoring Campaign
 class TelepastoringCampaign(BaseCampaign):
@@ -386,6 +454,10 @@ class TelepastoringSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_tel'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_tel_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_tel_keyset_idx'),
+        ]
 
 class TelepastoringSubmissionFile(SubmissionFile):
     submission = models.ForeignKey(TelepastoringSubmission, on_delete=models.CASCADE, related_name='pictures')
@@ -406,6 +478,10 @@ class GatheringBusSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_gbc'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_gbc_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_gbc_keyset_idx'),
+        ]
 
 class GatheringBusSubmissionFile(SubmissionFile):
     submission = models.ForeignKey(GatheringBusSubmission, on_delete=models.CASCADE, related_name='pictures')
@@ -423,6 +499,10 @@ class OrganisedCreativeArtsSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_oca'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_oca_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_oca_keyset_idx'),
+        ]
 
 # Campaign 18: Tangerine Campaign
 class TangerineCampaign(BaseCampaign):
@@ -437,6 +517,10 @@ class TangerineSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_tan'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_tan_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_tan_keyset_idx'),
+        ]
 
 # Campaign 19: Swollen Sunday Campaign
 class SwollenSundayCampaign(BaseCampaign):
@@ -451,6 +535,10 @@ class SwollenSundaySubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_ss'
+        indexes = [
+            models.Index(fields=['service', 'submission_period'], name='submission_ss_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_ss_keyset_idx'),
+        ]
 
 class SwollenSundaySubmissionFile(SubmissionFile):
     submission = models.ForeignKey(SwollenSundaySubmission, on_delete=models.CASCADE, related_name='pictures')
@@ -468,6 +556,10 @@ class SundayManagementSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_sm'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_sm_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_sm_keyset_idx'),
+        ]
         
 
 class SundayManagementSubmissionFile(SubmissionFile):
@@ -497,12 +589,78 @@ class EquipmentSubmission(BaseSubmission):
 
     class Meta:
         db_table = 'submission_equip'
+        indexes = [
+            models.Index(fields=['service', 'date'], name='submission_equip_svc_date_idx'),
+            models.Index(fields=['campaign', '-submission_period', '-created_at', '-id'], name='submission_equip_keyset_idx'),
+        ]
 
 class EquipmentSubmissionFile(SubmissionFile):
     submission = models.ForeignKey(EquipmentSubmission, on_delete=models.CASCADE, related_name='pictures')
 
 
 # Campaign Manager Assignment Model
+
+# True while sync_for_user() deletes assignments: per-row post_delete handlers leave
+# the invalidation to its caller, which does it once for the whole sync
+syncing_assignments = ContextVar('syncing_assignments', default=False)
+
+
+class CampaignManagerAssignmentQuerySet(models.QuerySet):
+    def with_campaigns(self):
+        """
+        Load each assignment's campaign in batches: assignments are grouped by
+        content type and every campaign table involved is read once with `id__in`,
+        instead of one query per assignment when `.campaign` is accessed. The user
+        is joined too, for __str__().
+        """
+        return self.select_related('user', 'content_type').prefetch_related('campaign')
+
+    def for_campaign_model(self, user, campaign_model):
+        """
+        The user's assignments to campaigns of `campaign_model`. Lookups by object_id on
+        top of this use the (user, content_type, object_id) unique index.
+        """
+        return self.filter(user=user, content_type=ContentType.objects.get_for_model(campaign_model))
+
+    def sync_for_user(self, user, targets):
+        """
+        Make `targets`, an iterable of (content type or its id, campaign id), the user's
+        exact set of assignments: missing ones are bulk created and the rest deleted in
+        one transaction, while unchanged assignments keep their id and created_at.
+        Returns (created, deleted).
+
+        bulk_create() sends no post_save signals and post_delete handlers see
+        `syncing_assignments` set, so callers are responsible for invalidating
+        anything that depends on the user's assignments.
+        """
+        wanted = {
+            (getattr(content_type, 'pk', content_type), int(object_id))
+            for content_type, object_id in targets
+        }
+        with transaction.atomic(using=self.db):
+            existing = {
+                (content_type_id, object_id): pk
+                for pk, content_type_id, object_id in self.filter(user=user).values_list(
+                    'pk', 'content_type_id', 'object_id'
+                )
+            }
+            stale = [pk for key, pk in existing.items() if key not in wanted]
+            deleted = 0
+            if stale:
+                token = syncing_assignments.set(True)
+                try:
+                    deleted = self.filter(pk__in=stale).delete()[0]
+                finally:
+                    syncing_assignments.reset(token)
+            missing = [
+                CampaignManagerAssignment(user=user, content_type_id=content_type_id, object_id=object_id)
+                for content_type_id, object_id in sorted(wanted - existing.keys())
+            ]
+            if missing:
+                self.bulk_create(missing, ignore_conflicts=True)
+        return len(missing), deleted
+
+
 class CampaignManagerAssignment(models.Model):
     """
     Links a Campaign Manager user to one or more campaigns.
@@ -524,6 +682,8 @@ class CampaignManagerAssignment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = CampaignManagerAssignmentQuerySet.as_manager()
+    
     class Meta:
         db_table = 'campaign_manager_assignments'
         unique_together = ['user', 'content_type', 'object_id']
@@ -532,4 +692,155 @@ class CampaignManagerAssignment(models.Model):
     
     def __str__(self):
         campaign_name = str(self.campaign) if self.campaign else 'Unknown Campaign'
-        return f"{self.user.full_name} -> {campaign_name}"
\ No newline at end of file
+        return f"{self.user.full_name} -> {campaign_name}"
+
+
+# Monthly Submission Rollups
+class SubmissionMonthlyRollup(models.Model):
+    """
+    Pre-aggregated totals for one (submission type, campaign, service, submitter, month) bucket.
+
+    `totals` maps every numeric field of the submission model to its sum for the bucket.
+    Rows are kept current by the signal handlers in campaigns/signals.py and can be
+    rebuilt from scratch with `python manage.py rebuild_submission_rollups`.
+    """
+    submission_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    campaign_id = models.PositiveIntegerField()
+    service = models.ForeignKey(Service, on_delete=models.SET_NULL, null=True, blank=True)
+    submitted_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    month = models.DateField(help_text="The first day of the month this bucket covers.")
+    submission_count = models.PositiveIntegerField(default=0)
+    totals = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'submission_monthly_rollups'
+        constraints = [
+            # NULLs are distinct in a unique index, so buckets without a service need their own
+            models.UniqueConstraint(
+                fields=['submission_type', 'campaign_id', 'service', 'submitted_by', 'month'],
+                condition=models.Q(service__isnull=False),
+                name='rollup_unique_bucket',
+            ),
+            models.UniqueConstraint(
+                fields=['submission_type', 'campaign_id', 'submitted_by', 'month'],
+                condition=models.Q(service__isnull=True),
+                name='rollup_unique_bucket_without_service',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['submitted_by', 'month'], name='rollup_user_month_idx'),
+            models.Index(fields=['service', 'month'], name='rollup_service_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.submission_type.model} #{self.campaign_id} ({self.month.strftime('%B %Y')})"
+
+
+# Submission Activity Feed
+class SubmissionActivity(models.Model):
+    """
+    One create, update or delete of a submission, appended by the signal handlers in
+    campaigns/signals.py in the same transaction as the change.
+
+    Campaign, service and preview fields are copied from the submission so recent
+    activity can be listed without touching the submission tables.
+    """
+    class Action(models.TextChoices):
+        CREATED = 'CREATED', 'Created'
+        UPDATED = 'UPDATED', 'Updated'
+        DELETED = 'DELETED', 'Deleted'
+
+    action = models.CharField(max_length=10, choices=Action.choices)
+    submission_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    submission_id = models.PositiveBigIntegerField()
+    campaign_type = models.CharField(max_length=100)
+    campaign_id = models.PositiveIntegerField()
+    campaign_name = models.CharField(max_length=100, blank=True, null=True)
+    service = models.ForeignKey(Service, on_delete=models.SET_NULL, null=True, blank=True)
+    # The log outlives the submitter: deleting a user deletes their submissions, which
+    # appends delete events for that user, so there is no database constraint here
+    submitted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+'
+    )
+    submission_period = models.DateField(null=True, blank=True)
+    date = models.DateField(null=True, blank=True)
+    preview = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'submission_activity'
+        ordering = ['-created_at', '-id']
+        verbose_name_plural = 'Submission activity'
+        indexes = [
+            models.Index(fields=['submitted_by', 'created_at'], name='activity_user_created_idx'),
+            models.Index(fields=['service', 'created_at'], name='activity_service_created_idx'),
+            models.Index(fields=['submission_type', 'submission_id'], name='activity_submission_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.campaign_type} #{self.submission_id}"
+
+
+# Submission Counters
+class SubmissionCounter(models.Model):
+    """
+    Number of submissions created in one month (period 'YYYY-MM') or in total (period 'all').
+
+    Counters are incremented and decremented with F() expressions by the signal handlers
+    in campaigns/signals.py and can be recomputed with
+    `python manage.py reconcile_submission_counters`.
+    """
+    period = models.CharField(max_length=7, help_text="The month counted (YYYY-MM), or 'all' for all time.")
+    submission_count = models.PositiveIntegerField(default=0)
+    last_submission_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+
+class UserSubmissionCounter(SubmissionCounter):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    active_campaigns = models.PositiveIntegerField(
+        default=0, help_text="Campaigns the user has submissions for (kept on the 'all' row)."
+    )
+
+    class Meta:
+        db_table = 'submission_counters_user'
+        unique_together = ['user', 'period']
+
+    def __str__(self):
+        return f"{self.user_id} {self.period}: {self.submission_count}"
+
+
+class ServiceSubmissionCounter(SubmissionCounter):
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        db_table = 'submission_counters_service'
+        unique_together = ['service', 'period']
+
+    def __str__(self):
+        return f"{self.service_id} {self.period}: {self.submission_count}"
+
+
+class CampaignSubmissionCounter(SubmissionCounter):
+    """Submissions of one user for one campaign."""
+    submission_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    campaign_id = models.PositiveIntegerField()
+    submitted_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        db_table = 'submission_counters_campaign'
+        unique_together = ['submission_type', 'campaign_id', 'submitted_by', 'period']
+        indexes = [
+            models.Index(
+                fields=['submitted_by', 'period', 'last_submission_at'], name='counter_user_last_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.submission_type.model} #{self.campaign_id} {self.period}: {self.submission_count}"
@@ -0,0 +1,137 @@
+"""
+The campaign types.
+
+Every campaign type has a campaign model, a submission model, their serializers,
+a display name, a URL slug and the date field its submissions are reported by,
+which the rollups, trends and analytics of the type all use.
+CampaignsConfig.ready() builds the registry once, with lookup maps by model,
+display name and slug, so code that works across types does dictionary lookups
+instead of keeping its own list of the 21 types.
+"""
+from django.contrib.contenttypes.models import ContentType
+
+
+# (model prefix, display name, URL slug) of every campaign type, in display order.
+# `<prefix>Campaign` and `<prefix>Submission` are the models, with serializers of the same names.
+CAMPAIGN_TYPES = [
+    ('StateOfTheFlock', "State of the Flock", 'state-of-flock'),
+    ('SoulWinning', "Soul Winning", 'soul-winning'),
+    ('ServantsArmedTrained', "Servants Armed and Trained", 'servants-armed-trained'),
+    ('Antibrutish', "Antibrutish", 'antibrutish'),
+    ('HearingSeeing', "Hearing and Seeing", 'hearing-seeing'),
+    ('HonourYourProphet', "Honour Your Prophet", 'honour-your-prophet'),
+    ('BasontaProliferation', "Basonta Proliferation", 'basonta-proliferation'),
+    ('IntimateCounseling', "Intimate Counseling", 'intimate-counseling'),
+    ('Technology', "Technology", 'technology'),
+    ('SheperdingControl', "Sheperding Control", 'sheperding-control'),
+    ('Multiplication', "Multiplication", 'multiplication'),
+    ('Understanding', "Understanding", 'understanding'),
+    ('SheepSeeking', "Sheep Seeking", 'sheep-seeking'),
+    ('Testimony', "Testimony", 'testimony'),
+    ('Telepastoring', "Telepastoring", 'telepastoring'),
+    ('GatheringBus', "Gathering Bus", 'gathering-bus'),
+    ('OrganisedCreativeArts', "Organised Creative Arts", 'organised-creative-arts'),
+    ('Tangerine', "Tangerine", 'tangerine'),
+    ('SwollenSunday', "Swollen Sunday", 'swollen-sunday'),
+    ('SundayManagement', "Sunday Management", 'sunday-management'),
+    ('Equipment', "Equipment", 'equipment'),
+]
+
+
+# Submission types that report against `submission_period` instead of `date`
+PERIOD_DATED_SUBMISSIONS = {
+    'StateOfTheFlockSubmission',
+    'BasontaProliferationSubmission',
+    'IntimateCounselingSubmission',
+    'SheperdingControlSubmission',
+    'SwollenSundaySubmission',
+}
+
+
+class CampaignType:
+    """One campaign type and everything that belongs to it."""
+
+    def __init__(self, index, name, slug, campaign_model, submission_model,
+                 campaign_serializer, submission_serializer, date_field):
+        self.index = index
+        self.name = name
+        self.slug = slug
+        self.campaign_model = campaign_model
+        self.submission_model = submission_model
+        self.campaign_serializer = campaign_serializer
+        self.submission_serializer = submission_serializer
+        self.date_field = date_field
+
+    @property
+    def campaign_content_type(self):
+        # The content type cache makes this a dictionary lookup after the first request
+        return ContentType.objects.get_for_model(self.campaign_model)
+
+    @property
+    def submission_content_type(self):
+        return ContentType.objects.get_for_model(self.submission_model)
+
+    def __repr__(self):
+        return f"<CampaignType {self.name}>"
+
+
+_types = []
+_by_model = {}
+_by_name = {}
+_by_slug = {}
+
+
+def build_registry():
+    """Resolve CAMPAIGN_TYPES into CampaignType objects and lookup maps. Called from CampaignsConfig.ready()."""
+    from . import models, serializers
+
+    types = []
+    for index, (prefix, name, slug) in enumerate(CAMPAIGN_TYPES):
+        submission_model = getattr(models, f'{prefix}Submission')
+        types.append(CampaignType(
+            index=index,
+            name=name,
+            slug=slug,
+            campaign_model=getattr(models, f'{prefix}Campaign'),
+            submission_model=submission_model,
+            campaign_serializer=getattr(serializers, f'{prefix}CampaignSerializer'),
+            submission_serializer=getattr(serializers, f'{prefix}SubmissionSerializer'),
+            date_field='submission_period' if submission_model.__name__ in PERIOD_DATED_SUBMISSIONS else 'date',
+        ))
+
+    _types[:] = types
+    _by_model.clear()
+    _by_name.clear()
+    _by_slug.clear()
+    for campaign_type in types:
+        _by_model[campaign_type.campaign_model] = campaign_type
+        _by_model[campaign_type.submission_model] = campaign_type
+        _by_name[campaign_type.name.lower()] = campaign_type
+        _by_slug[campaign_type.slug] = campaign_type
+
+
+def campaign_types():
+    """Every campaign type, in display order."""
+    return _types
+
+
+def get_campaign_type(model):
+    """The campaign type of a campaign or submission model (class or instance), or None."""
+    if not isinstance(model, type):
+        model = type(model)
+    return _by_model.get(model)
+
+
+def get_campaign_type_by_name(name):
+    """The campaign type with display name `name` (case-insensitive), or None."""
+    return _by_name.get(name.strip().lower()) if name else None
+
+
+def get_campaign_type_by_slug(slug):
+    return _by_slug.get(slug)
+
+
+def get_campaign_type_for_content_type(content_type_id):
+    """The campaign type of a campaign or submission content type id, or None."""
+    model = ContentType.objects.get_for_id(content_type_id).model_class()
+    return _by_model.get(model)
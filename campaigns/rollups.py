@@ -0,0 +1,229 @@
+"""
+Monthly rollups of campaign submissions.
+
+Every BaseSubmission subclass is summarised per (campaign, service, submitted_by, month)
+in SubmissionMonthlyRollup. The month of a submission is taken from the date_field
+of its campaign type (see campaigns.registry), falling back to the day it was created.
+"""
+from datetime import date
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncMonth
+from django.utils import timezone
+
+from .registry import get_campaign_type
+
+
+BUCKET_FIELDS = ['campaign_id', 'service_id', 'submitted_by_id']
+
+
+def get_submission_models():
+    """Return every concrete submission model in the campaigns app."""
+    from .models import BaseSubmission
+    return [
+        model for model in apps.get_app_config('campaigns').get_models()
+        if issubclass(model, BaseSubmission)
+    ]
+
+
+def is_submission_model(model):
+    from .models import BaseSubmission
+    return isinstance(model, type) and issubclass(model, BaseSubmission) and not model._meta.abstract
+
+
+def rollup_date_field(model):
+    """Name of the date field a submission model is bucketed by: its campaign type's date_field."""
+    campaign_type = get_campaign_type(model)
+    return campaign_type.date_field if campaign_type else 'date'
+
+
+def rollup_fields(model):
+    """Numeric fields of a submission model that are summed into the rollup totals."""
+    return [
+        field.name for field in model._meta.concrete_fields
+        if isinstance(field, (models.IntegerField, models.DecimalField, models.FloatField))
+        and not field.is_relation
+        and not field.primary_key
+    ]
+
+
+def month_start(value):
+    return value.replace(day=1) if value else None
+
+
+def next_month(value):
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def bucket_for(model, values):
+    """
+    Build the rollup bucket key for a submission.
+    `values` may be a model instance or a dict of field values.
+    """
+    get = values.get if isinstance(values, dict) else (lambda name: getattr(values, name, None))
+
+    reported = get(rollup_date_field(model))
+    if not reported:
+        created_at = get('created_at')
+        if not created_at:
+            return None
+        reported = timezone.localtime(created_at).date() if timezone.is_aware(created_at) else created_at.date()
+
+    return (get('campaign_id'), get('service_id'), get('submitted_by_id'), month_start(reported))
+
+
+def reported_date(date_field):
+    """The day a submission reports for: `date_field`, or the day it was created when that is empty."""
+    return Coalesce(date_field, TruncDate('created_at'), output_field=models.DateField())
+
+
+def reported_between(date_field, start, end):
+    """Q matching submissions whose reported_date() is in [start, end)."""
+    return (
+        Q(**{f"{date_field}__gte": start, f"{date_field}__lt": end})
+        | Q(**{f"{date_field}__isnull": True, 'created_at__date__gte': start, 'created_at__date__lt': end})
+    )
+
+
+def _month_expression(model):
+    return TruncMonth(reported_date(rollup_date_field(model)), output_field=models.DateField())
+
+
+def _sum_aliases(model):
+    return {f"sum__{name}": Sum(name) for name in rollup_fields(model)}
+
+
+def _totals_from_row(model, row):
+    totals = {}
+    for name in rollup_fields(model):
+        value = row.get(f"sum__{name}") or 0
+        totals[name] = int(value) if isinstance(model._meta.get_field(name), models.IntegerField) else float(value)
+    return totals
+
+
+def refresh_rollup(model, bucket):
+    """Recompute a single rollup bucket from the submission table."""
+    if bucket is None:
+        return
+
+    campaign_id, service_id, submitted_by_id, month = bucket
+    row = model.objects.filter(
+        reported_between(rollup_date_field(model), month, next_month(month)),
+        campaign_id=campaign_id,
+        service_id=service_id,
+        submitted_by_id=submitted_by_id,
+    ).aggregate(submission_count=Count('pk'), **_sum_aliases(model))
+
+    from .models import SubmissionMonthlyRollup
+    lookup = {
+        'submission_type': ContentType.objects.get_for_model(model),
+        'campaign_id': campaign_id,
+        'service_id': service_id,
+        'submitted_by_id': submitted_by_id,
+        'month': month,
+    }
+
+    if not row['submission_count']:
+        SubmissionMonthlyRollup.objects.filter(**lookup).delete()
+        return
+
+    defaults = {
+        'submission_count': row['submission_count'],
+        'totals': _totals_from_row(model, row),
+    }
+    try:
+        SubmissionMonthlyRollup.objects.update_or_create(**lookup, defaults=defaults)
+    except SubmissionMonthlyRollup.MultipleObjectsReturned:
+        # A bucket duplicated before the NULL-service constraint existed: keep one row
+        rows = SubmissionMonthlyRollup.objects.filter(**lookup)
+        keep = rows.order_by('pk').values_list('pk', flat=True)[0]
+        rows.exclude(pk=keep).delete()
+        rows.filter(pk=keep).update(**defaults, updated_at=timezone.now())
+
+
+def service_rollup_buckets(service):
+    """
+    The (model, bucket) pairs a service's submissions are rolled up in, with the
+    service replaced by None: the buckets its submissions move to when it is deleted.
+    """
+    from .models import SubmissionMonthlyRollup
+
+    rows = (
+        SubmissionMonthlyRollup.objects
+        .filter(service=service)
+        .values_list('submission_type', 'campaign_id', 'submitted_by_id', 'month')
+        .distinct()
+    )
+    buckets = []
+    for submission_type_id, campaign_id, submitted_by_id, month in rows:
+        model = ContentType.objects.get_for_id(submission_type_id).model_class()
+        buckets.append((model, (campaign_id, None, submitted_by_id, month)))
+    return buckets
+
+
+def rebuild_rollups(models_to_rebuild=None):
+    """
+    Drop and recompute the rollups of the given submission models (all by default)
+    with one GROUP BY query per model. Returns the number of rollup rows written.
+    """
+    from .models import SubmissionMonthlyRollup
+
+    written = 0
+    for model in models_to_rebuild or get_submission_models():
+        submission_type = ContentType.objects.get_for_model(model)
+        rows = (
+            model.objects
+            .annotate(rollup_month=_month_expression(model))
+            .exclude(rollup_month__isnull=True)
+            .values(*BUCKET_FIELDS, 'rollup_month')
+            .annotate(submission_count=Count('pk'), **_sum_aliases(model))
+            .order_by()
+        )
+
+        rollups = [
+            SubmissionMonthlyRollup(
+                submission_type=submission_type,
+                campaign_id=row['campaign_id'],
+                service_id=row['service_id'],
+                submitted_by_id=row['submitted_by_id'],
+                month=row['rollup_month'],
+                submission_count=row['submission_count'],
+                totals=_totals_from_row(model, row),
+            )
+            for row in rows
+        ]
+
+        with transaction.atomic():
+            SubmissionMonthlyRollup.objects.filter(submission_type=submission_type).delete()
+            SubmissionMonthlyRollup.objects.bulk_create(rollups, batch_size=500)
+        written += len(rollups)
+
+    return written
+
+
+def rollup_totals(model, **filters):
+    """
+    Sum the rollups of a submission model matching `filters`
+    (e.g. submitted_by=user, month__gte=...). Returns the summed totals plus
+    'submission_count'.
+    """
+    from .models import SubmissionMonthlyRollup
+
+    totals = {name: 0 for name in rollup_fields(model)}
+    totals['submission_count'] = 0
+
+    rows = SubmissionMonthlyRollup.objects.filter(
+        submission_type=ContentType.objects.get_for_model(model), **filters
+    ).values_list('submission_count', 'totals')
+
+    for submission_count, row_totals in rows:
+        totals['submission_count'] += submission_count
+        for name, value in row_totals.items():
+            totals[name] = totals.get(name, 0) + value
+
+    return totals
@@ -21,6 +21,7 @@ from .models import (
     SwollenSundayCampaign, SwollenSundaySubmission, SwollenSundaySubmissionFile,
     SundayManagementCampaign, SundayManagementSubmission, SundayManagementSubmissionFile,
     EquipmentCampaign, EquipmentSubmission, EquipmentSubmissionFile,
+    SubmissionActivity,
 )
 
 
@@ -1044,6 +1045,16 @@ class EquipmentSubmissionSerializer(serializers.ModelSerializer):
 
 # ============= Dashboard Serializers =============
 
+# Submission fields shown in the dashboard preview, by campaign type
+DASHBOARD_PREVIEW_FIELDS = {
+    "Soul Winning": ['no_of_souls_won', 'no_of_crusades'],
+    "State of the Flock": ['total_membership', 'stable'],
+    "Antibrutish": ['type_of_prayer', 'hours_prayed'],
+    "Multiplication": ['no_of_outreaches'],
+    "Testimony": ['number_of_testimonies_shared'],
+}
+
+
 class DashboardSubmissionSerializer(serializers.Serializer):
     """Lightweight serializer for recent submissions in dashboard"""
     id = serializers.IntegerField()
@@ -1063,19 +1074,10 @@ class DashboardSubmissionSerializer(serializers.Serializer):
         # Return relevant preview fields based on campaign type
         preview = {}
         
-        if campaign_type == "Soul Winning":
-            preview['no_of_souls_won'] = getattr(submission, 'no_of_souls_won', None)
-            preview['no_of_crusades'] = getattr(submission, 'no_of_crusades', None)
-        elif campaign_type == "State of the Flock":
-            preview['total_membership'] = getattr(submission, 'total_membership', None)
-            preview['stable'] = getattr(submission, 'stable', None)
-        elif campaign_type == "Antibrutish":
-            preview['type_of_prayer'] = getattr(submission, 'type_of_prayer', None)
-            preview['hours_prayed'] = str(getattr(submission, 'hours_prayed', None))
-        elif campaign_type == "Multiplication":
-            preview['no_of_outreaches'] = getattr(submission, 'no_of_outreaches', None)
-        elif campaign_type == "Testimony":
-            preview['number_of_testimonies_shared'] = getattr(submission, 'number_of_testimonies_shared', None)
+        for field in DASHBOARD_PREVIEW_FIELDS.get(campaign_type, ()):
+            value = getattr(submission, field, None)
+            # Decimal hours are sent as a string
+            preview[field] = str(value) if field == 'hours_prayed' else value
         
         return preview
     
@@ -1122,3 +1124,15 @@ class DashboardCampaignSerializer(serializers.Serializer):
             'submission_count': submission_count
         }
 
+
+class SubmissionActivitySerializer(serializers.ModelSerializer):
+    """One entry of the submission activity feed"""
+    service_name = serializers.CharField(source='service.name', read_only=True, default=None)
+    
+    class Meta:
+        model = SubmissionActivity
+        fields = [
+            'id', 'action', 'campaign_type', 'campaign_id', 'campaign_name', 'submission_id',
+            'service', 'service_name', 'submitted_by', 'submission_period', 'date', 'preview', 'created_at'
+        ]
+        read_only_fields = fields
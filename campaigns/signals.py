@@ -0,0 +1,140 @@
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from authentication.models import Service
+
+from .activity import record_activity
+from .catalog import bump_catalog_version, is_campaign_model
+from .counters import count_submission, uncount_submission
+from .models import SubmissionActivity, SubmissionMonthlyRollup
+from .rollups import (
+    is_submission_model, bucket_for, refresh_rollup, rollup_date_field, service_rollup_buckets,
+)
+
+
+@receiver(pre_save)
+def remember_previous_rollup_bucket(sender, instance, raw=False, **kwargs):
+    """
+    Before an existing submission is updated, remember which rollup bucket and counters
+    it was in so they can be corrected if the month, campaign or service changes.
+    """
+    if raw or not is_submission_model(sender) or instance.pk is None:
+        return
+
+    previous = (
+        sender.objects
+        .filter(pk=instance.pk)
+        .values('campaign_id', 'service_id', 'submitted_by_id', 'created_at', rollup_date_field(sender))
+        .first()
+    )
+    instance._previous_rollup_bucket = bucket_for(sender, previous) if previous else None
+    instance._previous_counter_key = (
+        {field: previous[field] for field in ('campaign_id', 'service_id', 'submitted_by_id', 'created_at')}
+        if previous else None
+    )
+
+
+@receiver(post_save)
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    """Keep the monthly rollup of a submission current when it is created or updated."""
+    if raw or not is_submission_model(sender):
+        return
+
+    bucket = bucket_for(sender, instance)
+    refresh_rollup(sender, bucket)
+
+    previous = getattr(instance, '_previous_rollup_bucket', None)
+    if previous and previous != bucket:
+        refresh_rollup(sender, previous)
+
+
+@receiver(post_delete)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    """Remove a deleted submission from its monthly rollup."""
+    if not is_submission_model(sender):
+        return
+
+    refresh_rollup(sender, bucket_for(sender, instance))
+
+
+@receiver(pre_delete, sender=Service)
+def remember_service_rollup_buckets(sender, instance, **kwargs):
+    """
+    Deleting a service sets the service of its submissions to NULL. Drop its rollup
+    rows rather than letting them be set to NULL too, where they would duplicate the
+    buckets of submissions that already had no service.
+    """
+    instance._orphaned_rollup_buckets = service_rollup_buckets(instance)
+    SubmissionMonthlyRollup.objects.filter(service=instance).delete()
+
+
+@receiver(post_delete, sender=Service)
+def rebuild_service_rollup_buckets(sender, instance, **kwargs):
+    """Recompute the no-service buckets a deleted service's submissions now belong to."""
+    for model, bucket in getattr(instance, '_orphaned_rollup_buckets', []):
+        refresh_rollup(model, bucket)
+
+
+@receiver(post_save)
+def record_activity_on_save(sender, instance, created=False, raw=False, **kwargs):
+    """Append the creation or update of a submission to the activity feed."""
+    if raw or not is_submission_model(sender):
+        return
+
+    action = SubmissionActivity.Action.CREATED if created else SubmissionActivity.Action.UPDATED
+    record_activity(sender, instance, action)
+
+
+@receiver(post_delete)
+def record_activity_on_delete(sender, instance, **kwargs):
+    """Append the deletion of a submission to the activity feed."""
+    if not is_submission_model(sender):
+        return
+
+    record_activity(sender, instance, SubmissionActivity.Action.DELETED)
+
+
+def _counter_key(instance):
+    return {
+        'campaign_id': instance.campaign_id,
+        'service_id': instance.service_id,
+        'submitted_by_id': instance.submitted_by_id,
+        'created_at': instance.created_at,
+    }
+
+
+@receiver(post_save)
+def update_counters_on_save(sender, instance, created=False, raw=False, **kwargs):
+    """Count a new submission, or move an updated one to the counters it now belongs in."""
+    if raw or not is_submission_model(sender):
+        return
+
+    if created:
+        count_submission(sender, instance)
+        return
+
+    previous = getattr(instance, '_previous_counter_key', None)
+    if previous is None:
+        return
+    if previous != _counter_key(instance):
+        uncount_submission(sender, previous)
+        count_submission(sender, instance)
+
+
+@receiver(post_delete)
+def update_counters_on_delete(sender, instance, **kwargs):
+    """Remove a deleted submission from its counters."""
+    if not is_submission_model(sender):
+        return
+
+    uncount_submission(sender, instance)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_catalog(sender, **kwargs):
+    """Any change to a campaign makes every cached copy of the campaign catalog stale."""
+    if not is_campaign_model(sender):
+        return
+
+    bump_catalog_version()
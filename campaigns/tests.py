@@ -1,3 +1,692 @@
-from django.test import TestCase
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection, models, transaction
+from django.db.models import Count, Q, Sum
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from authentication.models import ClaimsUser, CustomerUser, Service
+from authentication.serializers import CampaignManagerCreateSerializer, resolve_campaign_assignments
+from .activity import backfill_activity
+from .catalog import find_campaign, get_catalog, resolve_campaign_names
+from .comparisons import compare_totals
+from .models import (
+    CampaignManagerAssignment, IntimateCounselingCampaign, IntimateCounselingSubmission,
+    SoulWinningCampaign, SoulWinningSubmission, StateOfTheFlockCampaign, SubmissionActivity,
+    SubmissionMonthlyRollup,
+)
+from .registry import (
+    CAMPAIGN_TYPES, PERIOD_DATED_SUBMISSIONS, campaign_types, get_campaign_type, get_campaign_type_by_name,
+    get_campaign_type_by_slug, get_campaign_type_for_content_type,
+)
+from .rollups import rebuild_rollups, rollup_date_field
+from .trends import cumulative_trend, monthly_trend, rollup_cumulative_trend, rollup_trend
+from .unions import count_by_key, count_by_month
+from .views import filter_queryset_for_campaign_manager, validate_campaign_manager_assignment
+
+
+def required_values(model):
+    """A value for every field of `model` that has no default and may not be empty."""
+    values = {}
+    for field in model._meta.concrete_fields:
+        if field.is_relation or field.primary_key or field.null or field.blank or field.has_default():
+            continue
+        if field.choices:
+            values[field.name] = field.choices[0][0]
+        elif isinstance(field, models.DecimalField):
+            values[field.name] = Decimal('1')
+        elif isinstance(field, models.IntegerField):
+            values[field.name] = 1
+        elif isinstance(field, models.DateField):
+            values[field.name] = date.today()
+        else:
+            values[field.name] = 'x'
+    return values
+
+
+class CampaignRegistryTests(TestCase):
+    """Every campaign type is found by its models, display name, slug and content types."""
+
+    def test_lookups(self):
+        self.assertEqual(len(campaign_types()), len(CAMPAIGN_TYPES))
+        for index, campaign_type in enumerate(campaign_types()):
+            with self.subTest(campaign_type=campaign_type.name):
+                self.assertEqual(campaign_type.index, index)
+                for model in (campaign_type.campaign_model, campaign_type.submission_model):
+                    self.assertIs(get_campaign_type(model), campaign_type)
+                    self.assertIs(get_campaign_type_for_content_type(ContentType.objects.get_for_model(model).id), campaign_type)
+                self.assertIs(get_campaign_type(campaign_type.campaign_model(name='x')), campaign_type)
+                self.assertIs(get_campaign_type_by_name(f" {campaign_type.name.upper()} "), campaign_type)
+                self.assertIs(get_campaign_type_by_slug(campaign_type.slug), campaign_type)
+
+        self.assertIsNone(get_campaign_type(Service))
+        self.assertIsNone(get_campaign_type_by_name(None))
+        self.assertIsNone(get_campaign_type_by_name('Tithes'))
+        self.assertIsNone(get_campaign_type_by_slug('Soul Winning'))
+        self.assertIsNone(get_campaign_type_for_content_type(ContentType.objects.get_for_model(Service).id))
+
+    def test_date_fields(self):
+        for campaign_type in campaign_types():
+            with self.subTest(campaign_type=campaign_type.name):
+                period_dated = campaign_type.submission_model.__name__ in PERIOD_DATED_SUBMISSIONS
+                self.assertEqual(campaign_type.date_field, 'submission_period' if period_dated else 'date')
+                self.assertEqual(rollup_date_field(campaign_type.submission_model), campaign_type.date_field)
+                campaign_type.submission_model._meta.get_field(campaign_type.date_field)
+
+
+class SubmissionListQueryCountTests(TestCase):
+    """A page of submissions takes the same number of queries however many rows it has."""
+
+    ROWS = 5
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.service = Service.objects.create(name='Main Service')
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password', service=self.service)
+        self.manager = CustomerUser.objects.create_user(
+            'manager', 'manager@example.com', 'password', role=CustomerUser.Role.CAMPAIGN_MANAGER
+        )
+        self.client = APIClient()
+
+        for campaign_type in campaign_types():
+            campaign = campaign_type.campaign_model.objects.create(name=campaign_type.name)
+            CampaignManagerAssignment.objects.create(
+                user=self.manager, content_type=ContentType.objects.get_for_model(campaign), object_id=campaign.id
+            )
+            pictures = self.pictures(campaign_type.submission_model)
+            for _ in range(self.ROWS):
+                submission = campaign_type.submission_model.objects.create(
+                    campaign=campaign, service=self.service, submitted_by=self.pastor,
+                    **required_values(campaign_type.submission_model)
+                )
+                if pictures is not None:
+                    pictures.related_model.objects.create(submission=submission, file='pictures/picture.jpg')
+
+    def pictures(self, submission_model):
+        try:
+            return submission_model._meta.get_field('pictures')
+        except FieldDoesNotExist:
+            return None
+
+    def expected_queries(self, submission_model):
+        # The page count, the page with its submitter and service, and the pictures of the page
+        return 3 if self.pictures(submission_model) is not None else 2
+
+    def assert_list_query_count(self, user):
+        self.client.force_authenticate(CustomerUser.objects.get(pk=user.pk))
+        for campaign_type in campaign_types():
+            with self.subTest(campaign_type=campaign_type.name):
+                ContentType.objects.get_for_model(campaign_type.campaign_model)
+                with self.assertNumQueries(self.expected_queries(campaign_type.submission_model)):
+                    response = self.client.get(f'/campaigns/{campaign_type.slug}/submissions/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['count'], self.ROWS)
+                row = response.data['results'][0]
+                self.assertEqual(row['service_name'], 'Main Service')
+                self.assertEqual(row['submitted_by_role'], CustomerUser.Role.Pastor)
+                if 'pictures' in row:
+                    self.assertEqual(len(row['pictures']), 1)
+
+    def test_pastor_list_query_count(self):
+        self.assert_list_query_count(self.pastor)
+
+    def test_campaign_manager_list_query_count(self):
+        self.assert_list_query_count(self.manager)
+
+
+class AllCampaignsQueryCountTests(TestCase):
+    """/campaigns/all/ is one count and one page query however many campaign types there are."""
+
+    def setUp(self):
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password')
+        self.manager = CustomerUser.objects.create_user(
+            'manager', 'manager@example.com', 'password', role=CustomerUser.Role.CAMPAIGN_MANAGER
+        )
+        self.client = APIClient()
+        for campaign_type in campaign_types():
+            for number in range(2):
+                campaign = campaign_type.campaign_model.objects.create(name=f"{campaign_type.name} {number}")
+                CampaignManagerAssignment.objects.create(
+                    user=self.manager, content_type=ContentType.objects.get_for_model(campaign), object_id=campaign.id
+                )
+
+    def assert_query_count(self, user):
+        self.client.force_authenticate(CustomerUser.objects.get(pk=user.pk))
+        everything = len(campaign_types()) * 2
+        for types, count in [(campaign_types()[:1], 2), (campaign_types()[:3], 6), (campaign_types(), everything)]:
+            with self.subTest(types=len(types)):
+                type_filter = ','.join(campaign_type.name for campaign_type in types)
+                with self.assertNumQueries(2):
+                    response = self.client.get('/campaigns/all/', {'type': type_filter, 'page_size': 100})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['count'], count)
+                self.assertEqual(len(response.data['results']), count)
+
+    def test_query_count(self):
+        self.assert_query_count(self.pastor)
+
+    def test_campaign_manager_query_count(self):
+        self.assert_query_count(self.manager)
+
+
+class AssignedCampaignsQueryCountTests(TestCase):
+    """Listing a campaign manager's assignments reads each campaign table once, however many there are."""
+
+    TYPES = 3
+
+    def setUp(self):
+        self.manager = CustomerUser.objects.create_user(
+            'manager', 'manager@example.com', 'password', role=CustomerUser.Role.CAMPAIGN_MANAGER
+        )
+
+    def assign(self, per_type):
+        for campaign_type in campaign_types()[:self.TYPES]:
+            for _ in range(per_type):
+                number = campaign_type.campaign_model.objects.count()
+                campaign = campaign_type.campaign_model.objects.create(name=f"{campaign_type.name} {number}")
+                CampaignManagerAssignment.objects.create(
+                    user=self.manager, content_type=ContentType.objects.get_for_model(campaign), object_id=campaign.id
+                )
+
+    def test_assigned_campaigns(self):
+        serializer = CampaignManagerCreateSerializer()
+        for per_type in (1, 5):
+            self.assign(per_type)
+            # The assignments, then one query per campaign type
+            with self.assertNumQueries(1 + self.TYPES):
+                campaigns = serializer.get_assigned_campaigns(self.manager)
+            self.assertTrue(all(campaign['campaign_name'] for campaign in campaigns))
+
+    def test_admin_str(self):
+        model_admin = admin.site._registry[CampaignManagerAssignment]
+        request = RequestFactory().get('/admin/campaigns/campaignmanagerassignment/')
+        for per_type in (1, 5):
+            self.assign(per_type)
+            with self.assertNumQueries(1 + self.TYPES):
+                names = [str(assignment) for assignment in model_admin.get_queryset(request)]
+            self.assertNotIn('Unknown Campaign', ' '.join(names))
+
+
+class SubmissionCursorPaginationTests(TestCase):
+    """Cursor pages cost the same however deep they are, and walk every submission once in order."""
+
+    def setUp(self):
+        self.service = Service.objects.create(name='Main Service')
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password', service=self.service)
+        self.campaign = SoulWinningCampaign.objects.create(name='Soul Winning')
+        self.client = APIClient()
+        self.client.force_authenticate(self.pastor)
+
+        # Undated submissions and ties on created_at are ordered by id
+        created_at = timezone.now()
+        for index in range(25):
+            submission = SoulWinningSubmission.objects.create(
+                campaign=self.campaign, service=self.service, submitted_by=self.pastor,
+                submission_period=None if index % 3 == 0 else date(2025, index % 6 + 1, 1),
+            )
+            if index % 4 == 0:
+                SoulWinningSubmission.objects.filter(pk=submission.pk).update(created_at=created_at)
+
+    def test_cursor_pages_follow_the_submission_order(self):
+        expected = list(
+            SoulWinningSubmission.objects.order_by('-submission_period', '-created_at', '-id').values_list('id', flat=True)
+        )
+        ContentType.objects.get_for_model(SoulWinningCampaign)
+
+        url = '/campaigns/soul-winning/submissions/?pagination=cursor&page_size=10&total=true'
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.data['count'], 25)
+        ids = [row['id'] for row in response.data['results']]
+
+        while response.data['next']:
+            # The total rides along in the cursor instead of being counted again
+            with self.assertNumQueries(2):
+                response = self.client.get(response.data['next'])
+            self.assertEqual(response.data['count'], 25)
+            ids.extend(row['id'] for row in response.data['results'])
+
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/campaigns/soul-winning/submissions/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+
+class CampaignManagerAccessTests(TestCase):
+    """
+    A campaign manager's access is checked from their token claims without a query,
+    or else with one EXISTS query on the assignment index, when listing and when creating.
+    """
+
+    def setUp(self):
+        self.manager = CustomerUser.objects.create_user(
+            'manager', 'manager@example.com', 'password', role=CustomerUser.Role.CAMPAIGN_MANAGER
+        )
+        self.assigned = SoulWinningCampaign.objects.create(name='Assigned')
+        self.other = SoulWinningCampaign.objects.create(name='Other')
+        content_type = ContentType.objects.get_for_model(SoulWinningCampaign)
+        CampaignManagerAssignment.objects.create(user=self.manager, content_type=content_type, object_id=self.assigned.id)
+        for campaign in (self.assigned, self.other):
+            SoulWinningSubmission.objects.create(campaign=campaign, submitted_by=self.manager, date=date(2025, 3, 1))
+
+        self.claims_manager = ClaimsUser.objects.get(pk=self.manager.pk)
+        self.claims_manager.token_assignments = [(content_type.id, self.assigned.id)]
+
+    def visible_campaigns(self, user):
+        queryset = filter_queryset_for_campaign_manager(SoulWinningSubmission.objects.all(), user, SoulWinningCampaign)
+        with CaptureQueriesContext(connection) as queries:
+            campaigns = [submission.campaign_id for submission in queryset]
+        self.assertEqual(len(queries), 1)
+        return campaigns, queries[0]['sql']
+
+    def test_list_without_claims_is_one_exists_query(self):
+        campaigns, sql = self.visible_campaigns(self.manager)
+        self.assertEqual(campaigns, [self.assigned.id])
+        self.assertIn('EXISTS', sql)
+        self.assertIn(CampaignManagerAssignment._meta.db_table, sql)
+
+    def test_list_with_claims_reads_no_assignments(self):
+        campaigns, sql = self.visible_campaigns(self.claims_manager)
+        self.assertEqual(campaigns, [self.assigned.id])
+        self.assertNotIn(CampaignManagerAssignment._meta.db_table, sql)
+
+    def test_create_without_claims_is_one_query(self):
+        with self.assertNumQueries(1):
+            validate_campaign_manager_assignment(self.manager, SoulWinningCampaign, str(self.assigned.id))
+        with self.assertNumQueries(1), self.assertRaises(ValidationError):
+            validate_campaign_manager_assignment(self.manager, SoulWinningCampaign, str(self.other.id))
+
+    def test_create_with_claims_is_no_query(self):
+        with self.assertNumQueries(0):
+            validate_campaign_manager_assignment(self.claims_manager, SoulWinningCampaign, str(self.assigned.id))
+            with self.assertRaises(ValidationError):
+                validate_campaign_manager_assignment(self.claims_manager, SoulWinningCampaign, str(self.other.id))
+
+
+class SubmissionRollupTests(TestCase):
+    """The monthly rollups the signal handlers maintain match the submissions they summarise."""
+
+    def setUp(self):
+        self.service = Service.objects.create(name='Main Service')
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password', service=self.service)
+        self.campaign = SoulWinningCampaign.objects.create(name='Soul Winning')
+
+    def submit(self, service, souls, day=date(2025, 3, 10)):
+        return SoulWinningSubmission.objects.create(
+            campaign=self.campaign, service=service, submitted_by=self.pastor,
+            date=day, no_of_souls_won=souls,
+        )
+
+    def snapshot(self):
+        return sorted(
+            (row.submission_type_id, row.campaign_id, row.service_id, row.submitted_by_id, row.month,
+             row.submission_count, sorted(row.totals.items()))
+            for row in SubmissionMonthlyRollup.objects.all()
+        )
+
+    def test_maintained_rollups_match_a_rebuild(self):
+        other_service = Service.objects.create(name='Other Service')
+        other_campaign = SoulWinningCampaign.objects.create(name='Soul Winning 2')
+        moved = self.submit(self.service, 3)
+        self.submit(self.service, 5)
+        deleted = self.submit(self.service, 2, day=date(2025, 4, 2))
+        undated = self.submit(self.service, 1, day=None)
+
+        # Move across month, service and campaign
+        moved.date = date(2025, 5, 20)
+        moved.service = other_service
+        moved.campaign = other_campaign
+        moved.save()
+        undated.date = date(2025, 3, 1)
+        undated.save()
+        deleted.delete()
+
+        maintained = self.snapshot()
+        rebuild_rollups([SoulWinningSubmission])
+        self.assertEqual(maintained, self.snapshot())
+
+    def test_rollup_trends_match_the_submission_trends(self):
+        self.submit(self.service, 3, day=date(2024, 11, 5))
+        self.submit(self.service, 5)
+        self.submit(self.service, 2, day=date(2025, 4, 2))
+        self.submit(None, 7, day=date(2025, 4, 9))
+        scope = {'service': self.service}
+        end = date(2025, 6, 30)
+
+        self.assertEqual(
+            rollup_trend(SoulWinningSubmission, scope, {'souls_won': 'no_of_souls_won'}, months=6, end=end),
+            monthly_trend(
+                SoulWinningSubmission.objects.filter(**scope), 'date',
+                {'souls_won': Sum('no_of_souls_won')}, months=6, end=end
+            ),
+        )
+        self.assertEqual(
+            rollup_cumulative_trend(SoulWinningSubmission, scope, {'souls_won': 'no_of_souls_won'}, months=6, end=end),
+            cumulative_trend(
+                SoulWinningSubmission.objects.filter(**scope), 'date',
+                {'souls_won': 'no_of_souls_won'}, months=6, end=end
+            ),
+        )
+
+    def test_undated_submissions_count_when_they_were_created(self):
+        self.submit(self.service, 3, day=date(2025, 3, 10))
+        undated = self.submit(self.service, 4, day=None)
+        SoulWinningSubmission.objects.filter(pk=undated.pk).update(
+            created_at=timezone.make_aware(datetime(2025, 5, 2, 12))
+        )
+        rebuild_rollups([SoulWinningSubmission])
+        scope = {'service': self.service}
+        fields = {'souls_won': 'no_of_souls_won'}
+        end = date(2025, 6, 30)
+
+        trend = monthly_trend(
+            SoulWinningSubmission.objects.filter(**scope), 'date', {'souls_won': Sum('no_of_souls_won')}, months=4, end=end
+        )
+        self.assertEqual([item['souls_won'] for item in trend], [3, 0, 4, 0])
+        self.assertEqual(trend, rollup_trend(SoulWinningSubmission, scope, fields, months=4, end=end))
+
+        cumulative = cumulative_trend(SoulWinningSubmission.objects.filter(**scope), 'date', fields, months=4, end=end)
+        self.assertEqual([item['souls_won'] for item in cumulative], [3, 3, 7, 7])
+        self.assertEqual(cumulative, rollup_cumulative_trend(SoulWinningSubmission, scope, fields, months=4, end=end))
+
+    def test_rollup_cumulative_trend_runs_the_window_in_sql(self):
+        self.submit(self.service, 3, day=date(2024, 2, 5))
+        self.submit(self.service, 5)
+        self.submit(self.service, 2, day=date(2025, 4, 2))
+        args = (SoulWinningSubmission, {'service': self.service}, {'souls_won': 'no_of_souls_won'})
+        end = date(2025, 6, 30)
+
+        with CaptureQueriesContext(connection) as queries:
+            windowed = rollup_cumulative_trend(*args, months=4, end=end)
+        self.assertIn(' OVER ', queries[-1]['sql'])
+        with mock.patch.object(connection.features, 'supports_over_clause', False):
+            fallback = rollup_cumulative_trend(*args, months=4, end=end)
+
+        self.assertEqual(windowed, fallback)
+        self.assertEqual([item['souls_won'] for item in windowed], [8, 10, 10, 10])
+
+    def test_counseling_is_dated_by_submission_period_throughout(self):
+        campaign = IntimateCounselingCampaign.objects.create(name='Intimate Counseling')
+        for day, period, counseled in [(date(2025, 3, 20), date(2025, 2, 1), 4), (date(2025, 3, 2), date(2025, 3, 1), 6)]:
+            IntimateCounselingSubmission.objects.create(
+                campaign=campaign, service=self.service, submitted_by=self.pastor,
+                date=day, submission_period=period, total_number_of_members_counseled=counseled,
+            )
+        scope = {'service': self.service}
+        end = date(2025, 6, 30)
+
+        self.assertEqual(get_campaign_type(IntimateCounselingSubmission).date_field, 'submission_period')
+        self.assertIn(['service', 'submission_period'], [index.fields for index in IntimateCounselingSubmission._meta.indexes])
+        self.assertEqual(
+            sorted(SubmissionMonthlyRollup.objects.values_list('month', 'totals__total_number_of_members_counseled')),
+            [(date(2025, 2, 1), 4), (date(2025, 3, 1), 6)],
+        )
+        self.assertEqual(
+            rollup_trend(IntimateCounselingSubmission, scope, {'counseled': 'total_number_of_members_counseled'}, end=end),
+            monthly_trend(
+                IntimateCounselingSubmission.objects.filter(**scope), 'submission_period',
+                {'counseled': Sum('total_number_of_members_counseled')}, end=end
+            ),
+        )
+
+    def test_deleting_a_service_merges_its_buckets_into_the_no_service_bucket(self):
+        self.submit(self.service, 3)
+        self.submit(None, 4)
+
+        self.service.delete()
+
+        rollup = SubmissionMonthlyRollup.objects.get()
+        self.assertIsNone(rollup.service_id)
+        self.assertEqual(rollup.month, date(2025, 3, 1))
+        self.assertEqual(rollup.submission_count, 2)
+        self.assertEqual(rollup.totals['no_of_souls_won'], 7)
+
+
+class SubmissionActivityTests(TestCase):
+    """Every submission change appends one activity row with it; the backfill covers the rest once."""
+
+    def setUp(self):
+        self.service = Service.objects.create(name='Main Service')
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password', service=self.service)
+        self.campaign = SoulWinningCampaign.objects.create(name='Soul Winning')
+        self.client = APIClient()
+        self.client.force_authenticate(self.pastor)
+
+    def submit(self, souls=3):
+        return SoulWinningSubmission.objects.create(
+            campaign=self.campaign, service=self.service, submitted_by=self.pastor,
+            date=date(2025, 3, 10), no_of_souls_won=souls,
+        )
+
+    def actions(self):
+        return list(SubmissionActivity.objects.order_by('pk').values_list('action', 'submission_id'))
+
+    def test_each_change_records_one_activity(self):
+        submission = self.submit()
+        submission.no_of_souls_won = 5
+        submission.save()
+        submission_id = submission.pk
+        submission.delete()
+
+        Action = SubmissionActivity.Action
+        self.assertEqual(self.actions(), [
+            (Action.CREATED, submission_id), (Action.UPDATED, submission_id), (Action.DELETED, submission_id),
+        ])
+        latest = SubmissionActivity.objects.latest('pk')
+        self.assertEqual(
+            (latest.campaign_type, latest.campaign_name, latest.service_id, latest.submitted_by_id),
+            ('Soul Winning', 'Soul Winning', self.service.id, self.pastor.id),
+        )
+
+    def test_activity_is_rolled_back_with_the_change(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.submit()
+            self.assertEqual(len(self.actions()), 1)
+            raise RuntimeError
+        self.assertFalse(SoulWinningSubmission.objects.exists())
+        self.assertEqual(self.actions(), [])
+
+    def test_backfill_is_idempotent(self):
+        first, second = self.submit(), self.submit()
+        SubmissionActivity.objects.filter(submission_id=first.pk).delete()
+
+        self.assertEqual(backfill_activity([SoulWinningSubmission]), 1)
+        self.assertEqual(backfill_activity([SoulWinningSubmission]), 0)
+        backfilled = SubmissionActivity.objects.get(submission_id=first.pk)
+        self.assertEqual(backfilled.action, SubmissionActivity.Action.CREATED)
+        self.assertEqual(backfilled.created_at, first.created_at)
+        self.assertEqual(SubmissionActivity.objects.filter(submission_id=second.pk).count(), 1)
+
+    def test_feed_filters_by_action(self):
+        submission = self.submit()
+        submission.save()
+        self.submit().delete()
+
+        for action, count in [('created', 2), ('UPDATED', 1), ('deleted', 1), ('', 4)]:
+            with self.subTest(action=action):
+                response = self.client.get('/campaigns/activity/', {'action': action})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['count'], count)
+                if action:
+                    self.assertEqual({row['action'] for row in response.data['results']}, {action.upper()})
+
+
+class UnionCountTests(TestCase):
+    """The UNION ALL counts match counting each submission table on its own."""
+
+    def setUp(self):
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password')
+        days = [date(2025, 1, 31), date(2025, 2, 1), date(2025, 2, 28), date(2025, 4, 15), None]
+        for campaign_type in campaign_types():
+            campaign = campaign_type.campaign_model.objects.create(name=campaign_type.name)
+            values = required_values(campaign_type.submission_model)
+            for day in days[:campaign_type.index % len(days) + 1]:
+                campaign_type.submission_model.objects.create(
+                    campaign=campaign, submitted_by=self.pastor, **{**values, campaign_type.date_field: day}
+                )
+        self.parts = [
+            (campaign_type.index, campaign_type.submission_model.objects.all(), campaign_type.date_field)
+            for campaign_type in campaign_types()
+        ]
+
+    def test_count_by_key(self):
+        start, end = date(2025, 2, 1), date(2025, 4, 30)
+        with self.assertNumQueries(1):
+            counts = count_by_key(self.parts, start, end)
+        for key, queryset, date_field in self.parts:
+            expected = queryset.filter(**{f"{date_field}__range": (start, end)}).count()
+            self.assertEqual(counts.get(key, 0), expected)
+
+        # Unbounded counts include undated submissions
+        counts = count_by_key(self.parts)
+        self.assertEqual(counts, {key: queryset.count() for key, queryset, date_field in self.parts})
+
+    def test_count_by_month(self):
+        start, end = date(2025, 1, 1), date(2025, 12, 31)
+        with self.assertNumQueries(1):
+            counts = count_by_month(self.parts, start, end)
+
+        expected = {}
+        for key, queryset, date_field in self.parts:
+            for day in queryset.filter(**{f"{date_field}__range": (start, end)}).values_list(date_field, flat=True):
+                month = (key, day.replace(day=1))
+                expected[month] = expected.get(month, 0) + 1
+        self.assertEqual(counts, expected)
+
+    def test_no_parts(self):
+        self.assertEqual(count_by_key([]), {})
+        self.assertEqual(count_by_month([], None, None), {})
+
+
+class CompareTotalsTests(TestCase):
+    """compare_totals() agrees with aggregating each window on its own."""
+
+    def setUp(self):
+        self.service = Service.objects.create(name='Main Service')
+        self.other_service = Service.objects.create(name='Other Service')
+        self.pastor = CustomerUser.objects.create_user('pastor', 'pastor@example.com', 'password', service=self.service)
+        campaign = SoulWinningCampaign.objects.create(name='Soul Winning')
+        for day, service, souls, crusades in [
+            (date(2024, 3, 5), self.service, 4, 1),
+            (date(2025, 2, 10), self.service, 2, 0),
+            (date(2025, 3, 1), self.service, 3, 2),
+            (date(2025, 3, 20), self.other_service, 5, 1),
+            (date(2025, 3, 31), self.service, None, None),
+            (None, self.service, 7, 1),
+        ]:
+            SoulWinningSubmission.objects.create(
+                campaign=campaign, service=service, submitted_by=self.pastor,
+                date=day, no_of_souls_won=souls, no_of_crusades=crusades,
+            )
+        self.metrics = {
+            'souls_won': Sum('no_of_souls_won'),
+            'souls_at_crusades': Sum('no_of_souls_won', filter=Q(no_of_crusades__gt=0)),
+            'services': Count('service', distinct=True),
+            'crusades': Sum('no_of_crusades', default=0),
+        }
+
+    def separately(self, windows):
+        totals = {}
+        for window, bounds in windows.items():
+            queryset = SoulWinningSubmission.objects.all()
+            if bounds is not None:
+                queryset = queryset.filter(date__gte=bounds[0], date__lte=bounds[1])
+            row = queryset.aggregate(**self.metrics)
+            totals[window] = {key: value or 0 for key, value in row.items()}
+        return totals
+
+    def test_bounded_windows_match_separate_aggregates(self):
+        windows = {
+            'current': (date(2025, 3, 1), date(2025, 3, 31)),
+            'previous': (date(2025, 1, 29), date(2025, 2, 28)),
+            'year_over_year': (date(2024, 3, 1), date(2024, 3, 31)),
+        }
+        with CaptureQueriesContext(connection) as queries:
+            totals = compare_totals(SoulWinningSubmission.objects.all(), 'date', self.metrics, windows)
+        self.assertEqual(totals, self.separately(windows))
+        self.assertEqual(totals['current']['services'], 2)
+        self.assertEqual(totals['current']['souls_at_crusades'], 8)
+        # Rows outside every window are not read
+        self.assertEqual(len(queries), 1)
+        self.assertIn('WHERE', queries[0]['sql'])
+
+    def test_unbounded_window_matches_separate_aggregates(self):
+        windows = {'current': (date(2025, 3, 1), date(2025, 3, 31)), 'all_time': None}
+        totals = compare_totals(SoulWinningSubmission.objects.all(), 'date', self.metrics, windows)
+        self.assertEqual(totals, self.separately(windows))
+        self.assertEqual(totals['all_time']['souls_won'], 21)
+
+
+@override_settings(CAMPAIGN_CATALOG_LOCAL_TIMEOUT=60)
+class CampaignCatalogTests(TestCase):
+    """
+    Campaign names resolve through the catalog and are confirmed in the database;
+    without a shared cache, a process picks up campaign changes made elsewhere within the timeout.
+    """
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        self.campaign = SoulWinningCampaign.objects.create(name='Soul Winning')
+
+    def names(self):
+        return [entry['name'] for entry in get_catalog()]
+
+    def test_unshared_cache_copies_expire(self):
+        with mock.patch('campaigns.catalog.time.monotonic', return_value=1000):
+            self.assertEqual(self.names(), ['Soul Winning'])
+            # Changed by another process: its version bump never reaches this one
+            SoulWinningCampaign.objects.filter(pk=self.campaign.pk).update(name='Soul Winning 2026')
+            self.assertEqual(self.names(), ['Soul Winning'])
+
+        with mock.patch('campaigns.catalog.time.monotonic', return_value=1061):
+            self.assertEqual(self.names(), ['Soul Winning 2026'])
+
+    def test_names_resolve_case_insensitively(self):
+        flock = StateOfTheFlockCampaign.objects.create(name='State of the Flock')
+        content_type = ContentType.objects.get_for_model
+
+        self.assertEqual(resolve_campaign_names([' soul winning', 'STATE OF THE FLOCK', 'Missing']), {
+            ' soul winning': [(content_type(SoulWinningCampaign), self.campaign.id)],
+            'STATE OF THE FLOCK': [(content_type(StateOfTheFlockCampaign), flock.id)],
+        })
+        self.assertEqual(find_campaign('soul winning')['id'], self.campaign.id)
+
+        get_catalog()
+        # Confirmed in the campaign tables with one query
+        with self.assertNumQueries(1):
+            assignments = resolve_campaign_assignments([
+                {'campaign_name': 'Soul Winning'}, {'campaign_name': 'State of the Flock'},
+            ])
+        self.assertEqual(
+            [(assignment['content_type'], assignment['object_id']) for assignment in assignments],
+            [(content_type(SoulWinningCampaign), self.campaign.id), (content_type(StateOfTheFlockCampaign), flock.id)],
+        )
+
+    def test_shared_names_are_ambiguous(self):
+        StateOfTheFlockCampaign.objects.create(name='soul winning')
+
+        self.assertEqual(len(resolve_campaign_names(['Soul Winning'])['Soul Winning']), 2)
+        self.assertIsNone(find_campaign('Soul Winning'))
+        with self.assertRaisesMessage(ValidationError, "More than one campaign is named 'Soul Winning'"):
+            resolve_campaign_assignments([{'campaign_name': 'Soul Winning'}])
+
+    def test_stale_catalog_entries_are_not_assigned(self):
+        get_catalog()
+        # Renamed by another process: this process's catalog still has the old name
+        SoulWinningCampaign.objects.filter(pk=self.campaign.pk).update(name='Soul Winning 2026')
+        self.assertIn('Soul Winning', resolve_campaign_names(['Soul Winning']))
+
+        with self.assertRaisesMessage(ValidationError, "'Soul Winning' does not exist"):
+            resolve_campaign_assignments([{'campaign_name': 'Soul Winning'}])
@@ -0,0 +1,260 @@
+"""
+Monthly trend series for the analytics endpoints.
+
+Submissions are grouped by month in the database (TruncMonth + annotate) and the
+result is gap-filled in Python, so every series covers the same consecutive months
+regardless of how many submissions each month has. A submission whose date field
+is empty counts in the month it was created, as it does in the rollups.
+
+Cumulative series are running totals over the whole history, computed with a
+SUM() OVER (ORDER BY month) window function and then sliced to the requested months.
+
+Series that only sum numeric fields can instead be read from the monthly rollups
+(rollup_trend() and rollup_cumulative_trend()), which hold one row per campaign,
+service, submitter and month rather than one per submission. Rollups bucket a
+submission by the date_field of its campaign type (campaigns.registry).
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, models
+from django.db.models import F, Sum, Window
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast, TruncMonth
+from django.utils import timezone
+
+from .rollups import month_start, next_month, reported_between, reported_date
+
+
+def local_date(value=None):
+    """The local date of a date or datetime `value` (default today)."""
+    if value is None:
+        return timezone.localdate()
+    if hasattr(value, 'tzinfo'):
+        return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return value
+
+
+def trend_months(months=12, end=None):
+    """First day of each of the `months` months ending with the month of `end` (default today), oldest first."""
+    current = month_start(local_date(end))
+    result = [current]
+    for _ in range(months - 1):
+        current = month_start(current - timedelta(days=1))
+        result.append(current)
+    result.reverse()
+    return result
+
+
+def _clean(value):
+    if value is None:
+        return 0
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def monthly_trend(queryset, date_field, metrics, months=12, end=None, carry_forward=()):
+    """
+    Aggregate `queryset` per month over the last `months` months with one query.
+
+    `metrics` maps output keys to aggregate expressions, e.g.
+    {"souls_won": Sum('no_of_souls_won')}. Months without submissions are filled
+    with 0, except for keys listed in `carry_forward` (snapshot values such as a
+    membership count) which repeat the previous month's value.
+
+    Returns a list of {"period": "YYYY-MM", "label": "Mon YYYY", <metric>: value}
+    in chronological order.
+    """
+    buckets = trend_months(months, end)
+
+    rows = (
+        queryset
+        .filter(reported_between(date_field, buckets[0], next_month(buckets[-1])))
+        .annotate(trend_month=TruncMonth(reported_date(date_field), output_field=models.DateField()))
+        .values('trend_month')
+        .annotate(**metrics)
+        .order_by('trend_month')
+    )
+    by_month = {row['trend_month']: row for row in rows}
+    return fill_months(by_month, metrics, buckets, carry_forward)
+
+
+def fill_months(by_month, keys, buckets, carry_forward=()):
+    """
+    Turn {month: {key: value}} into a trend over `buckets` (see trend_months()).
+    Missing values are 0, or the previous month's value for keys in `carry_forward`.
+    """
+    trend = []
+    previous = {}
+    for month in buckets:
+        row = by_month.get(month)
+        item = {
+            "period": month.strftime("%Y-%m"),
+            "label": month.strftime("%b %Y"),
+        }
+        for key in keys:
+            if row is not None and row.get(key) is not None:
+                item[key] = _clean(row[key])
+            elif key in carry_forward:
+                item[key] = previous.get(key, 0)
+            else:
+                item[key] = 0
+        previous = item
+        trend.append(item)
+
+    return trend
+
+
+def _running_totals(queryset, date_field, fields):
+    """
+    {month: {key: running total up to the end of that month}} for every month with
+    submissions. Each row gets the total of all rows up to and including its month
+    (the default RANGE frame), so DISTINCT leaves one row per month. SUM() skips
+    NULL values, so `fields` may map keys to field names or numeric expressions.
+    """
+    month = TruncMonth(date_field, output_field=models.DateField())
+    # Prefixed so output keys can match field names
+    aliases = {key: f"running_{key}" for key in fields}
+
+    if connection.features.supports_over_clause:
+        rows = (
+            queryset
+            .annotate(**{
+                aliases[key]: Window(Sum(field), order_by=month.asc())
+                for key, field in fields.items()
+            })
+            .annotate(trend_month=month)
+            .values('trend_month', *aliases.values())
+            .distinct()
+            .order_by('trend_month')
+        )
+        return {
+            row['trend_month']: {key: row[alias] for key, alias in aliases.items()}
+            for row in rows
+        }
+
+    # Databases without window functions: running sum over the monthly totals
+    rows = (
+        queryset
+        .annotate(trend_month=month)
+        .values('trend_month')
+        .annotate(**{aliases[key]: Sum(field) for key, field in fields.items()})
+        .order_by('trend_month')
+    )
+    totals = {key: 0 for key in fields}
+    result = {}
+    for row in rows:
+        for key, alias in aliases.items():
+            totals[key] += row[alias] or 0
+        result[row['trend_month']] = dict(totals)
+    return result
+
+
+def cumulative_trend(queryset, date_field, fields, months=12, end=None):
+    """
+    Running totals of numeric fields per month over the last `months` months, with one query.
+
+    `fields` maps output keys to model fields, e.g. {"cumulative": 'no_of_souls_won'},
+    or to numeric expressions.
+    Totals include every submission since the first one, not only those in the window.
+
+    Returns a list of {"period": "YYYY-MM", "label": "Mon YYYY", <key>: value}
+    in chronological order.
+    """
+    return _cumulative(queryset, reported_date(date_field), fields, months, end)
+
+
+def _cumulative(queryset, date, fields, months, end):
+    """cumulative_trend() with rows dated by the expression `date`."""
+    buckets = trend_months(months, end)
+    running = _running_totals(
+        queryset.annotate(trend_date=date).filter(trend_date__isnull=False, trend_date__lt=next_month(buckets[-1])),
+        'trend_date',
+        fields
+    )
+
+    history = iter(sorted(running))
+    pending = next(history, None)
+    current = {key: 0 for key in fields}
+
+    trend = []
+    for month in buckets:
+        # Carry the total of the latest month with submissions up to this one
+        while pending is not None and pending <= month:
+            current = {key: _clean(running[pending][key]) for key in fields}
+            pending = next(history, None)
+        trend.append({
+            "period": month.strftime("%Y-%m"),
+            "label": month.strftime("%b %Y"),
+            **current
+        })
+
+    return trend
+
+
+def _rollups(model, scope):
+    from .models import SubmissionMonthlyRollup
+    return SubmissionMonthlyRollup.objects.filter(
+        submission_type=ContentType.objects.get_for_model(model), **scope
+    )
+
+
+def _sum_rollups(rows, fields):
+    """{month: {key: sum}} from (month, totals) rollup rows."""
+    by_month = {}
+    for month, totals in rows:
+        sums = by_month.setdefault(month, dict.fromkeys(fields, 0))
+        for key, name in fields.items():
+            sums[key] += totals.get(name, 0)
+    return by_month
+
+
+def rollup_trend(model, scope, fields, months=12, end=None):
+    """
+    Like monthly_trend() with Sum metrics, read from the monthly rollups of
+    submission `model`. `scope` filters the rollups (e.g. {'service': service}) and
+    `fields` maps output keys to submission fields, e.g. {"souls_won": 'no_of_souls_won'}.
+    """
+    buckets = trend_months(months, end)
+    rows = (
+        _rollups(model, scope)
+        .filter(month__gte=buckets[0], month__lte=buckets[-1])
+        .values_list('month', 'totals')
+    )
+    return fill_months(_sum_rollups(rows, fields), fields, buckets)
+
+
+def _rollup_total(model, name):
+    """A rollup row's total of submission field `name`, read from its JSON totals."""
+    if isinstance(model._meta.get_field(name), models.IntegerField):
+        output_field = models.IntegerField()
+    else:
+        output_field = models.FloatField()
+    return Cast(KeyTextTransform(name, 'totals'), output_field)
+
+
+def rollup_cumulative_trend(model, scope, fields, months=12, end=None):
+    """
+    Like cumulative_trend(), with the same window function run over the monthly
+    rollups of submission `model` instead of its submissions.
+    """
+    return _cumulative(
+        _rollups(model, scope),
+        F('month'),
+        {key: _rollup_total(model, name) for key, name in fields.items()},
+        months,
+        end
+    )
+
+
+def merge_trends(*trends):
+    """Combine trends built over the same months into one series."""
+    merged = []
+    for items in zip(*trends):
+        combined = {}
+        for item in items:
+            combined.update(item)
+        merged.append(combined)
+    return merged
@@ -0,0 +1,111 @@
+"""
+Aggregates across submission tables in a single UNION ALL query.
+
+Every campaign type stores its submissions (and its campaigns) in its own table,
+so "all submissions" used to mean one query per model. These helpers group each
+table in its own SELECT and combine the SELECTs with UNION ALL, so the database
+returns the rows for every model in one round trip.
+
+Parts are (key, queryset, date_field) tuples: `key` is an integer identifying the
+part in the results, `queryset` the rows to include and `date_field` the field the
+part is dated by ('date', 'submission_period' or 'created_at'). rows() takes
+(key, queryset) pairs.
+"""
+from datetime import datetime
+
+from django.db import models
+from django.db.models import Count, Value
+from django.db.models.functions import TruncMonth
+
+
+def union_all(querysets):
+    """Combine querysets with UNION ALL. Returns None when there are none."""
+    querysets = list(querysets)
+    if not querysets:
+        return None
+    return querysets[0].union(*querysets[1:], all=True)
+
+
+def _date_bounds(date_field, start, end):
+    """Filter kwargs limiting `date_field` to [start, end]."""
+    if date_field != 'created_at':
+        # Date fields are compared by day
+        start = start.date() if isinstance(start, datetime) else start
+        end = end.date() if isinstance(end, datetime) else end
+
+    bounds = {}
+    if start is not None:
+        bounds[f"{date_field}__gte"] = start
+    if end is not None:
+        bounds[f"{date_field}__lte"] = end
+    return bounds
+
+
+def count_by_key(parts, start=None, end=None):
+    """Number of submissions in each part dated within [start, end]: {key: count}."""
+    combined = union_all(
+        queryset
+        .filter(**_date_bounds(date_field, start, end))
+        .annotate(union_key=Value(key, output_field=models.IntegerField()))
+        .values('union_key')
+        .annotate(union_count=Count('pk'))
+        .order_by()
+        for key, queryset, date_field in parts
+    )
+    if combined is None:
+        return {}
+    return {row['union_key']: row['union_count'] for row in combined}
+
+
+def count_by_month(parts, start, end):
+    """
+    Number of submissions in each part per month, for submissions dated within
+    [start, end]: {(key, first day of month): count}.
+    """
+    combined = union_all(
+        queryset
+        .filter(**_date_bounds(date_field, start, end))
+        .annotate(
+            union_key=Value(key, output_field=models.IntegerField()),
+            union_month=TruncMonth(date_field, output_field=models.DateField()),
+        )
+        .values('union_key', 'union_month')
+        .annotate(union_count=Count('pk'))
+        .order_by()
+        for key, queryset, date_field in parts
+    )
+    if combined is None:
+        return {}
+    return {(row['union_key'], row['union_month']): row['union_count'] for row in combined}
+
+
+def latest(parts, fields, limit=10):
+    """
+    The `limit` most recently created submissions across every part, newest first.
+    Each row has `fields` (which every part's model must have) plus 'union_key'.
+    """
+    combined = union_all(
+        queryset
+        .annotate(union_key=Value(key, output_field=models.IntegerField()))
+        .values('union_key', 'created_at', *fields)
+        .order_by()
+        for key, queryset, date_field in parts
+    )
+    if combined is None:
+        return []
+    return list(combined.order_by('-created_at')[:limit])
+
+
+def rows(parts, fields):
+    """
+    A lazy UNION ALL of `fields` (plus 'union_key') from every part's queryset, for
+    the caller to order, count and slice in the database. Returns None when there
+    are no parts.
+    """
+    return union_all(
+        queryset
+        .annotate(union_key=Value(key, output_field=models.IntegerField()))
+        .values('union_key', *fields)
+        .order_by()
+        for key, queryset in parts
+    )
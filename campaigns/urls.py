@@ -2,6 +2,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     AllCampaignsListView,
+    SubmissionActivityViewSet,
     StateOfTheFlockSubmissionViewSet,
     SoulWinningSubmissionViewSet,
     ServantsArmedTrainedSubmissionViewSet,
@@ -50,6 +51,9 @@ router.register(r'swollen-sunday/submissions', SwollenSundaySubmissionViewSet, b
 router.register(r'sunday-management/submissions', SundayManagementSubmissionViewSet, basename='sunday-management-submission')
 router.register(r'equipment/submissions', EquipmentSubmissionViewSet, basename='equipment-submission')
 
+# Activity feed across every submission type
+router.register(r'activity', SubmissionActivityViewSet, basename='submission-activity')
+
 urlpatterns = [
     path('all/', AllCampaignsListView.as_view(), name='all-campaigns-list'),
     path('', include(router.urls)),
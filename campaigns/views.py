@@ -1,11 +1,14 @@
-from rest_framework import viewsets, permissions, status, parsers, serializers
-from rest_framework.response import Response
+from rest_framework import viewsets, permissions, parsers, serializers
 from rest_framework.decorators import action
 from rest_framework.views import APIView
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.utils.dateparse import parse_date
 
-from helpers.pagination import DefaultPagination
+from helpers.pagination import DefaultPagination, SubmissionPagination
+from helpers.querysets import OptimizedQuerysetMixin
+from .catalog import CATALOG_FIELDS
+from .registry import campaign_types, get_campaign_type
+from .unions import rows
 from .models import (
     StateOfTheFlockCampaign, StateOfTheFlockSubmission,
     SoulWinningCampaign, SoulWinningSubmission,
@@ -28,29 +31,31 @@ from .models import (
     SwollenSundayCampaign, SwollenSundaySubmission,
     SundayManagementCampaign, SundayManagementSubmission,
     EquipmentCampaign, EquipmentSubmission,
+    SubmissionActivity,
 )
 from .serializers import (
-    StateOfTheFlockCampaignSerializer, StateOfTheFlockSubmissionSerializer,
-    SoulWinningCampaignSerializer, SoulWinningSubmissionSerializer,
-    ServantsArmedTrainedCampaignSerializer, ServantsArmedTrainedSubmissionSerializer,
-    AntibrutishCampaignSerializer, AntibrutishSubmissionSerializer,
-    HearingSeeingCampaignSerializer, HearingSeeingSubmissionSerializer,
-    HonourYourProphetCampaignSerializer, HonourYourProphetSubmissionSerializer,
-    BasontaProliferationCampaignSerializer, BasontaProliferationSubmissionSerializer,
-    IntimateCounselingCampaignSerializer, IntimateCounselingSubmissionSerializer,
-    TechnologyCampaignSerializer, TechnologySubmissionSerializer,
-    SheperdingControlCampaignSerializer, SheperdingControlSubmissionSerializer,
-    MultiplicationCampaignSerializer, MultiplicationSubmissionSerializer,
-    UnderstandingCampaignSerializer, UnderstandingSubmissionSerializer,
-    SheepSeekingCampaignSerializer, SheepSeekingSubmissionSerializer,
-    TestimonyCampaignSerializer, TestimonySubmissionSerializer,
-    TelepastoringCampaignSerializer, TelepastoringSubmissionSerializer,
-    GatheringBusCampaignSerializer, GatheringBusSubmissionSerializer,
-    OrganisedCreativeArtsCampaignSerializer, OrganisedCreativeArtsSubmissionSerializer,
-    TangerineCampaignSerializer, TangerineSubmissionSerializer,
-    SwollenSundayCampaignSerializer, SwollenSundaySubmissionSerializer,
-    SundayManagementCampaignSerializer, SundayManagementSubmissionSerializer,
-    EquipmentCampaignSerializer, EquipmentSubmissionSerializer,
+    StateOfTheFlockSubmissionSerializer,
+    SoulWinningSubmissionSerializer,
+    ServantsArmedTrainedSubmissionSerializer,
+    AntibrutishSubmissionSerializer,
+    HearingSeeingSubmissionSerializer,
+    HonourYourProphetSubmissionSerializer,
+    BasontaProliferationSubmissionSerializer,
+    IntimateCounselingSubmissionSerializer,
+    TechnologySubmissionSerializer,
+    SheperdingControlSubmissionSerializer,
+    MultiplicationSubmissionSerializer,
+    UnderstandingSubmissionSerializer,
+    SheepSeekingSubmissionSerializer,
+    TestimonySubmissionSerializer,
+    TelepastoringSubmissionSerializer,
+    GatheringBusSubmissionSerializer,
+    OrganisedCreativeArtsSubmissionSerializer,
+    TangerineSubmissionSerializer,
+    SwollenSundaySubmissionSerializer,
+    SundayManagementSubmissionSerializer,
+    EquipmentSubmissionSerializer,
+    SubmissionActivitySerializer,
 )
 
 
@@ -60,125 +65,147 @@ class AllCampaignsListView(APIView):
     
     For Campaign Managers: Only returns campaigns assigned to them.
     For other roles: Returns all campaigns.
+    
+    Every campaign table is read in one UNION ALL query, filtered, sorted and
+    paginated by the database.
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DefaultPagination
     
     def get(self, request):
         """
-        List campaigns based on user role:
+        List campaigns based on user role, newest first:
         - Campaign Managers: Only assigned campaigns
         - Other roles: All campaigns
+        
+        Query Parameters:
+        - status: filter by campaign status (optional)
+        - type: comma separated campaign types, e.g. Soul Winning,Testimony (optional)
+        - page / page_size: pagination
         """
+        from campaigns.models import CampaignManagerAssignment
+        
         user = request.user
-        campaigns = []
+        types = campaign_types()
         
-        # Define all campaign models and their serializers
-        campaign_types = [
-            (StateOfTheFlockCampaign, StateOfTheFlockCampaignSerializer),
-            (SoulWinningCampaign, SoulWinningCampaignSerializer),
-            (ServantsArmedTrainedCampaign, ServantsArmedTrainedCampaignSerializer),
-            (AntibrutishCampaign, AntibrutishCampaignSerializer),
-            (HearingSeeingCampaign, HearingSeeingCampaignSerializer),
-            (HonourYourProphetCampaign, HonourYourProphetCampaignSerializer),
-            (BasontaProliferationCampaign, BasontaProliferationCampaignSerializer),
-            (IntimateCounselingCampaign, IntimateCounselingCampaignSerializer),
-            (TechnologyCampaign, TechnologyCampaignSerializer),
-            (SheperdingControlCampaign, SheperdingControlCampaignSerializer),
-            (MultiplicationCampaign, MultiplicationCampaignSerializer),
-            (UnderstandingCampaign, UnderstandingCampaignSerializer),
-            (SheepSeekingCampaign, SheepSeekingCampaignSerializer),
-            (TestimonyCampaign, TestimonyCampaignSerializer),
-            (TelepastoringCampaign, TelepastoringCampaignSerializer),
-            (GatheringBusCampaign, GatheringBusCampaignSerializer),
-            (OrganisedCreativeArtsCampaign, OrganisedCreativeArtsCampaignSerializer),
-            (TangerineCampaign, TangerineCampaignSerializer),
-            (SwollenSundayCampaign, SwollenSundayCampaignSerializer),
-            (SundayManagementCampaign, SundayManagementCampaignSerializer),
-            (EquipmentCampaign, EquipmentCampaignSerializer),
-        ]
+        # Campaign type filter, by display name (e.g. "Soul Winning")
+        type_filter = request.query_params.get('type')
+        if type_filter:
+            requested = {name.strip().lower() for name in type_filter.split(',') if name.strip()}
+            types = [campaign_type for campaign_type in types if campaign_type.name.lower() in requested]
         
         # Get active campaigns filter from query params
         status_filter = request.query_params.get('status', None)
         
-        # If user is a Campaign Manager, get their assigned campaigns
-        assigned_campaign_ids = {}
-        if user.is_campaign_manager:
-            from campaigns.models import CampaignManagerAssignment
-            from django.contrib.contenttypes.models import ContentType
-            
-            assignments = CampaignManagerAssignment.objects.filter(
-                user=user
-            ).select_related('content_type')
-            
-            # Build a map of content_type_id -> list of campaign IDs
-            for assignment in assignments:
-                ct_id = assignment.content_type.id
-                if ct_id not in assigned_campaign_ids:
-                    assigned_campaign_ids[ct_id] = []
-                assigned_campaign_ids[ct_id].append(assignment.object_id)
-        
-        for model, serializer_class in campaign_types:
-            # Get content type for this campaign model
-            from django.contrib.contenttypes.models import ContentType
-            ct = ContentType.objects.get_for_model(model)
+        parts = []
+        for campaign_type in types:
+            queryset = campaign_type.campaign_model.objects.all()
             
             # If Campaign Manager, filter to only assigned campaigns
             if user.is_campaign_manager:
-                if ct.id in assigned_campaign_ids:
-                    # Only get campaigns that are assigned to this manager
-                    campaign_ids = assigned_campaign_ids[ct.id]
-                    queryset = model.objects.filter(id__in=campaign_ids)
-                else:
-                    # This campaign type has no assignments, skip it
+                campaign_ids = claimed_campaign_ids(user, campaign_type.campaign_model)
+                if campaign_ids is None:
+                    campaign_ids = CampaignManagerAssignment.objects.for_campaign_model(
+                        user, campaign_type.campaign_model
+                    ).values('object_id')
+                elif not campaign_ids:
                     continue
-            else:
-                # For other roles, get all campaigns
-                queryset = model.objects.all()
+                queryset = queryset.filter(id__in=campaign_ids)
             
             # Apply status filter if provided
             if status_filter:
                 queryset = queryset.filter(status=status_filter)
             
-            serializer = serializer_class(queryset, many=True, context={'request': request})
-            campaigns.extend(serializer.data)
+            parts.append((campaign_type.index, queryset))
         
-        # Sort by created_at descending
-        campaigns.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        # Newest first; the type and id break ties so pages are stable
+        catalog = rows(parts, CATALOG_FIELDS)
+        catalog = catalog.order_by('-created_at', 'union_key', '-id') if catalog is not None else []
         
-        return Response({
-            'count': len(campaigns),
-            'results': campaigns
-        }, status=status.HTTP_200_OK)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(catalog, request, view=self)
+        
+        campaigns = []
+        for row in page:
+            campaign_type = campaign_types()[row['union_key']]
+            campaign = campaign_type.campaign_model(**{field: row[field] for field in CATALOG_FIELDS})
+            campaigns.append(campaign_type.campaign_serializer(campaign, context={'request': request}).data)
+        return paginator.get_paginated_response(campaigns)
+
+
+class SubmissionActivityViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    The submission activity feed, newest first.
+    
+    Query Parameters:
+    - scope: 'mine' (default) for the user's own submissions, or 'service' for every
+      submission made for the user's service
+    - service / user: filter by service or submitter id (admins only; default: everything)
+    - action: CREATED, UPDATED or DELETED (optional)
+    - campaign_type: e.g. Soul Winning (optional)
+    """
+    serializer_class = SubmissionActivitySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = DefaultPagination
+    
+    def get_queryset(self):
+        user = self.request.user
+        params = self.request.query_params
+        queryset = SubmissionActivity.objects.select_related('service')
+        
+        if user.role == user.Role.ADMIN:
+            if params.get('service'):
+                queryset = queryset.filter(service_id=params['service'])
+            if params.get('user'):
+                queryset = queryset.filter(submitted_by_id=params['user'])
+        elif params.get('scope') == 'service':
+            if not user.service_id:
+                return queryset.none()
+            queryset = queryset.filter(service_id=user.service_id)
+        else:
+            queryset = queryset.filter(submitted_by=user)
+        
+        if params.get('action'):
+            queryset = queryset.filter(action=params['action'].upper())
+        if params.get('campaign_type'):
+            queryset = queryset.filter(campaign_type=params['campaign_type'])
+        
+        return queryset
 
 
 # ============= Submission ViewSets =============
 
+def claimed_campaign_ids(user, campaign_model):
+    """
+    Ids of the `campaign_model` campaigns a Campaign Manager authenticated from token
+    claims is assigned to (see authentication/tokens.py), or None for any other user.
+    """
+    token_assignments = getattr(user, 'token_assignments', None)
+    if token_assignments is None:
+        return None
+    content_type_id = get_campaign_type(campaign_model).campaign_content_type.id
+    return {object_id for ct_id, object_id in token_assignments if ct_id == content_type_id}
+
+
 def filter_queryset_for_campaign_manager(queryset, user, campaign_model):
     """
     Helper function to filter queryset for Campaign Managers.
-    Only returns submissions for campaigns assigned to the manager.
+    Only returns submissions for campaigns assigned to the manager: the ones in their
+    token claims, or else checked with a correlated EXISTS against the assignments in
+    the same query.
     """
     if user.is_campaign_manager:
         from campaigns.models import CampaignManagerAssignment
-        from django.contrib.contenttypes.models import ContentType
-        
-        # Get content type for this campaign model
-        ct = ContentType.objects.get_for_model(campaign_model)
         
-        # Get assigned campaign IDs for this content type
-        assignments = CampaignManagerAssignment.objects.filter(
-            user=user,
-            content_type=ct
-        )
+        campaign_ids = claimed_campaign_ids(user, campaign_model)
+        if campaign_ids is not None:
+            return queryset.filter(campaign_id__in=campaign_ids)
         
-        assigned_campaign_ids = [assignment.object_id for assignment in assignments]
-        
-        # Filter to only assigned campaigns
-        if assigned_campaign_ids:
-            queryset = queryset.filter(campaign_id__in=assigned_campaign_ids)
-        else:
-            # No assigned campaigns of this type, return empty queryset
-            queryset = queryset.none()
+        queryset = queryset.filter(Exists(
+            CampaignManagerAssignment.objects
+            .for_campaign_model(user, campaign_model)
+            .filter(object_id=OuterRef('campaign_id'))
+        ))
     
     return queryset
 
@@ -188,82 +215,23 @@ def validate_campaign_manager_assignment(user, campaign_model, campaign_id):
     Helper function to validate that a Campaign Manager is assigned to a campaign.
     Raises ValidationError if not assigned.
     """
-    print("\n" + "="*80)
-    print("🔍 DEBUG: validate_campaign_manager_assignment")
-    print("="*80)
-    print(f"User ID: {user.id}")
-    print(f"User Name: {user.full_name}")
-    print(f"User Email: {user.email}")
-    print(f"User Role: {user.role}")
-    print(f"Is Campaign Manager: {user.is_campaign_manager}")
-    print(f"Campaign Model: {campaign_model}")
-    print(f"Campaign Model Name: {campaign_model.__name__}")
-    print(f"Campaign ID (raw): {repr(campaign_id)}")
-    print(f"Campaign ID Type: {type(campaign_id).__name__}")
-    
     if user.is_campaign_manager:
         from campaigns.models import CampaignManagerAssignment
-        from django.contrib.contenttypes.models import ContentType
-        ct = ContentType.objects.get_for_model(campaign_model)
-        
-        print(f"Content Type: {ct}")
-        print(f"Content Type ID: {ct.id}")
-        print(f"Content Type Model: {ct.model}")
-        print(f"Content Type App Label: {ct.app_label}")
         
         # Convert campaign_id to integer (it comes as string from request)
         try:
-            campaign_id_int = int(campaign_id)
-            print(f"Campaign ID (converted to int): {campaign_id_int}")
-        except (ValueError, TypeError) as e:
-            print(f"❌ ERROR converting campaign_id: {e}")
+            campaign_id = int(campaign_id)
+        except (ValueError, TypeError):
             raise serializers.ValidationError({"campaign": "Invalid campaign id format."})
         
-        # Check all assignments for this user
-        all_assignments = CampaignManagerAssignment.objects.filter(user=user)
-        print(f"\n📋 All assignments for user {user.id}:")
-        for assignment in all_assignments:
-            print(f"  - Content Type: {assignment.content_type.model} (ID: {assignment.content_type.id})")
-            print(f"    Object ID: {assignment.object_id} (type: {type(assignment.object_id).__name__})")
-            print(f"    Campaign: {assignment.campaign}")
-        
-        # Check the specific query
-        query_result = CampaignManagerAssignment.objects.filter(
-            user=user,
-            content_type=ct,
-            object_id=campaign_id_int
-        )
-        print(f"\n🔎 Query Details:")
-        print(f"  - Filter: user={user.id}, content_type={ct.id}, object_id={campaign_id_int}")
-        print(f"  - Query exists(): {query_result.exists()}")
-        print(f"  - Query count(): {query_result.count()}")
-        
-        if query_result.exists():
-            print(f"  ✅ ASSIGNMENT FOUND!")
-            for assignment in query_result:
-                print(f"     Assignment ID: {assignment.id}")
-                print(f"     Created: {assignment.created_at}")
+        campaign_ids = claimed_campaign_ids(user, campaign_model)
+        if campaign_ids is not None:
+            assigned = campaign_id in campaign_ids
         else:
-            print(f"  ❌ NO ASSIGNMENT FOUND!")
-            print(f"\n🔍 Checking if it's a type mismatch...")
-            # Try with string
-            query_str = CampaignManagerAssignment.objects.filter(
-                user=user,
-                content_type=ct,
-                object_id=str(campaign_id_int)
-            )
-            print(f"  - Query with STRING object_id: {query_str.exists()}")
-            # Try with original value
-            query_orig = CampaignManagerAssignment.objects.filter(
-                user=user,
-                content_type=ct,
+            assigned = CampaignManagerAssignment.objects.for_campaign_model(user, campaign_model).filter(
                 object_id=campaign_id
-            )
-            print(f"  - Query with ORIGINAL campaign_id: {query_orig.exists()}")
-        
-        print("="*80 + "\n")
-        
-        if not query_result.exists():
+            ).exists()
+        if not assigned:
             raise serializers.ValidationError({"campaign": "You are not assigned to this campaign."})
 
 
@@ -287,11 +255,11 @@ def get_service_for_submission(user, request_data):
         return getattr(user, 'service', None)
 
 
-class StateOfTheFlockSubmissionViewSet(viewsets.ModelViewSet):
+class StateOfTheFlockSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = StateOfTheFlockSubmission.objects.all()
     serializer_class = StateOfTheFlockSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -338,11 +306,11 @@ class StateOfTheFlockSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class SoulWinningSubmissionViewSet(viewsets.ModelViewSet):
+class SoulWinningSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = SoulWinningSubmission.objects.all()
     serializer_class = SoulWinningSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -390,11 +358,11 @@ class SoulWinningSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class ServantsArmedTrainedSubmissionViewSet(viewsets.ModelViewSet):
+class ServantsArmedTrainedSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = ServantsArmedTrainedSubmission.objects.all()
     serializer_class = ServantsArmedTrainedSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -442,11 +410,11 @@ class ServantsArmedTrainedSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class AntibrutishSubmissionViewSet(viewsets.ModelViewSet):
+class AntibrutishSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = AntibrutishSubmission.objects.all()
     serializer_class = AntibrutishSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -494,11 +462,11 @@ class AntibrutishSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class HearingSeeingSubmissionViewSet(viewsets.ModelViewSet):
+class HearingSeeingSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = HearingSeeingSubmission.objects.all()
     serializer_class = HearingSeeingSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -545,11 +513,11 @@ class HearingSeeingSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class HonourYourProphetSubmissionViewSet(viewsets.ModelViewSet):
+class HonourYourProphetSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = HonourYourProphetSubmission.objects.all()
     serializer_class = HonourYourProphetSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -597,11 +565,11 @@ class HonourYourProphetSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class BasontaProliferationSubmissionViewSet(viewsets.ModelViewSet):
+class BasontaProliferationSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = BasontaProliferationSubmission.objects.all()
     serializer_class = BasontaProliferationSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -649,11 +617,11 @@ class BasontaProliferationSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class IntimateCounselingSubmissionViewSet(viewsets.ModelViewSet):
+class IntimateCounselingSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = IntimateCounselingSubmission.objects.all()
     serializer_class = IntimateCounselingSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -700,11 +668,11 @@ class IntimateCounselingSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class TechnologySubmissionViewSet(viewsets.ModelViewSet):
+class TechnologySubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = TechnologySubmission.objects.all()
     serializer_class = TechnologySubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -752,11 +720,11 @@ class TechnologySubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class SheperdingControlSubmissionViewSet(viewsets.ModelViewSet):
+class SheperdingControlSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = SheperdingControlSubmission.objects.all()
     serializer_class = SheperdingControlSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -803,11 +771,11 @@ class SheperdingControlSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class MultiplicationSubmissionViewSet(viewsets.ModelViewSet):
+class MultiplicationSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = MultiplicationSubmission.objects.all()
     serializer_class = MultiplicationSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -855,11 +823,11 @@ class MultiplicationSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class UnderstandingSubmissionViewSet(viewsets.ModelViewSet):
+class UnderstandingSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = UnderstandingSubmission.objects.all()
     serializer_class = UnderstandingSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -907,11 +875,11 @@ class UnderstandingSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class SheepSeekingSubmissionViewSet(viewsets.ModelViewSet):
+class SheepSeekingSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = SheepSeekingSubmission.objects.all()
     serializer_class = SheepSeekingSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -959,11 +927,11 @@ class SheepSeekingSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class TestimonySubmissionViewSet(viewsets.ModelViewSet):
+class TestimonySubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = TestimonySubmission.objects.all()
     serializer_class = TestimonySubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -1041,11 +1009,11 @@ class TestimonySubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class TelepastoringSubmissionViewSet(viewsets.ModelViewSet):
+class TelepastoringSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = TelepastoringSubmission.objects.all()
     serializer_class = TelepastoringSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -1093,11 +1061,11 @@ class TelepastoringSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class GatheringBusSubmissionViewSet(viewsets.ModelViewSet):
+class GatheringBusSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = GatheringBusSubmission.objects.all()
     serializer_class = GatheringBusSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -1145,11 +1113,11 @@ class GatheringBusSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class OrganisedCreativeArtsSubmissionViewSet(viewsets.ModelViewSet):
+class OrganisedCreativeArtsSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = OrganisedCreativeArtsSubmission.objects.all()
     serializer_class = OrganisedCreativeArtsSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -1196,11 +1164,11 @@ class OrganisedCreativeArtsSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class TangerineSubmissionViewSet(viewsets.ModelViewSet):
+class TangerineSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = TangerineSubmission.objects.all()
     serializer_class = TangerineSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -1247,11 +1215,11 @@ class TangerineSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class SwollenSundaySubmissionViewSet(viewsets.ModelViewSet):
+class SwollenSundaySubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = SwollenSundaySubmission.objects.all()
     serializer_class = SwollenSundaySubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -1299,11 +1267,11 @@ class SwollenSundaySubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class SundayManagementSubmissionViewSet(viewsets.ModelViewSet):
+class SundayManagementSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = SundayManagementSubmission.objects.all()
     serializer_class = SundayManagementSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
@@ -1351,11 +1319,11 @@ class SundayManagementSubmissionViewSet(viewsets.ModelViewSet):
         serializer.save(submitted_by=self.request.user, service=service, campaign=campaign)
 
 
-class EquipmentSubmissionViewSet(viewsets.ModelViewSet):
+class EquipmentSubmissionViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = EquipmentSubmission.objects.all()
     serializer_class = EquipmentSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = DefaultPagination
+    pagination_class = SubmissionPagination
     parser_classes = [parsers.MultiPartParser, parsers.FormParser, parsers.JSONParser]
     
     def get_queryset(self):
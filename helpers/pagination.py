@@ -1,6 +1,163 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class DefaultPagination(PageNumberPagination):
     page_size = 60 # default items per page
     page_size_query_param = 'page_size'  # allows ?page_size=20
     max_page_size = 100
+
+
+def approximate_count(queryset):
+    """
+    The planner's row estimate on PostgreSQL, where COUNT(*) has to scan every
+    matching row; an exact count on other databases.
+    """
+    queryset = queryset.order_by()
+    if connections[queryset.db].vendor == 'postgresql':
+        plan = json.loads(queryset.explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    return queryset.count()
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a descending, unique ordering such as
+    ('-submission_period', '-created_at', '-id').
+
+    The opaque cursor holds the ordering values of the last row of a page, and the
+    next page is the rows after them: one indexed range query however deep the
+    page. Ordering fields may be NULL except the last, which must be unique.
+    No COUNT(*) is run unless the first page asks for ?total=true; the
+    (approximate) total is then carried in the cursor.
+    """
+    page_size = 60
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    total_query_param = 'total'
+    ordering = ('-id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        self.nulls_largest = connections[queryset.db].features.nulls_order_largest
+
+        queryset = queryset.order_by(*self.ordering)
+        position, self.total = self.decode_cursor(request, queryset.model)
+        if position is None and request.query_params.get(self.total_query_param, '').lower() == 'true':
+            self.total = approximate_count(queryset)
+        if position is not None:
+            queryset = queryset.filter(self.after(list(zip(self.fields, position))))
+
+        page_size = self.get_page_size(request)
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def after(self, position):
+        """Rows that come after `position`, a list of (field, value), in descending order."""
+        (field, value), rest = position[0], position[1:]
+        if not rest:
+            return Q(**{f'{field}__lt': value})
+
+        if value is None:
+            ties = Q(**{f'{field}__isnull': True}) & self.after(rest)
+            # Descending order puts NULLs first where they sort largest, so every non-NULL comes after them
+            return Q(**{f'{field}__isnull': False}) | ties if self.nulls_largest else ties
+
+        later = Q(**{f'{field}__lt': value}) | (Q(**{field: value}) & self.after(rest))
+        # ...and NULLs come after every value where they sort smallest
+        return later if self.nulls_largest else later | Q(**{f'{field}__isnull': True})
+
+    def encode_cursor(self, row):
+        values = [getattr(row, field) for field in self.fields]
+        data = {'p': [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]}
+        if self.total is not None:
+            data['t'] = self.total
+        cursor = urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode()
+        url = remove_query_param(self.base_url, self.total_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        """The position and total a cursor carries, or (None, None) for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, None
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode()).decode())
+            values = data['p']
+            if len(values) != len(self.fields) or values[-1] is None:
+                raise ValueError
+            position = [
+                None if value is None else model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+            total = data.get('t')
+        except (ValueError, KeyError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, total
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_paginated_response(self, data):
+        response = {'next': self.get_next_link()}
+        if self.total is not None:
+            response['count'] = self.total
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer', 'description': 'Approximate total, when requested with ?total=true'},
+                'results': schema,
+            },
+        }
+
+
+class SubmissionPagination(DefaultPagination):
+    """
+    Submissions, newest submission period first. Page numbers by default;
+    ?pagination=cursor (and the cursors it returns) switch to keyset pagination,
+    so infinite scroll never re-counts or OFFSETs past earlier pages.
+    """
+    ordering = ('-submission_period', '-created_at', '-id')
+    mode_query_param = 'pagination'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.mode_query_param) == 'cursor' or request.query_params.get(KeysetPagination.cursor_query_param):
+            self.keyset = KeysetPagination()
+            self.keyset.ordering = self.ordering
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset.order_by(*self.ordering), request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,78 @@
+"""
+Select and prefetch what a serializer reads, so a page of objects costs a fixed
+number of queries however many rows it has.
+
+The relations are worked out once per serializer class from its readable fields:
+a dotted source or nested serializer over a foreign key is select_related, a
+many=True nested serializer over a reverse foreign key or many-to-many is
+prefetch_related. Primary key fields read `<field>_id` and need neither.
+SerializerMethodFields cannot be inspected, so relations only they use must be
+read by another field too.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+# serializer class -> (select_related paths, prefetch_related paths)
+_relations = {}
+
+
+def _collect(serializer, model, prefix, select, prefetch):
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        current, path = model, []
+        for index, attr in enumerate(field.source_attrs):
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation:
+                break
+
+            last = index == len(field.source_attrs) - 1
+            if model_field.many_to_one or model_field.one_to_one:
+                if last and isinstance(field, serializers.PrimaryKeyRelatedField):
+                    break
+                path.append(attr)
+                select.add(prefix + '__'.join(path))
+                current = model_field.related_model
+                if last and isinstance(field, serializers.BaseSerializer):
+                    _collect(field, current, prefix + '__'.join(path) + '__', select, prefetch)
+                continue
+
+            # Reverse foreign keys and many-to-many relations
+            path.append(attr)
+            prefetch.add(prefix + '__'.join(path))
+            if last and isinstance(field, serializers.ListSerializer) and isinstance(field.child, serializers.BaseSerializer):
+                nested_select = set()
+                _collect(field.child, model_field.related_model, '', nested_select, set())
+                prefetch.update(prefix + '__'.join(path) + '__' + nested for nested in nested_select)
+            break
+
+
+def serializer_relations(serializer_class):
+    """The (select_related, prefetch_related) paths `serializer_class` reads, sorted."""
+    if serializer_class not in _relations:
+        select, prefetch = set(), set()
+        serializer = serializer_class()
+        _collect(serializer, serializer.Meta.model, '', select, prefetch)
+        _relations[serializer_class] = (sorted(select), sorted(prefetch))
+    return _relations[serializer_class]
+
+
+def optimize_for_serializer(queryset, serializer_class):
+    select, prefetch = serializer_relations(serializer_class)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class OptimizedQuerysetMixin:
+    """Viewset mixin that select/prefetch-relates everything its serializer reads."""
+
+    def get_queryset(self):
+        return optimize_for_serializer(super().get_queryset(), self.get_serializer_class())